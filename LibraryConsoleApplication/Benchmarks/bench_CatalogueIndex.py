@@ -0,0 +1,78 @@
+"""
+Benchmark of `CatalogueIndex` on synthetic catalogues.
+
+Builds an index of generated `BookViewModel` rows and times typical guest searches.
+No database is needed.
+
+Run from the project directory (sizes default to 10k, 100k and 1M books):
+    python -m Benchmarks.bench_CatalogueIndex
+    python -m Benchmarks.bench_CatalogueIndex 10000 100000
+"""
+import random
+import sys
+import time
+import timeit
+from Models.Models import BookViewModel
+from Services.CatalogueIndex import CatalogueIndex
+
+
+SIZES = [10_000, 100_000, 1_000_000]
+NUMBER = 200
+
+WORDS = [
+    'تاریخ', 'ایران', 'باستان', 'شعر', 'دیوان', 'حافظ', 'شاهنامه', 'فردوسی', 'رمان', 'جنگ',
+    'صلح', 'سفر', 'دریا', 'کوه', 'شب', 'روز', 'باغ', 'خانه', 'کودک', 'پدر',
+    'python', 'data', 'network', 'security', 'design', 'history', 'music', 'science', 'art', 'light',
+]
+CATEGORIES = ['رمان', 'تاریخی', 'شعر', 'علمی', 'کودک', 'فلسفه', 'هنر', 'روانشناسی', 'ادبیات', 'دینی']
+
+
+def make_books(count: int, seed: int = 0) -> list[BookViewModel]:
+    rnd = random.Random(seed)
+    return [
+        BookViewModel(
+            id = book_id,
+            title = ' '.join(rnd.sample(WORDS, 3)) + f' {book_id}',
+            publisher = f'ناشر {rnd.randrange(500)}',
+            author = f'نویسنده {rnd.randrange(count // 5 + 1)} ،نویسنده {rnd.randrange(count // 5 + 1)}',
+            category = ' ،'.join(rnd.sample(CATEGORIES, 2)),
+            total_copies = 3,
+            available_copies = rnd.randrange(4)
+        )
+        for book_id in range(1, count + 1)
+    ]
+
+
+def cases(size: int):
+    return [
+        ('title word', dict(title = 'شاهنامه')),
+        ('title prefix', dict(title = 'شاه')),
+        ('two words', dict(title = 'تاریخ ایران')),
+        ('rare title', dict(title = str(size // 2))),
+        ('author', dict(author = f'نویسنده {size // 10}')),
+        ('advance', dict(title = 'دریا', categories = ['رمان', 'شعر'], just_available = True)),
+        ('no match', dict(title = 'ناموجود')),
+    ]
+
+
+def main(sizes: list[int]):
+    for size in sizes:
+        books = make_books(size)
+        index = CatalogueIndex()
+
+        started = time.perf_counter()
+        index.load(books)
+        print(f"\n{size:,} books: load {time.perf_counter() - started:.2f} s")
+
+        started = time.perf_counter()
+        index.apply([books[0]], [books[1].id])
+        print(f"{'incremental update':<20}{(time.perf_counter() - started) * 1e6:>10.1f} µs")
+
+        print(f"{'search':<20}{'µs':>10}{'rows':>8}")
+        for name, arguments in cases(size):
+            elapsed = min(timeit.repeat(lambda: index.search(**arguments), number=NUMBER, repeat=3)) / NUMBER
+            print(f"{name:<20}{elapsed * 1e6:>10.1f}{len(index.search(**arguments)):>8}")
+
+
+if __name__ == '__main__':
+    main([int(size) for size in sys.argv[1:]] or SIZES)
@@ -0,0 +1,61 @@
+"""
+Benchmark of the login path against the configured database.
+
+Compares the credential lookup through `UserView` with `UserRepository.get_credentials`,
+then measures end-to-end `verify_user` throughput with several concurrent callers, which is
+bounded by the Argon2 settings and `HASH_WORKERS`.
+
+A temporary member is created (and committed, so concurrent callers on other connections
+can see it) and deleted afterwards. Apply Migrations/005_user_credentials_index.sql first.
+
+Run from the project directory:
+    python -m Benchmarks.bench_Login
+    python -m Benchmarks.bench_Login 2000 8
+"""
+import sys
+import time
+import timeit
+from concurrent.futures import ThreadPoolExecutor
+from DataAccess.MemberRepository import MemberRepository
+from DataAccess.UserRepository import UserRepository
+from Models.Models import MemberModel, PlainUserModel, UserViewModel
+
+
+LOOKUPS = 1000
+CALLERS = 4
+LOGINS_PER_CALLER = 5
+
+PLAIN_USER = PlainUserModel(username = 'bench_login_user', password = 'Bench12345')
+
+
+def main(lookups: int, callers: int):
+    with UserRepository._use_cursor() as cursor:
+        member = MemberRepository.add(PLAIN_USER, MemberModel(name = 'کاربر سنجش', email = 'bench_login@example.com'), cursor)
+
+    try:
+        cursor = UserRepository._get_cursor()
+        try:
+            view = timeit.timeit(lambda: UserRepository.view_one(UserViewModel(username = PLAIN_USER.username), cursor), number = lookups)
+            lean = timeit.timeit(lambda: UserRepository.get_credentials(PLAIN_USER.username, cursor), number = lookups)
+        finally:
+            cursor.connection.close()
+
+        print(f"{'lookup':<24}{'µs':>10}")
+        print(f"{'view_one(UserView)':<24}{view / lookups * 1e6:>10.1f}")
+        print(f"{'get_credentials':<24}{lean / lookups * 1e6:>10.1f}")
+        print(f"{'speed-up':<24}{view / lean:>9.1f}x")
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers = callers) as executor:
+            results = list(executor.map(lambda _: UserRepository.verify_user(PLAIN_USER), range(callers * LOGINS_PER_CALLER)))
+        elapsed = time.perf_counter() - started
+
+        assert all(results)
+        print(f"\n{len(results)} logins by {callers} callers: {len(results) / elapsed:.1f} logins/s")
+    finally:
+        UserRepository.delete(member.id)
+
+
+if __name__ == '__main__':
+    arguments = [int(argument) for argument in sys.argv[1:]]
+    main(*(arguments + [LOOKUPS, CALLERS][len(arguments):]))
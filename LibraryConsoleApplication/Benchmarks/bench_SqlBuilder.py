@@ -0,0 +1,92 @@
+"""
+Micro-benchmark of the SQL builders on the `Testing` models.
+
+Compares the original `build_*` functions (asdict + string building on every call)
+with the cached statement path used by `CommonQueriesRepository`. No database is needed.
+
+Run from the project directory:
+    python -m Benchmarks.bench_SqlBuilder
+"""
+import timeit
+from DataAccess.SqlBuilder import (
+    build_insert_clause, build_set_clause, build_where_clause,
+    cached_insert_statement, cached_set_statement, cached_where_statement
+)
+from Models.Models import TestingModel, TestingViewModel
+
+
+NUMBER = 100_000
+
+TABLE = 'public."Testing"'
+VIEW = 'public."TestingView"'
+
+filter_model = TestingModel(name='Ali', age=25)
+view_filter_model = TestingViewModel(description='engineer')
+insert_model = TestingModel(name='Sajjad', age=25, description='Network security')
+update_model = TestingModel(id=20, age=29, description='Updated nurse info')
+
+
+def old_get_many():
+    where_clause, values = build_where_clause(filter_model, use_like_for_strings=True)
+    query = f"SELECT * FROM {TABLE} WHERE {where_clause} LIMIT 100"
+    return query, values
+
+def new_get_many():
+    return cached_where_statement(
+        ('bench', 'get_many'), filter_model,
+        lambda where_clause: f"SELECT * FROM {TABLE} WHERE {where_clause} LIMIT %s",
+        use_like_for_strings=True
+    )
+
+def old_view_one():
+    where_clause, values = build_where_clause(view_filter_model)
+    query = f"SELECT * FROM {VIEW} WHERE {where_clause}"
+    return query, values
+
+def new_view_one():
+    return cached_where_statement(
+        ('bench', 'view_one'), view_filter_model,
+        lambda where_clause: f"SELECT * FROM {VIEW} WHERE {where_clause}"
+    )
+
+def old_add():
+    columns_clause, placeholders_clause, values = build_insert_clause(insert_model)
+    query = f"INSERT INTO {TABLE} ({columns_clause}) VALUES ({placeholders_clause}) RETURNING *"
+    return query, values
+
+def new_add():
+    return cached_insert_statement(
+        ('bench', 'add'), insert_model,
+        lambda columns_clause, placeholders_clause: f"INSERT INTO {TABLE} ({columns_clause}) VALUES ({placeholders_clause}) RETURNING *"
+    )
+
+def old_update():
+    set_clause, values = build_set_clause(update_model)
+    query = f"UPDATE {TABLE} SET {set_clause} WHERE id = %s"
+    return query, values
+
+def new_update():
+    return cached_set_statement(
+        ('bench', 'update'), update_model,
+        lambda set_clause: f"UPDATE {TABLE} SET {set_clause} WHERE id = %s"
+    )
+
+
+CASES = [
+    ('get_many (LIKE)', old_get_many, new_get_many),
+    ('view_one', old_view_one, new_view_one),
+    ('add', old_add, new_add),
+    ('update', old_update, new_update),
+]
+
+
+def main():
+    print(f"{'operation':<18}{'builder µs':>12}{'cached µs':>12}{'speed-up':>10}")
+    for name, old, new in CASES:
+        old_time = min(timeit.repeat(old, number=NUMBER, repeat=3)) / NUMBER * 1e6
+        new_time = min(timeit.repeat(new, number=NUMBER, repeat=3)) / NUMBER * 1e6
+        print(f"{name:<18}{old_time:>12.2f}{new_time:>12.2f}{old_time / new_time:>9.1f}x")
+
+
+if __name__ == '__main__':
+    main()
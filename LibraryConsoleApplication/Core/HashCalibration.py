@@ -0,0 +1,112 @@
+"""
+Finds Argon2 cost settings that fit a target login latency on this machine.
+
+Following the usual Argon2 tuning order, memory is chosen first (the largest amount, up to
+`--max-memory-mib`, that hashes within the target at one pass), then passes are added while
+a hash still fits. The result is printed as `.env` lines.
+
+Run from the project directory:
+    python -m Core.HashCalibration --target-ms 250
+    python -m Core.HashCalibration --target-ms 100 --max-memory-mib 64 --parallelism 2
+
+Existing hashes are upgraded to new settings on the next login of each user
+(`UserRepository.verify_user`).
+"""
+import argparse
+import os
+import statistics
+import time
+from dataclasses import dataclass
+from argon2 import PasswordHasher
+
+
+@dataclass
+class CostProfile:
+    """
+    Argon2 parameters and their measured cost.
+
+    Attributes:
+        time_cost (int): Number of passes (`HASH_TIME_COST`).
+        memory_cost (int): Memory in KiB (`HASH_MEMORY_COST`).
+        parallelism (int): Lanes (`HASH_PARALLELISM`).
+        latency_ms (float): Median time of one hash, in milliseconds.
+    """
+    time_cost: int
+    memory_cost: int
+    parallelism: int
+    latency_ms: float
+
+
+def measure(time_cost: int, memory_cost: int, parallelism: int, rounds: int = 3) -> float:
+    """
+    Times hashing with the given parameters.
+
+    Returns:
+        float: Median duration of one hash, in milliseconds.
+    """
+    hasher = PasswordHasher(time_cost = time_cost, memory_cost = memory_cost, parallelism = parallelism)
+    durations = []
+
+    for _ in range(rounds):
+        started = time.perf_counter()
+        hasher.hash('calibration password')
+        durations.append((time.perf_counter() - started) * 1000)
+
+    return statistics.median(durations)
+
+
+def calibrate(target_ms: float, max_memory_kib: int, parallelism: int, max_time_cost: int = 10, rounds: int = 3) -> CostProfile:
+    """
+    Finds the strongest cost profile whose hash takes at most `target_ms`.
+
+    Args:
+        target_ms (float): Longest acceptable hashing time of one login.
+        max_memory_kib (int): Upper bound for `memory_cost`.
+        parallelism (int): Lanes to use.
+        max_time_cost (int): Upper bound for `time_cost`.
+        rounds (int): Hashes timed per candidate.
+
+    Returns:
+        CostProfile: The chosen parameters. If even the cheapest profile misses the target,
+            that profile is returned with its (too high) latency.
+    """
+    # Argon2 needs at least 8 KiB per lane.
+    min_memory_kib = 8 * parallelism
+    memory_cost = max(max_memory_kib, min_memory_kib)
+
+    latency = measure(1, memory_cost, parallelism, rounds)
+    while latency > target_ms and memory_cost > min_memory_kib:
+        memory_cost = max(memory_cost // 2, min_memory_kib)
+        latency = measure(1, memory_cost, parallelism, rounds)
+
+    profile = CostProfile(1, memory_cost, parallelism, latency)
+
+    for time_cost in range(2, max_time_cost + 1):
+        latency = measure(time_cost, memory_cost, parallelism, rounds)
+        if latency > target_ms:
+            break
+        profile = CostProfile(time_cost, memory_cost, parallelism, latency)
+
+    return profile
+
+
+def main():
+    parser = argparse.ArgumentParser(description = "Recommend Argon2 settings for a target login latency.")
+    parser.add_argument("--target-ms", type = float, default = 250, help = "target hashing time per login (default 250)")
+    parser.add_argument("--max-memory-mib", type = int, default = 100, help = "memory limit per hash in MiB (default 100)")
+    parser.add_argument("--parallelism", type = int, default = min(os.cpu_count() or 1, 8), help = "lanes per hash (default: CPU count, at most 8)")
+    parser.add_argument("--workers", type = int, default = int(os.getenv("HASH_WORKERS", "2")), help = "concurrent hashes, to report peak memory (default HASH_WORKERS or 2)")
+    arguments = parser.parse_args()
+
+    profile = calibrate(arguments.target_ms, arguments.max_memory_mib * 1024, arguments.parallelism)
+
+    if profile.latency_ms > arguments.target_ms:
+        print(f"# The cheapest profile takes {profile.latency_ms:.0f} ms, above the {arguments.target_ms:.0f} ms target.")
+    print(f"# {profile.latency_ms:.0f} ms per login; up to {profile.memory_cost * arguments.workers // 1024} MiB with {arguments.workers} concurrent hashes")
+    print(f"HASH_TIME_COST={profile.time_cost}")
+    print(f"HASH_MEMORY_COST={profile.memory_cost}")
+    print(f"HASH_PARALLELISM={profile.parallelism}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,11 +1,29 @@
 import os
 import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, TypeVar
 from dotenv import load_dotenv
 from argon2 import PasswordHasher
 from argon2.exceptions import VerifyMismatchError, VerificationError
 from pathlib import Path
+from Exceptions.Exceptions import PasswordHashingBusyError
+
+
+T = TypeVar("T")
+
 
 class PasswordManager:
+    """
+    Hashes, verifies and validates passwords.
+
+    Each Argon2 call uses `HASH_MEMORY_COST` KiB of memory and `HASH_PARALLELISM` lanes, so
+    hashing and verification run on a pool of `HASH_WORKERS` threads instead of the caller's
+    thread. argon2-cffi releases the GIL while hashing, so the workers run in parallel.
+    At most `HASH_QUEUE_LIMIT` further calls wait for a worker; calls beyond that raise
+    `PasswordHashingBusyError` right away. During a rush of logins, memory therefore stays
+    near `HASH_WORKERS * HASH_MEMORY_COST`.
+    """
     _instance = None
     _env_loaded = None
 
@@ -29,6 +47,10 @@ class PasswordManager:
             parallelism = int(os.getenv("HASH_PARALLELISM"))
         )
 
+        workers = int(os.getenv("HASH_WORKERS", "2"))
+        self._executor = ThreadPoolExecutor(max_workers = workers, thread_name_prefix = "password-hashing")
+        self._slots = threading.BoundedSemaphore(workers + int(os.getenv("HASH_QUEUE_LIMIT", "16")))
+
         self._check_length = os.getenv("CHECK_LENGTH") == "True"
         self._min_length = int(os.getenv("MIN_LENGTH"))
         self._check_letter = os.getenv("CHECK_LETTER") == "True"
@@ -37,10 +59,27 @@ class PasswordManager:
         self._check_lower = os.getenv("CHECK_LOWER") == "True"
         self._check_special = os.getenv("CHECK_SPECIAL") == "True"
 
+    def _run(self, func: Callable[..., T], *args) -> T:
+        """Runs `func` on the hashing pool and waits for it; raises `PasswordHashingBusyError` if the queue is full."""
+        if not self._slots.acquire(blocking = False):
+            raise PasswordHashingBusyError()
+
+        try:
+            future = self._executor.submit(func, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+
+        future.add_done_callback(lambda _: self._slots.release())
+        return future.result()
+
     def hash_password(self, plain_password: str) -> str:
-        return self.ph.hash(plain_password)
+        return self._run(self.ph.hash, plain_password)
 
     def verify_password(self, plain_password: str, hashed_password: str) -> bool:
+        return self._run(self._verify, plain_password, hashed_password)
+
+    def _verify(self, plain_password: str, hashed_password: str) -> bool:
         try:
             return self.ph.verify(hashed_password, plain_password)
         except (VerifyMismatchError, VerificationError):
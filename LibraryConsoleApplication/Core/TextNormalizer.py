@@ -0,0 +1,46 @@
+import re
+
+
+class TextNormalizer:
+    """
+    Folds Persian, Arabic and English text to one searchable form.
+
+    - Arabic yeh/alef maksura (ي ى) and kaf (ك) become Persian ی and ک;
+      teh marbuta and heh with yeh (ة ۀ) become ه; hamza carriers (أ إ ٱ آ ؤ ئ) lose the hamza.
+    - Persian and Arabic-Indic digits become ASCII digits.
+    - ZWNJ (نیم‌فاصله) becomes a space, so `کتاب‌ها` also matches `کتاب`.
+    - Diacritics (harakat), tatweel and direction marks are removed.
+    - Latin letters are lower-cased.
+
+    `lca_normalize` in Migrations/003_book_full_text_search.sql applies the same rules
+    inside PostgreSQL; the two must be kept in sync.
+    """
+
+    _TRANSLATION = str.maketrans(
+        {
+            'ي': 'ی',  # Arabic yeh
+            'ى': 'ی',  # alef maksura
+            'ك': 'ک',  # Arabic kaf
+            'ة': 'ه',  # teh marbuta
+            'ۀ': 'ه',  # heh with yeh above
+            'أ': 'ا',  # alef with hamza above
+            'إ': 'ا',  # alef with hamza below
+            'ٱ': 'ا',  # alef wasla
+            'آ': 'ا',  # alef with madda
+            'ؤ': 'و',  # waw with hamza
+            'ئ': 'ی',  # yeh with hamza
+            '\u200C': ' ',  # ZWNJ
+            **{chr(0x06F0 + digit): str(digit) for digit in range(10)},
+            **{chr(0x0660 + digit): str(digit) for digit in range(10)},
+        }
+    )
+    _REMOVED = re.compile('[\u064B-\u065F\u0670\u0640\u200E\u200F]')
+    _TOKEN = re.compile(r'\w+')
+
+    @staticmethod
+    def normalize(text : str) -> str:
+        return TextNormalizer._REMOVED.sub('', text.translate(TextNormalizer._TRANSLATION)).lower()
+
+    @staticmethod
+    def tokens(text : str) -> list[str]:
+        return TextNormalizer._TOKEN.findall(TextNormalizer.normalize(text))
@@ -1,4 +1,4 @@
-﻿from typing import Optional
+﻿from typing import Iterable, Optional
 from DataAccess.CommonQueriesRepository import CommonQueriesRepository
 from DataAccess.Decorators import forbidden_method
 from Models.Schema import DBTableColumns, DBTables, DBViews
@@ -18,37 +18,55 @@ class AuthorRepository(CommonQueriesRepository):
         DBTableColumns.Author.ID    
     }
     where_clause_exclude = set()
+    materialized_view_name = DBViews.AUTHOR_VIEW_MATERIALIZED
+    refreshes_materialized_views = {
+        DBViews.BOOK_VIEW_MATERIALIZED,
+        DBViews.AUTHOR_VIEW_MATERIALIZED
+    }
+    cache_ttl_seconds = 120
 
 
     # Inherited Methods
 
     @classmethod
-    def get_one(cls, model : model_class, cursor : Optional[PgCursor] = None) -> Optional[model_class]:
-        return super().get_one(model, cursor)
+    def get_one(cls, model : model_class, cursor : Optional[PgCursor] = None, fields : Optional[Iterable[str]] = None) -> Optional[model_class]:
+        return super().get_one(model, cursor, fields)
        
     @classmethod
-    def get_many(cls, model : model_class, cursor : Optional[PgCursor] = None) -> list[model_class]:
-        return super().get_many(model, cursor)
+    def get_many(cls, model : model_class, cursor : Optional[PgCursor] = None, fields : Optional[Iterable[str]] = None) -> list[model_class]:
+        return super().get_many(model, cursor, fields)
     
     @classmethod
-    def view_one(cls, model : view_model_class, cursor : Optional[PgCursor] = None) -> Optional[view_model_class]:
-        return super().view_one(model, cursor)
+    def view_one(cls, model : view_model_class, cursor : Optional[PgCursor] = None, fields : Optional[Iterable[str]] = None) -> Optional[view_model_class]:
+        return super().view_one(model, cursor, fields)
        
     @classmethod
-    def view_many(cls, model : view_model_class, cursor : Optional[PgCursor] = None) -> list[view_model_class]:
-        return super().view_many(model, cursor)
+    def view_many(cls, model : view_model_class, cursor : Optional[PgCursor] = None, fields : Optional[Iterable[str]] = None) -> list[view_model_class]:
+        return super().view_many(model, cursor, fields)
     
     @classmethod
     def add(cls, model : model_class, cursor : Optional[PgCursor] = None) -> model_class:
         return super().add(model, cursor)
+
+    @classmethod
+    def add_many(cls, models : list[model_class], cursor : Optional[PgCursor] = None) -> list[model_class]:
+        return super().add_many(models, cursor)
     
     @classmethod
     def update(cls, model : model_class, cursor: Optional[PgCursor] = None) -> None:
         return super().update(model, cursor)
+
+    @classmethod
+    def update_many(cls, models : list[model_class], cursor: Optional[PgCursor] = None) -> None:
+        return super().update_many(models, cursor)
             
     @classmethod
     def delete(cls, id : int, cursor: Optional[PgCursor] = None) -> None:
         return super().delete(id, cursor)
+
+    @classmethod
+    def delete_many(cls, ids : list[int], cursor: Optional[PgCursor] = None) -> int:
+        return super().delete_many(ids, cursor)
     
 
     # Forbidden Methods
@@ -1,6 +1,10 @@
 ﻿from DataAccess.Connection import DatabaseConnector
+from DataAccess.InvalidationBus import invalidation_bus
+from DataAccess.MaterializedViews import materialized_views
+from DataAccess.QueryCache import hold_query_caches, invalidate_query_caches, query_cache
+from DataAccess.Transaction import after_commit, current_cursor, cursor_scope
 from psycopg2.extensions import connection as PgConnection, cursor as PgCursor
-from typing import Optional, Type
+from typing import Any, Callable, ContextManager, Hashable, Iterable, Optional, Sequence, Type
 from abc import ABC
 from Models.Models import BaseTableModel, BaseViewModel
 
@@ -23,6 +27,21 @@ class BaseRepository(ABC):
         set_clause_exclude (Set[str]): Columns that cannot be specified in UPDATE queries.
         where_clause_exclude (Set[str]): Columns that cannot be specified in WHERE (filtering) queries.
         return_limit (int): Specifies the maximum number of records that can be returned in query results.
+        bulk_page_size (int): Rows sent per multi-row INSERT statement by bulk operations.
+        page_key (str): Unique, ordered column used for keyset pagination (`get_page`, `view_page`).
+        bulk_copy_threshold (int): Batch size from which bulk inserts switch to `COPY FROM STDIN`.
+        itersize (int): Rows fetched per round trip by the streaming reads (`iter_many`, `iter_view`).
+        use_prepared_statements (Optional[bool]): Run generated statements as server-side prepared statements.
+            None follows the DB_PREPARED_STATEMENTS setting of the connection pool.
+        materialized_view_name (Optional[str]): Materialized copy of `view_name` that view reads may use.
+        use_materialized_view (Optional[bool]): Read views from `materialized_view_name` while it is fresh enough.
+            None follows the MATERIALIZED_VIEWS setting.
+        refreshes_materialized_views (Set[str]): Materialized views that writes to this table make stale.
+        cache_ttl_seconds (Optional[float]): Cache reads made outside a transaction for this long.
+            None disables caching for the repository.
+        cache_max_size (int): Number of distinct reads kept in the repository's cache.
+        invalidates_caches (Set[str]): Tables whose cached reads include this table's data (e.g. the
+            book titles listed in `CategoryView`); writes here clear those caches too.
     """
     
     _db = DatabaseConnector()
@@ -35,11 +54,25 @@ class BaseRepository(ABC):
     set_clause_exclude : set = {'id'}
     where_clause_exclude : set = set()
     return_limit : int = 100
+    bulk_page_size : int = 500
+    bulk_copy_threshold : int = 5000
+    itersize : int = 2000
+    page_key : str = 'id'
+    use_prepared_statements : Optional[bool] = None
+    materialized_view_name : Optional[str] = None
+    use_materialized_view : Optional[bool] = None
+    refreshes_materialized_views : set = set()
+    cache_ttl_seconds : Optional[float] = None
+    cache_max_size : int = 256
+    invalidates_caches : set = set()
 
     @classmethod
     def _get_connection(cls) -> PgConnection:
         """Get a database connection object.
 
+        The connection is borrowed from the shared pool; calling `close()` on it
+        returns it to the pool instead of closing the session.
+
         Returns:
             PgConnection: An active PostgreSQL connection instance obtained from the DatabaseConnector.
         """
@@ -49,10 +82,173 @@ class BaseRepository(ABC):
     def _get_cursor(cls) -> PgCursor:
         """Get a database cursor object.
 
+        The cursor is opened on a pooled connection; `cursor.connection.close()`
+        hands that connection back to the pool.
+
         Returns:
             PgCursor: A PostgreSQL cursor instance for executing SQL queries.
         """
         return cls._db.get_cursor()
-    
 
+    @classmethod
+    def _use_cursor(cls, cursor : Optional[PgCursor] = None) -> ContextManager[PgCursor]:
+        """Get the cursor a repository method should run on.
+
+        Replaces the manual open/commit/close handling in repository methods:
+        an explicit cursor is used as-is, otherwise the call joins the active
+        `transaction()` scope or runs in its own transaction that is committed
+        (or rolled back on error) and returned to the pool on exit.
+
+        Example:
+            with cls._use_cursor(cursor) as cursor:
+                cursor.execute(query, values)
+
+        Args:
+            cursor (Optional[PgCursor]): Cursor passed by the caller, if any.
+
+        Returns:
+            ContextManager[PgCursor]: Context manager yielding the cursor to use.
+        """
+        return cursor_scope(cursor)
+
+    @classmethod
+    def _execute(cls, cursor : PgCursor, query : str, values : Sequence = ()) -> None:
+        """Execute a generated statement, as a prepared statement when enabled.
+
+        Prepared statements are used when `use_prepared_statements` is True (or None
+        and enabled on the pool) and the cursor runs on a pooled connection, which
+        tracks the statements prepared in its session. Otherwise this is a plain
+        `cursor.execute`.
+
+        Args:
+            cursor (PgCursor): Cursor to execute on.
+            query (str): SQL statement with `%s` placeholders.
+            values (Sequence): Parameter values.
+        """
+        connection = cursor.connection
+        pool = getattr(connection, "_pool", None)
+
+        if pool is not None:
+            use_prepared = cls.use_prepared_statements
+            if use_prepared is None:
+                use_prepared = pool.prepared_statements
+
+            if use_prepared:
+                connection.execute_prepared(cursor, query, values, pool.prepared_statements_limit)
+                return
+
+        cursor.execute(query, values)
+
+    @classmethod
+    def _view_source(cls) -> str:
+        """Get the relation view reads should select from.
+
+        Returns `materialized_view_name` when materialized reads are enabled and the
+        materialized view is within its staleness bound, `view_name` otherwise.
 
+        Returns:
+            str: Quoted name of the view or materialized view.
+        """
+        if cls.materialized_view_name is None:
+            return cls.view_name
+
+        refresher = materialized_views()
+        use_materialized = cls.use_materialized_view
+        if use_materialized is None:
+            use_materialized = refresher.enabled
+
+        if use_materialized and refresher.is_fresh(cls.materialized_view_name):
+            return cls.materialized_view_name
+
+        return cls.view_name
+
+    @classmethod
+    def _cached_read(cls, cursor : Optional[PgCursor], key : Hashable, load : Callable[[], Any]) -> Any:
+        """Run a read through the repository's query cache when it may be cached.
+
+        Reads on a caller's cursor or inside a `transaction()` scope can see uncommitted
+        writes, so they always run `load` directly.
+
+        Args:
+            cursor (Optional[PgCursor]): Cursor passed by the caller, if any.
+            key (Hashable): Identifies the read, e.g. `(query, *values)`.
+            load (Callable[[], Any]): Runs the query and returns its rows.
+
+        Returns:
+            Any: The rows returned by `load`, possibly from the cache.
+        """
+        if cls.cache_ttl_seconds is None or cursor is not None or current_cursor() is not None:
+            return load()
+
+        cache = query_cache(cls.table_name, cls.cache_ttl_seconds, cls.cache_max_size)
+        if cache is None:
+            return load()
+
+        return cache.get_or_load(key, load)
+
+    @classmethod
+    def cache_stats(cls) -> Optional[dict[str, int]]:
+        """Get the hit/miss counters of the repository's query cache.
+
+        Returns:
+            Optional[dict[str, int]]: `QueryCache.stats()`, or None if the repository does not cache.
+        """
+        if cls.cache_ttl_seconds is None:
+            return None
+
+        cache = query_cache(cls.table_name, cls.cache_ttl_seconds, cls.cache_max_size)
+        return None if cache is None else cache.stats()
+
+    @classmethod
+    def _after_write(
+        cls,
+        views : Optional[Iterable[str]] = None,
+        caches : Optional[Iterable[str]] = None,
+        cursor : Optional[PgCursor] = None
+    ) -> None:
+        """Hook called by write methods; marks dependent materialized views stale and clears
+        dependent query caches after commit.
+
+        With `cursor`, the caches and views are also published on the invalidation bus as
+        part of the write's transaction, so other application instances clear their caches
+        and mark their materialized views stale too. A caller-owned `cursor` (one that is not
+        the active `transaction()` scope's) commits whenever the caller does, so the caches are
+        also held until its transaction ends (see `QueryCache.hold`).
+
+        Args:
+            views (Optional[Iterable[str]]): Materialized views the write touched.
+                Defaults to `refreshes_materialized_views`.
+            caches (Optional[Iterable[str]]): Query caches the write touched.
+                Defaults to this table's cache (if it caches) and `invalidates_caches`.
+            cursor (Optional[PgCursor]): Cursor the write ran on.
+        """
+        views = cls.refreshes_materialized_views if views is None else set(views)
+        if caches is None:
+            caches = set(cls.invalidates_caches)
+            if cls.cache_ttl_seconds is not None:
+                caches.add(cls.table_name)
+        else:
+            caches = set(caches)
+
+        if cursor is not None:
+            invalidation_bus().publish(cursor, caches | views)
+
+        if views:
+            after_commit(lambda: materialized_views().mark_stale(views))
+
+        if caches:
+            if cursor is not None and cursor is not current_cursor():
+                hold_query_caches(caches, cursor.connection)
+            after_commit(lambda: invalidate_query_caches(caches))
+
+    @classmethod
+    def _is_forbidden(cls, method_name : str) -> bool:
+        """Check whether a method is disabled on this repository with `forbidden_method`.
+
+        Args:
+            method_name (str): Name of the repository method.
+
+        Returns:
+            bool: True if the method exists and is forbidden.
+        """
+        return getattr(getattr(cls, method_name, None), "_forbidden", False)
@@ -2,7 +2,7 @@ from typing import Optional
 from DataAccess.CommonQueriesRepository import CommonQueriesRepository
 from DataAccess.Decorators import forbidden_method
 from Models.Models import BookCategoryModel
-from Models.Schema import DBTables
+from Models.Schema import DBTables, DBViews
 from psycopg2.extensions import cursor as PgCursor
 
 
@@ -13,6 +13,13 @@ class BookCategoryRepository(CommonQueriesRepository):
     insert_clause_exclude = set()
     set_clause_exclude = set()
     where_clause_exclude = set()
+    refreshes_materialized_views = {
+        DBViews.BOOK_VIEW_MATERIALIZED,
+        DBViews.CATEGORY_VIEW_MATERIALIZED
+    }
+    invalidates_caches = {
+        DBTables.CATEGORY
+    }
 
 
     # Inherited Methods
@@ -21,6 +28,10 @@ class BookCategoryRepository(CommonQueriesRepository):
     def add(cls, model : model_class, cursor : Optional[PgCursor] = None) -> model_class:
         return super().add(model, cursor)
 
+    @classmethod
+    def add_many(cls, models : list[model_class], cursor : Optional[PgCursor] = None) -> list[model_class]:
+        return super().add_many(models, cursor)
+
     @classmethod
     def remove(cls, model : model_class, use_like_for_strings : bool = True, cursor: Optional[PgCursor] = None) -> None:
         return super().remove(model, use_like_for_strings, cursor)
@@ -52,6 +63,18 @@ class BookCategoryRepository(CommonQueriesRepository):
         """Disabled method. Not allowed for this repository."""
         pass
     
+    @classmethod
+    @forbidden_method
+    def get_page(cls, model, page_size : Optional[int] = None, page_token : Optional[str] = None, cursor : Optional[PgCursor] = None):
+        """Disabled method. Not allowed for this repository (its composite key has no `page_key`)."""
+        pass
+    
+    @classmethod
+    @forbidden_method
+    def view_page(cls, model, page_size : Optional[int] = None, page_token : Optional[str] = None, cursor : Optional[PgCursor] = None):
+        """Disabled method. Not allowed for this repository (its composite key has no `page_key`)."""
+        pass
+    
     @classmethod
     @forbidden_method
     def update(cls, model, cursor: Optional[PgCursor] = None):
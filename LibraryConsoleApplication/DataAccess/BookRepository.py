@@ -1,10 +1,14 @@
 ﻿
-from typing import Optional
-from DataAccess.CommonQueriesRepository import CommonQueriesRepository
+import os
+from datetime import datetime
+from typing import Iterable, Iterator, Optional
+from Core.TextNormalizer import TextNormalizer
+from DataAccess.CommonQueriesRepository import CommonQueriesRepository, _decode_page_token
+from DataAccess.Connection import DatabaseConnector
 from DataAccess.Decorators import forbidden_method
-from Models.Models import AuthorModel, BookModel, BookViewModel, CategoryModel, PublisherModel
+from Models.Models import AuthorModel, BookModel, BookViewModel, CategoryModel, PageResult, PublisherModel, UnsetType
 from psycopg2.extensions import cursor as PgCursor
-from Models.Schema import DBTableColumns, DBTables, DBViews
+from Models.Schema import DBTableColumns, DBTables, DBViewColumns, DBViews
 
 
 class BookRepository(CommonQueriesRepository):
@@ -20,37 +24,474 @@ class BookRepository(CommonQueriesRepository):
         DBTableColumns.Book.ID
     }
     where_clause_exclude = set()
+    materialized_view_name = DBViews.BOOK_VIEW_MATERIALIZED
+    refreshes_materialized_views = {
+        DBViews.BOOK_VIEW_MATERIALIZED,
+        DBViews.AUTHOR_VIEW_MATERIALIZED,
+        DBViews.CATEGORY_VIEW_MATERIALIZED
+    }
+    # Book titles are listed in AuthorView, CategoryView and PublisherView.
+    invalidates_caches = {
+        DBTables.AUTHOR,
+        DBTables.CATEGORY,
+        DBTables.PUBLISHER
+    }
+
+    # "view" filters the aggregated BookView; "indexed" filters the base tables first so the
+    # trigram indexes of Migrations/001_trigram_indexes.sql apply; "fts" filters like "view" but
+    # answers plain title searches with `full_text_search`. None reads BOOK_SEARCH_MODE.
+    search_mode : Optional[str] = None
     
 
+    # Methods
+
+    @classmethod
+    def take_copy(cls, id : int, cursor : Optional[PgCursor] = None) -> Optional[model_class]:
+        """
+        Atomically takes one copy of a book out of stock.
+
+        Runs a single conditional `UPDATE` that decrements `available_copies` only while
+        it is above zero. The row lock taken by the update serialises concurrent checkouts
+        of the same book, so stock can never go negative.
+
+        Args:
+            id (int): ID of the book.
+            cursor (Optional[PgCursor], optional): Database cursor to use. 
+                If not provided, a new connection will be created automatically.
+
+        Returns:
+            Optional[BookModel]: The book after the decrement, or None if the book does 
+                                 not exist or has no available copies.
+        """
+        query = f"""
+            UPDATE {cls.table_name}
+            SET {DBTableColumns.Book.AVAILABLE_COPIES} = {DBTableColumns.Book.AVAILABLE_COPIES} - 1
+            WHERE {DBTableColumns.Book.ID} = %s AND {DBTableColumns.Book.AVAILABLE_COPIES} > 0
+            RETURNING *
+        """
+
+        with cls._use_cursor(cursor) as cursor:
+            cls._execute(cursor, query, (id,))
+            result = cursor.fetchone()
+            if result is not None:
+                # Stock only shows up in BookView.
+                cls._after_write({DBViews.BOOK_VIEW_MATERIALIZED}, {cls.table_name}, cursor)
+
+        if result is None:
+            return None
+
+        return cls.model_class(*result)
+
+    @classmethod
+    def put_back_copy(cls, id : int, cursor : Optional[PgCursor] = None) -> Optional[model_class]:
+        """
+        Atomically returns one copy of a book to stock.
+
+        Runs a single `UPDATE` that increments `available_copies`, never past `total_copies`.
+
+        Args:
+            id (int): ID of the book.
+            cursor (Optional[PgCursor], optional): Database cursor to use. 
+                If not provided, a new connection will be created automatically.
+
+        Returns:
+            Optional[BookModel]: The book after the increment, or None if the book does 
+                                 not exist or all of its copies are already in stock.
+        """
+        query = f"""
+            UPDATE {cls.table_name}
+            SET {DBTableColumns.Book.AVAILABLE_COPIES} = {DBTableColumns.Book.AVAILABLE_COPIES} + 1
+            WHERE {DBTableColumns.Book.ID} = %s
+              AND {DBTableColumns.Book.AVAILABLE_COPIES} < {DBTableColumns.Book.TOTAL_COPIES}
+            RETURNING *
+        """
+
+        with cls._use_cursor(cursor) as cursor:
+            cls._execute(cursor, query, (id,))
+            result = cursor.fetchone()
+            if result is not None:
+                # Stock only shows up in BookView.
+                cls._after_write({DBViews.BOOK_VIEW_MATERIALIZED}, {cls.table_name}, cursor)
+
+        if result is None:
+            return None
+
+        return cls.model_class(*result)
+
+    @classmethod
+    def advance_search(
+        cls,
+        model : view_model_class,
+        categories : Optional[list[str]] = None,
+        just_available : bool = False,
+        page_size : Optional[int] = None,
+        page_token : Optional[str] = None,
+        cursor : Optional[PgCursor] = None
+    ) -> PageResult:
+        """
+        Searches the book view with one query, however many categories are selected.
+
+        The model’s fields are matched like `view_page` does (`LIKE` for strings). On top
+        of that, a book must belong to at least one of `categories` (exact names, checked
+        with an `EXISTS` over `BookCategory`/`Category`), and with `just_available` it must
+        have at least one available copy. Results are paginated like `view_page`.
+
+        In `indexed` search mode (see `search_mode`) the filters run on the base tables 
+        instead; `author` and `category` then match any single name rather than the joined 
+        list. Page tokens are interchangeable between the two modes.
+
+        Args:
+            model (BookViewModel): View model used as a filter.
+            categories (Optional[list[str]], optional): Category names; a book matches if it 
+                has any of them. None or an empty list disables the filter.
+            just_available (bool, optional): Only return books with available copies.
+            page_size (Optional[int], optional): Maximum number of books per page. 
+                Defaults to `return_limit`.
+            page_token (Optional[str], optional): `next_token` of the previous page.
+            cursor (Optional[PgCursor], optional): Database cursor to use. 
+                If not provided, a new connection will be created automatically.
+
+        Returns:
+            PageResult: The matching books of the page and the token of the next page.
+
+        Raises:
+            InvalidPageTokenError: If `page_token` is malformed or belongs to another view.
+            ValueError: If the search mode is unknown or `page_size` is less than 1.
+        """
+        if cls._search_mode() == "indexed":
+            return cls._indexed_search(model, categories, just_available, page_size, page_token, cursor)
+
+        source = cls._view_source()
+        conditions = []
+        values = []
+
+        if categories:
+            conditions.append(f"""
+                EXISTS (
+                    SELECT 1 FROM {DBTables.BOOK_CATEGORY}
+                    JOIN {DBTables.CATEGORY}
+                        ON {DBTables.CATEGORY}.{DBTableColumns.Category.ID} = {DBTables.BOOK_CATEGORY}.{DBTableColumns.BookCategory.CATEGORY_ID}
+                    WHERE {DBTables.BOOK_CATEGORY}.{DBTableColumns.BookCategory.BOOK_ID} = {source}.{DBViewColumns.BookView.ID}
+                      AND {DBTables.CATEGORY}.{DBTableColumns.Category.NAME} = ANY(%s)
+                )""")
+            values.append(list(categories))
+
+        if just_available:
+            conditions.append(f"{DBViewColumns.BookView.AVAILABLE_COPIES} > 0")
+
+        return cls._page(
+            cls.view_name,
+            cls.view_model_class,
+            ("advance_search", bool(categories), just_available),
+            model,
+            page_size,
+            page_token,
+            cursor,
+            " AND ".join(conditions) or "TRUE",
+            tuple(values),
+            source
+        )
+
+    @classmethod
+    def full_text_search(
+        cls,
+        query : str,
+        limit : Optional[int] = None,
+        offset : int = 0,
+        cursor : Optional[PgCursor] = None
+    ) -> list[view_model_class]:
+        """
+        Searches books by title, authors, categories and publisher, best matches first.
+
+        Both the query and the indexed text are folded with `TextNormalizer` (Persian/Arabic 
+        letter variants, ZWNJ, diacritics, digits, case), so `كتاب` finds `کتاب`. Every query 
+        word must match the start of a word of the book (`هری پات` finds `هری پاتر`). Matches 
+        in the title rank above matches in author names, which rank above categories and 
+        the publisher.
+
+        Needs Migrations/003_book_full_text_search.sql.
+
+        Args:
+            query (str): Text typed by the user.
+            limit (Optional[int], optional): Maximum number of books. Defaults to `return_limit`.
+            offset (int, optional): Number of best matches to skip.
+            cursor (Optional[PgCursor], optional): Database cursor to use. 
+                If not provided, a new connection will be created automatically.
+
+        Returns:
+            list[BookViewModel]: Matching books ordered by relevance; empty if the query has no words.
+        """
+        tokens = TextNormalizer.tokens(query)
+
+        if not tokens:
+            return []
+
+        if limit is None:
+            limit = cls.return_limit
+
+        ts_query = " & ".join(f"{token}:*" for token in tokens)
+        source = cls._view_source()
+        search, Search = DBTables.BOOK_SEARCH, DBTableColumns.BookSearch
+
+        sql = f"""
+            SELECT {source}.*
+            FROM {search}
+            JOIN {source} ON {source}.{DBViewColumns.BookView.ID} = {search}.{Search.BOOK_ID}
+            CROSS JOIN to_tsquery('simple', %s) AS query
+            WHERE {search}.{Search.DOCUMENT} @@ query
+            ORDER BY ts_rank({search}.{Search.DOCUMENT}, query) DESC, {source}.{DBViewColumns.BookView.ID}
+            LIMIT %s OFFSET %s
+        """
+
+        with cls._use_cursor(cursor) as cursor:
+            cls._execute(cursor, sql, (ts_query, limit, offset))
+            result = cursor.fetchall()
+
+        return [cls.view_model_class(*row) for row in result]
+
+    @classmethod
+    def catalogue_changes(
+        cls,
+        since : Optional[datetime] = None,
+        cursor : Optional[PgCursor] = None
+    ) -> tuple[list[view_model_class], list[int], Optional[datetime]]:
+        """
+        Returns the books that changed after `since`, from the `CatalogueChange` log.
+
+        A change is anything visible in `BookView`: the book’s columns, its authors, 
+        categories or publisher, or its deletion. Changed books that are no longer in 
+        `BookView` (deleted, or left without authors or categories) are reported as removed.
+
+        Changes are stamped when they are made, not when they commit, so callers polling 
+        with the returned watermark should re-read a short overlap window.
+
+        Needs Migrations/004_catalogue_change_log.sql.
+
+        Args:
+            since (Optional[datetime], optional): Only return changes after this time. 
+                None returns every book.
+            cursor (Optional[PgCursor], optional): Database cursor to use. 
+                If not provided, a new connection will be created automatically.
+
+        Returns:
+            tuple[list[BookViewModel], list[int], Optional[datetime]]: Current rows of the 
+                changed books, IDs of removed books, and the latest change time seen 
+                (`since` if there was none).
+        """
+        change, Change = DBTables.CATALOGUE_CHANGE, DBTableColumns.CatalogueChange
+        condition = "TRUE" if since is None else f"{change}.{Change.CHANGED_AT} > %s"
+
+        query = f"""
+            SELECT {change}.{Change.BOOK_ID}, {change}.{Change.CHANGED_AT}, {cls.view_name}.*
+            FROM {change}
+            LEFT JOIN {cls.view_name} ON {cls.view_name}.{DBViewColumns.BookView.ID} = {change}.{Change.BOOK_ID}
+            WHERE {condition}
+        """
+
+        with cls._use_cursor(cursor) as cursor:
+            cls._execute(cursor, query, () if since is None else (since,))
+            result = cursor.fetchall()
+
+        books = []
+        removed = []
+        latest = since
+
+        for book_id, changed_at, *row in result:
+            if row[0] is None:
+                removed.append(book_id)
+            else:
+                books.append(cls.view_model_class(*row))
+
+            if latest is None or changed_at > latest:
+                latest = changed_at
+
+        return books, removed, latest
+
+    @classmethod
+    def full_text_search_enabled(cls) -> bool:
+        """
+        Checks whether title searches should use `full_text_search`.
+
+        Returns:
+            bool: True in `fts` search mode (see `search_mode`).
+
+        Raises:
+            ValueError: If the search mode is unknown.
+        """
+        return cls._search_mode() == "fts"
+
+    @classmethod
+    def _search_mode(cls) -> str:
+        """Returns `search_mode`, falling back to `BOOK_SEARCH_MODE` from `.env` (default `view`)."""
+        if cls.search_mode is not None:
+            mode = cls.search_mode
+        else:
+            DatabaseConnector()  # loads .env
+            mode = os.getenv("BOOK_SEARCH_MODE", "view").lower()
+
+        if mode not in ("view", "indexed", "fts"):
+            raise ValueError(f"unknown book search mode: {mode}")
+
+        return mode
+
+    @classmethod
+    def _indexed_search(
+        cls,
+        model : view_model_class,
+        categories : Optional[list[str]],
+        just_available : bool,
+        page_size : Optional[int],
+        page_token : Optional[str],
+        cursor : Optional[PgCursor]
+    ) -> PageResult:
+        """
+        `advance_search` over the base tables.
+
+        `Book`, `Publisher`, `Author` and `Category` rows are filtered where their trigram 
+        indexes apply, and only the matching books are joined and aggregated. The select 
+        list mirrors `BookView` in DataBaseBackup.sql; the two must be kept in sync.
+        """
+        book, publisher, author, category = DBTables.BOOK, DBTables.PUBLISHER, DBTables.AUTHOR, DBTables.CATEGORY
+        book_author, book_category = DBTables.BOOK_AUTHOR, DBTables.BOOK_CATEGORY
+        Book, View = DBTableColumns.Book, DBViewColumns.BookView
+
+        # Author and Category share the (id, name) shape, as do their link tables' book_id.
+        def has_named(link : str, link_column : str, named : str, match : str) -> str:
+            return f"""EXISTS (
+                    SELECT 1 FROM {link}
+                    JOIN {named} ON {named}.{DBTableColumns.Category.ID} = {link}.{link_column}
+                    WHERE {link}.{DBTableColumns.BookCategory.BOOK_ID} = {book}.{Book.ID}
+                      AND {named}.{DBTableColumns.Category.NAME} {match}
+                )"""
+
+        conditions = []
+        values = []
+
+        columns = {
+            View.ID: f"{book}.{Book.ID}",
+            View.TITLE: f"{book}.{Book.TITLE}",
+            View.PUBLISHER: f"{publisher}.{DBTableColumns.Publisher.NAME}",
+            View.TOTAL_COPIES: f"{book}.{Book.TOTAL_COPIES}",
+            View.AVAILABLE_COPIES: f"{book}.{Book.AVAILABLE_COPIES}",
+        }
+        for field, column in columns.items():
+            value = getattr(model, field)
+            if isinstance(value, UnsetType):
+                continue
+            if value is None:
+                conditions.append(f"{column} IS NULL")
+            elif isinstance(value, str):
+                conditions.append(f"{column} LIKE %s")
+                values.append(f"%{value}%")
+            else:
+                conditions.append(f"{column} = %s")
+                values.append(value)
+
+        links = {
+            View.AUTHOR: (book_author, DBTableColumns.BookAuthor.AUTHOR_ID, author),
+            View.CATEGORY: (book_category, DBTableColumns.BookCategory.CATEGORY_ID, category),
+        }
+        for field, (link, link_column, named) in links.items():
+            value = getattr(model, field)
+            if isinstance(value, UnsetType):
+                continue
+            if value is None:
+                # BookView only lists books that have authors and categories.
+                conditions.append("FALSE")
+            else:
+                conditions.append(has_named(link, link_column, named, "LIKE %s"))
+                values.append(f"%{value}%")
+
+        if categories:
+            conditions.append(has_named(book_category, DBTableColumns.BookCategory.CATEGORY_ID, category, "= ANY(%s)"))
+            values.append(list(categories))
+
+        if just_available:
+            conditions.append(f"{book}.{Book.AVAILABLE_COPIES} > 0")
+
+        if page_token is not None:
+            conditions.append(f"{book}.{Book.ID} > %s")
+            values.append(_decode_page_token(page_token, cls.view_name))
+
+        query = f"""
+            SELECT
+                {book}.{Book.ID},
+                {book}.{Book.TITLE},
+                {publisher}.{DBTableColumns.Publisher.NAME},
+                string_agg(DISTINCT {author}.{DBTableColumns.Author.NAME}::text, ' ،'),
+                string_agg(DISTINCT {category}.{DBTableColumns.Category.NAME}::text, ' ،'),
+                {book}.{Book.TOTAL_COPIES},
+                {book}.{Book.AVAILABLE_COPIES}
+            FROM {book}
+            JOIN {publisher} ON {book}.{Book.PUBLISHER_ID} = {publisher}.{DBTableColumns.Publisher.ID}
+            JOIN {book_author} ON {book}.{Book.ID} = {book_author}.{DBTableColumns.BookAuthor.BOOK_ID}
+            JOIN {author} ON {book_author}.{DBTableColumns.BookAuthor.AUTHOR_ID} = {author}.{DBTableColumns.Author.ID}
+            JOIN {book_category} ON {book_category}.{DBTableColumns.BookCategory.BOOK_ID} = {book}.{Book.ID}
+            JOIN {category} ON {book_category}.{DBTableColumns.BookCategory.CATEGORY_ID} = {category}.{DBTableColumns.Category.ID}
+            WHERE {" AND ".join(conditions) or "TRUE"}
+            GROUP BY {book}.{Book.ID}, {publisher}.{DBTableColumns.Publisher.NAME}
+            ORDER BY {book}.{Book.ID}
+            LIMIT %s
+        """
+
+        page_size = cls._page_size(page_size)
+
+        return cls._fetch_page(cls.view_name, cls.view_model_class, query, tuple(values), page_size, cursor)
+
+
     # Inherited Methods
 
     @classmethod
-    def get_one(cls, model : model_class, cursor : Optional[PgCursor] = None) -> Optional[model_class]:
-        return super().get_one(model, cursor)
+    def get_one(cls, model : model_class, cursor : Optional[PgCursor] = None, fields : Optional[Iterable[str]] = None) -> Optional[model_class]:
+        return super().get_one(model, cursor, fields)
        
     @classmethod
-    def get_many(cls, model : model_class, cursor : Optional[PgCursor] = None) -> list[model_class]:
-        return super().get_many(model, cursor)
+    def get_many(cls, model : model_class, cursor : Optional[PgCursor] = None, fields : Optional[Iterable[str]] = None) -> list[model_class]:
+        return super().get_many(model, cursor, fields)
+
+    @classmethod
+    def iter_many(cls, model : model_class, itersize : Optional[int] = None, cursor : Optional[PgCursor] = None, fields : Optional[Iterable[str]] = None) -> Iterator[model_class]:
+        return super().iter_many(model, itersize, cursor, fields)
     
     @classmethod
-    def view_one(cls, model : view_model_class, cursor : Optional[PgCursor] = None) -> Optional[view_model_class]:
-        return super().view_one(model, cursor)
+    def view_one(cls, model : view_model_class, cursor : Optional[PgCursor] = None, fields : Optional[Iterable[str]] = None) -> Optional[view_model_class]:
+        return super().view_one(model, cursor, fields)
        
     @classmethod
-    def view_many(cls, model : view_model_class, cursor : Optional[PgCursor] = None) -> list[view_model_class]:
-        return super().view_many(model, cursor)
+    def view_many(cls, model : view_model_class, cursor : Optional[PgCursor] = None, fields : Optional[Iterable[str]] = None) -> list[view_model_class]:
+        return super().view_many(model, cursor, fields)
+
+    @classmethod
+    def view_page(cls, model : view_model_class, page_size : Optional[int] = None, page_token : Optional[str] = None, cursor : Optional[PgCursor] = None, fields : Optional[Iterable[str]] = None) -> PageResult:
+        return super().view_page(model, page_size, page_token, cursor, fields)
+
+    @classmethod
+    def iter_view(cls, model : view_model_class, itersize : Optional[int] = None, cursor : Optional[PgCursor] = None, fields : Optional[Iterable[str]] = None) -> Iterator[view_model_class]:
+        return super().iter_view(model, itersize, cursor, fields)
     
     @classmethod
     def add(cls, model : model_class, cursor : Optional[PgCursor] = None) -> model_class:
         return super().add(model, cursor)
+
+    @classmethod
+    def add_many(cls, models : list[model_class], cursor : Optional[PgCursor] = None) -> list[model_class]:
+        return super().add_many(models, cursor)
     
     @classmethod
     def update(cls, model : model_class, cursor: Optional[PgCursor] = None) -> None:
         return super().update(model, cursor)
+
+    @classmethod
+    def update_many(cls, models : list[model_class], cursor: Optional[PgCursor] = None) -> None:
+        return super().update_many(models, cursor)
             
     @classmethod
     def delete(cls, id : int, cursor: Optional[PgCursor] = None) -> None:
         return super().delete(id, cursor)
+
+    @classmethod
+    def delete_many(cls, ids : list[int], cursor: Optional[PgCursor] = None) -> int:
+        return super().delete_many(ids, cursor)
     
 
     # Forbidden Methods
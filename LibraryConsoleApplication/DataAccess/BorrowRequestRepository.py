@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional
+from typing import Iterable, Optional
 from zoneinfo import ZoneInfo
 from DataAccess.CommonQueriesRepository import CommonQueriesRepository
 from DataAccess.Decorators import forbidden_method
@@ -68,41 +68,33 @@ class BorrowRequestRepository(CommonQueriesRepository):
         Returns:
             BorrowRequestModel: The newly inserted borrow request record.
         """
-        commit_and_close = False
-        if cursor is None:
-            cursor = cls._get_cursor()
-            commit_and_close = True
+        with cls._use_cursor(cursor) as cursor:
+            member_model = MemberModel(id=model.member_id)
+            book_model = BookModel(id=model.book_id)
         
-        member_model = MemberModel(id=model.member_id)
-        book_model = BookModel(id=model.book_id)
+            member_db_model = MemberRepository.get_one(member_model, cursor)
+            book_db_model = BookRepository.get_one(book_model, cursor)
         
-        member_db_model = MemberRepository.get_one(member_model, cursor)
-        book_db_model = BookRepository.get_one(book_model, cursor)
+            if member_db_model is None:
+                raise NotSuchModelInDataBaseError('can not find member', member_model)
         
-        if member_db_model is None:
-            raise NotSuchModelInDataBaseError('can not find member', member_model)
-        
-        if book_db_model is None:
-            raise NotSuchModelInDataBaseError('can not find book', book_model)
+            if book_db_model is None:
+                raise NotSuchModelInDataBaseError('can not find book', book_model)
 
-        if member_db_model.active is False:
-            raise InactiveMemberBorrowRequestError()
+            if member_db_model.active is False:
+                raise InactiveMemberBorrowRequestError()
 
-        if book_db_model.available_copies == 0:
-            raise BookOutOfStockError()
+            if book_db_model.available_copies == 0:
+                raise BookOutOfStockError()
 
-        now = datetime.now(ZoneInfo("Asia/Tehran"))
-        status = BorrowRequestStatus.pending
+            now = datetime.now(ZoneInfo("Asia/Tehran"))
+            status = BorrowRequestStatus.pending
 
-        model.request_timestamp = now
-        model.status = status
+            model.request_timestamp = now
+            model.status = status
+
+            result = super().add(model, cursor)
 
-        result = super().add(model, cursor)
-    
-        if commit_and_close:
-            cursor.connection.commit()
-            cursor.connection.close()
-            
         return result
     
     @classmethod
@@ -135,49 +127,41 @@ class BorrowRequestRepository(CommonQueriesRepository):
         Returns:
             None
         """
-        commit_and_close = False
-        if cursor is None:
-            cursor = cls._get_cursor()
-            commit_and_close = True
-
-        db_model = cls.get_one(BorrowRequestModel(id=model.id), cursor)
+        with cls._use_cursor(cursor) as cursor:
+            db_model = cls.get_one(BorrowRequestModel(id=model.id), cursor)
         
-        if db_model is None:
-            raise NotSuchModelInDataBaseError('can not find borrow request', BorrowRequestModel(id=model.id))
+            if db_model is None:
+                raise NotSuchModelInDataBaseError('can not find borrow request', BorrowRequestModel(id=model.id))
         
-        if not db_model.status == BorrowRequestStatus.pending:
-            raise BorrowRequestAlreadyHandledError()
+            if not db_model.status == BorrowRequestStatus.pending:
+                raise BorrowRequestAlreadyHandledError()
 
-        if not model.status in [BorrowRequestStatus.accepted, BorrowRequestStatus.rejected]:
-            raise ValueError('status must be accepted or rejected')
+            if not model.status in [BorrowRequestStatus.accepted, BorrowRequestStatus.rejected]:
+                raise ValueError('status must be accepted or rejected')
 
-        now = datetime.now(ZoneInfo("Asia/Tehran"))
-        model.handled_at = now
-        
-        super().update(model, cursor)
+            now = datetime.now(ZoneInfo("Asia/Tehran"))
+            model.handled_at = now
         
-        if commit_and_close:
-            cursor.connection.commit()
-            cursor.connection.close()
+            super().update(model, cursor)
     
 
     # Inherited Methods
             
     @classmethod
-    def get_one(cls, model : model_class, cursor : Optional[PgCursor] = None) -> Optional[model_class]:
-        return super().get_one(model, cursor)
+    def get_one(cls, model : model_class, cursor : Optional[PgCursor] = None, fields : Optional[Iterable[str]] = None) -> Optional[model_class]:
+        return super().get_one(model, cursor, fields)
        
     @classmethod
-    def get_many(cls, model : model_class, cursor : Optional[PgCursor] = None) -> list[model_class]:
-        return super().get_many(model, cursor)
+    def get_many(cls, model : model_class, cursor : Optional[PgCursor] = None, fields : Optional[Iterable[str]] = None) -> list[model_class]:
+        return super().get_many(model, cursor, fields)
     
     @classmethod
-    def view_one(cls, model : view_model_class, cursor : Optional[PgCursor] = None) -> Optional[view_model_class]:
-        return super().view_one(model, cursor)
+    def view_one(cls, model : view_model_class, cursor : Optional[PgCursor] = None, fields : Optional[Iterable[str]] = None) -> Optional[view_model_class]:
+        return super().view_one(model, cursor, fields)
        
     @classmethod
-    def view_many(cls, model : view_model_class, cursor : Optional[PgCursor] = None) -> list[view_model_class]:
-        return super().view_many(model, cursor)
+    def view_many(cls, model : view_model_class, cursor : Optional[PgCursor] = None, fields : Optional[Iterable[str]] = None) -> list[view_model_class]:
+        return super().view_many(model, cursor, fields)
 
     @classmethod
     def clear(cls, cursor: Optional[PgCursor] = None) -> None:
@@ -197,6 +181,18 @@ class BorrowRequestRepository(CommonQueriesRepository):
     def remove(cls, model, use_like_for_strings : bool = True, cursor: Optional[PgCursor] = None):
         """Disabled method. Not allowed for this repository."""
         pass
+
+    @classmethod
+    @forbidden_method
+    def add_many(cls, models, cursor : Optional[PgCursor] = None):
+        """Disabled method. Not allowed for this repository."""
+        pass
+
+    @classmethod
+    @forbidden_method
+    def update_many(cls, models, cursor: Optional[PgCursor] = None):
+        """Disabled method. Not allowed for this repository."""
+        pass
             
 
 if __name__ == '__main__':
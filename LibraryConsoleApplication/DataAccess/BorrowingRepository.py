@@ -1,10 +1,11 @@
 from datetime import datetime
-from typing import Optional
+from typing import Iterable, Optional
 from zoneinfo import ZoneInfo
 from DataAccess.CommonQueriesRepository import CommonQueriesRepository
 from DataAccess.Decorators import forbidden_method
 from DataAccess.BookRepository import BookRepository
-from Exceptions.Exceptions import AlreadyReturnedBookError, BookOutOfStockError, NotSuchModelInDataBaseError
+from DataAccess.SqlBuilder import cached_where_statement
+from Exceptions.Exceptions import AlreadyReturnedBookError, BookOutOfStockError, EmptyModelError, MultipleRowsReturnedError, NotSuchModelInDataBaseError
 from Models.Models import BookModel, BorrowingModel, BorrowingViewModel
 from Models.Schema import DBTableColumns, DBTables, DBViews
 from psycopg2.extensions import cursor as PgCursor
@@ -37,19 +38,18 @@ class BorrowingRepository(CommonQueriesRepository):
 
         This method registers a new borrowing event in the database. It checks whether 
         the requested book exists and has available copies before creating the borrowing 
-        record. Once the record is added, it decreases the books `available_copies` count 
-        by one.
+        record. The check and the decrease of the book’s `available_copies` count are one 
+        conditional `UPDATE`, so concurrent checkouts can not oversell a book.
 
         If no database cursor is provided, the method opens a new connection, performs 
         the operation, commits the transaction, and closes the connection automatically.
 
         Workflow:
-            1. Verify that the referenced book exists.
-            2. Check that at least one copy of the book is available.
+            1. Decrease the book’s available copies if at least one copy is available.
+            2. If nothing was decreased, tell a missing book from an out-of-stock one.
             3. Set borrowing metadata (start date, end date, returned flag).
             4. Insert a new borrowing record into the database.
-            5. Decrease the books available copies.
-            6. Commit and close the connection (if opened internally).
+            5. Commit and close the connection (if opened internally).
 
         Args:
             model (BorrowingModel): The borrowing record to be inserted into the database.
@@ -63,35 +63,23 @@ class BorrowingRepository(CommonQueriesRepository):
         Returns:
             BorrowingModel: The newly added borrowing record, as stored in the database.
         """
-        commit_and_close = False
-        if cursor is None:
-            cursor = cls._get_cursor()
-            commit_and_close = True
-
-        book_model = BookModel(id = model.book_id)
-        book_db_model = BookRepository.get_one(book_model, cursor)
-        
-        if book_db_model is None:
-            raise NotSuchModelInDataBaseError('can not find book', book_model)
+        with cls._use_cursor(cursor) as cursor:
+            book_db_model = BookRepository.take_copy(model.book_id, cursor)
         
-        if book_db_model.available_copies == 0:
-            raise BookOutOfStockError()
+            if book_db_model is None:
+                book_model = BookModel(id = model.book_id)
+                if BookRepository.get_one(book_model, cursor) is None:
+                    raise NotSuchModelInDataBaseError('can not find book', book_model)
+                raise BookOutOfStockError()
 
-        now = datetime.now(ZoneInfo("Asia/Tehran"))
+            now = datetime.now(ZoneInfo("Asia/Tehran"))
 
-        model.start_date=now
-        model.end_date=None
-        model.returned=False
+            model.start_date=now
+            model.end_date=None
+            model.returned=False
+
+            result = super().add(model, cursor)
 
-        result = super().add(model, cursor)
-        
-        book_db_model.available_copies -= 1
-        BookRepository.update(book_db_model, cursor)
-    
-        if commit_and_close:
-            cursor.connection.commit()
-            cursor.connection.close()
-         
         return result
 
     @classmethod
@@ -102,17 +90,19 @@ class BorrowingRepository(CommonQueriesRepository):
         This method finalizes the borrowing process by setting the `returned` field of 
         the borrowing record to `True` and assigning the current timestamp as the 
         `end_date`. It then increments the `available_copies` count of the corresponding 
-        book in the `BookRepository`.
+        book in the `BookRepository`. Both changes are single conditional `UPDATE`s: the 
+        record is only updated while it is not returned yet, so a book can not be 
+        returned twice, and only when the model matches exactly one open borrowing, so
+        an ambiguous model changes nothing.
 
         If no database cursor is provided, the method opens a new connection and commits 
         the changes automatically before closing it.
 
         Workflow:
-            1. Fetch the borrowing record from the database.
-            2. Validate that the record exists and has not already been returned.
-            3. Mark the record as returned and update the return date.
-            4. Update the related books available copies.
-            5. Commit and close the connection (if it was opened internally).
+            1. Mark the record as returned and set the return date, if it is not returned yet.
+            2. If nothing was updated, tell a missing record from an already returned one.
+            3. Increase the related book’s available copies.
+            4. Commit and close the connection (if it was opened internally).
 
         Args:
             model (BorrowingModel): The borrowing record to be marked as returned.
@@ -122,54 +112,77 @@ class BorrowingRepository(CommonQueriesRepository):
         Raises:
             NotSuchModelInDataBaseError: If the borrowing record does not exist.
             AlreadyReturnedBookError: If the book was already marked as returned.
+            MultipleRowsReturnedError: If the model matches more than one borrowing record.
 
         Returns:
             None
         """
-        commit_and_close = False
-        if cursor is None:
-            cursor = cls._get_cursor()
-            commit_and_close = True
-            
-        borrowing_db_model = cls.get_one(model,cursor)
-        
-        if borrowing_db_model is None:
-            raise NotSuchModelInDataBaseError('can not find borrowing record', model)
-        
-        if borrowing_db_model.returned is True:
-            raise AlreadyReturnedBookError()
-        
-        borrowing_db_model.returned = True
-        borrowing_db_model.end_date = datetime.now(ZoneInfo("Asia/Tehran"))
+        # The first column is the number of open borrowings matched (at most 2); the
+        # update only runs when it is exactly one.
+        statement = cached_where_statement(
+            (cls, "return_book"),
+            model,
+            lambda where_clause: f"""
+                WITH matched AS (
+                    SELECT {DBTableColumns.Borrowing.ID} FROM {cls.table_name}
+                    WHERE {where_clause} AND {DBTableColumns.Borrowing.RETURNED} = FALSE
+                    LIMIT 2
+                ), updated AS (
+                    UPDATE {cls.table_name}
+                    SET {DBTableColumns.Borrowing.RETURNED} = TRUE, {DBTableColumns.Borrowing.END_DATE} = %s
+                    WHERE {DBTableColumns.Borrowing.ID} IN (SELECT {DBTableColumns.Borrowing.ID} FROM matched)
+                    AND (SELECT count(*) FROM matched) = 1
+                    AND {DBTableColumns.Borrowing.RETURNED} = FALSE
+                    RETURNING *
+                )
+                SELECT (SELECT count(*) FROM matched), updated.*
+                FROM (SELECT 1) AS single_row
+                LEFT JOIN updated ON TRUE
+                """,
+            exclude=cls.where_clause_exclude | {DBTableColumns.Borrowing.RETURNED, DBTableColumns.Borrowing.END_DATE}
+        )
+
+        if statement is None:
+            raise EmptyModelError()
+
+        query, values = statement
+        now = datetime.now(ZoneInfo("Asia/Tehran"))
 
-        super().update(borrowing_db_model, cursor)
-        
-        book_db_model = BookRepository.get_one(BookModel(id=borrowing_db_model.book_id),cursor=cursor)
-        book_db_model.available_copies += 1
-        BookRepository.update(book_db_model,cursor=cursor)
-    
-        if commit_and_close:
-            cursor.connection.commit()
-            cursor.connection.close()
+        with cls._use_cursor(cursor) as cursor:
+            cls._execute(cursor, query, (*values, now))
+            matched, *result = cursor.fetchone()
+
+            if matched > 1:
+                raise MultipleRowsReturnedError()
+
+            if result[0] is None:
+                if cls.get_one(model, cursor) is None:
+                    raise NotSuchModelInDataBaseError('can not find borrowing record', model)
+                raise AlreadyReturnedBookError()
+
+            borrowing_db_model = cls.model_class(*result)
+
+            # Returns None only if every copy is already in stock; the borrowing is still closed.
+            BookRepository.put_back_copy(borrowing_db_model.book_id, cursor)
 
 
     # Inherited Methods
 
     @classmethod
-    def get_one(cls, model : model_class, cursor : Optional[PgCursor] = None) -> Optional[model_class]:
-        return super().get_one(model, cursor)
+    def get_one(cls, model : model_class, cursor : Optional[PgCursor] = None, fields : Optional[Iterable[str]] = None) -> Optional[model_class]:
+        return super().get_one(model, cursor, fields)
        
     @classmethod
-    def get_many(cls, model : model_class, cursor : Optional[PgCursor] = None) -> list[model_class]:
-        return super().get_many(model, cursor)
+    def get_many(cls, model : model_class, cursor : Optional[PgCursor] = None, fields : Optional[Iterable[str]] = None) -> list[model_class]:
+        return super().get_many(model, cursor, fields)
     
     @classmethod
-    def view_one(cls, model : view_model_class, cursor : Optional[PgCursor] = None) -> Optional[view_model_class]:
-        return super().view_one(model, cursor)
+    def view_one(cls, model : view_model_class, cursor : Optional[PgCursor] = None, fields : Optional[Iterable[str]] = None) -> Optional[view_model_class]:
+        return super().view_one(model, cursor, fields)
        
     @classmethod
-    def view_many(cls, model : view_model_class, cursor : Optional[PgCursor] = None) -> list[view_model_class]:
-        return super().view_many(model, cursor)
+    def view_many(cls, model : view_model_class, cursor : Optional[PgCursor] = None, fields : Optional[Iterable[str]] = None) -> list[view_model_class]:
+        return super().view_many(model, cursor, fields)
 
 
     # Forbidden Methods
@@ -198,6 +211,12 @@ class BorrowingRepository(CommonQueriesRepository):
         """Disabled method. Not allowed for this repository."""
         pass
 
+    @classmethod
+    @forbidden_method
+    def add_many(cls, models, cursor : Optional[PgCursor] = None):
+        """Disabled method. Not allowed for this repository."""
+        pass
+
     
     
     
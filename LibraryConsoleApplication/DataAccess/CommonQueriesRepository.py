@@ -1,9 +1,18 @@
-﻿from typing import Optional
+﻿import base64
+import io
+import json
+from datetime import date, datetime, time
+from enum import Enum
+from itertools import count
+from typing import Any, Hashable, Iterable, Iterator, Optional
+from uuid import UUID
+from psycopg2.extras import execute_values
 from DataAccess.BaseRepository import BaseRepository
-from Exceptions.Exceptions import EmptyModelError, MultipleRowsReturnedError
+from Exceptions.Exceptions import EmptyModelError, InvalidPageTokenError, MultipleRowsReturnedError, RepositoryMethodNotAllowedError
 from psycopg2.extensions import cursor as PgCursor
-from DataAccess.SqlBuilder import build_insert_clause, build_set_clause, build_where_clause
-from Models.Models import BaseTableModel, BaseViewModel, UnsetType
+from DataAccess.Transaction import current_cursor
+from DataAccess.SqlBuilder import cached_insert_statement, cached_set_statement, cached_where_statement, collect_insert_values, collect_set_values, model_field_names, shape_columns
+from Models.Models import BaseTableModel, BaseViewModel, PageResult, UnsetType
 
 
 class CommonQueriesRepository(BaseRepository):
@@ -27,185 +36,509 @@ class CommonQueriesRepository(BaseRepository):
     
     # ─────────────────────────────── Basic Table Operations ───────────────────────────────
     @classmethod
-    def get_one(cls, model : BaseTableModel, cursor : Optional[PgCursor] = None) -> Optional[BaseTableModel]:
+    def get_one(cls, model : BaseTableModel, cursor : Optional[PgCursor] = None, fields : Optional[Iterable[str]] = None) -> Optional[BaseTableModel]:
         """Retrieve a single record matching the provided model’s non-null fields.
 
+        Example:
+            BookRepository.get_one(BookModel(id=7), fields=('title', 'available_copies'))
+
         Args:
             model (BaseTableModel): Model instance whose populated attributes are used to build the WHERE clause.
             cursor (Optional[PgCursor]): Optional cursor to reuse an existing transaction.
+            fields (Optional[Iterable[str]]): Model fields to read; the others are left `UNSET`. Defaults to all fields.
 
         Returns:
             Optional[BaseTableModel]: The matching record as a model instance, or None if not found.
 
         Raises:
             EmptyModelError: Raise when attempting to search by an empty model.
+            ValueError: If `fields` is empty or names a field the model does not have.
         """
-        commit_and_close = False
-        if cursor is None:
-            cursor = cls._get_cursor()
-            commit_and_close = True
-        
-        where_clause, values = build_where_clause(model, exclude=cls.where_clause_exclude)
+        columns = _projection(cls.model_class, fields)
+        statement = cached_where_statement(
+            (cls, "get_one", columns),
+            model,
+            lambda where_clause: f"""
+                SELECT {_select_list(columns)} FROM {cls.table_name} 
+                WHERE {where_clause}
+                """,
+            exclude=cls.where_clause_exclude
+        )
 
-        if not where_clause:
+        if statement is None:
             raise EmptyModelError()
 
-        query = (
-            f"""
-            SELECT * FROM {cls.table_name} 
-            WHERE {where_clause}
-            """
-        )
-        
-        cursor.execute(query, values)
-        
-        if cursor.rowcount > 1:
-            raise MultipleRowsReturnedError()
-        
-        result = cursor.fetchone()
-        
-        if commit_and_close:
-            cursor.connection.commit()
-            cursor.connection.close()
-            
+        query, values = statement
+
+        def load():
+            with cls._use_cursor(cursor) as scoped_cursor:
+                cls._execute(scoped_cursor, query, values)
+
+                if scoped_cursor.rowcount > 1:
+                    raise MultipleRowsReturnedError()
+
+                return scoped_cursor.fetchone()
+
+        result = cls._cached_read(cursor, (query, *values), load)
+
         if result is None:
             return None
             
-        return cls.model_class(*result)
+        return _to_model(cls.model_class, columns, result)
        
     @classmethod
-    def get_many(cls, model : BaseTableModel, cursor : Optional[PgCursor] = None) -> list[BaseTableModel]:
+    def get_many(cls, model : BaseTableModel, cursor : Optional[PgCursor] = None, fields : Optional[Iterable[str]] = None) -> list[BaseTableModel]:
         """Retrieve multiple records matching the provided model’s filtering fields.
 
         Args:
             model (BaseTableModel): Model instance used as a filter (non-null attributes form WHERE conditions).
             cursor (Optional[PgCursor]): Optional cursor to reuse an existing transaction.
+            fields (Optional[Iterable[str]]): Model fields to read; the others are left `UNSET`. Defaults to all fields.
 
         Returns:
             list[BaseTableModel]: A list of model instances matching the filter.
+
+        Raises:
+            ValueError: If `fields` is empty or names a field the model does not have.
         """
-        commit_and_close = False
-        if cursor is None:
-            cursor = cls._get_cursor()
-            commit_and_close = True
+        columns = _projection(cls.model_class, fields)
+        statement = cached_where_statement(
+            (cls, "get_many", columns),
+            model,
+            lambda where_clause: f"""
+                SELECT {_select_list(columns)} FROM {cls.table_name}
+                WHERE {where_clause}
+                LIMIT %s
+                """,
+            use_like_for_strings=True,
+            exclude=cls.where_clause_exclude
+        )
 
-        where_clause, values = build_where_clause(model, use_like_for_strings=True, exclude=cls.where_clause_exclude)
-        
-        if not where_clause:
-            query = (
-                f"""
-                SELECT * FROM {cls.table_name}
-                LIMIT {cls.return_limit}
-                """
-            )
-            cursor.execute(query)
-            
+        if statement is None:
+            query, values = f"SELECT {_select_list(columns)} FROM {cls.table_name} LIMIT %s", []
         else:
-            query = (
-                f"""
-                SELECT * FROM {cls.table_name}
-                WHERE {where_clause}
-                LIMIT {cls.return_limit}
-                """
-            )
-            cursor.execute(query, values)
-            
-        result = cursor.fetchall()
-        
-        if commit_and_close:
-            cursor.connection.commit()
-            cursor.connection.close()
-            
-        return [cls.model_class(*row) for row in result]
+            query, values = statement
+
+        def load():
+            with cls._use_cursor(cursor) as scoped_cursor:
+                cls._execute(scoped_cursor, query, (*values, cls.return_limit))
+                return scoped_cursor.fetchall()
+
+        result = cls._cached_read(cursor, (query, *values, cls.return_limit), load)
+
+        return [_to_model(cls.model_class, columns, row) for row in result]
     
     @classmethod
-    def view_one(cls, model : BaseViewModel, cursor : Optional[PgCursor] = None) -> Optional[BaseViewModel]:
+    def view_one(cls, model : BaseViewModel, cursor : Optional[PgCursor] = None, fields : Optional[Iterable[str]] = None) -> Optional[BaseViewModel]:
         """Retrieve a single record from the view corresponding to the provided model’s filters.
 
         Args:
             model (BaseViewModel): View model with fields to filter results.
             cursor (Optional[PgCursor]): Optional database cursor.
+            fields (Optional[Iterable[str]]): View model fields to read; the others are left `UNSET`. Defaults to all fields.
 
         Returns:
             Optional[BaseViewModel]: The matching record as a view model instance, or None if not found.
+
+        Raises:
+            ValueError: If `fields` is empty or names a field the view model does not have.
         """
-        commit_and_close = False
-        if cursor is None:
-            cursor = cls._get_cursor()
-            commit_and_close = True
-        
-        where_clause, values = build_where_clause(model, exclude=cls.where_clause_exclude)
+        source = cls._view_source()
+        columns = _projection(cls.view_model_class, fields)
+        statement = cached_where_statement(
+            (cls, "view_one", source, columns),
+            model,
+            lambda where_clause: f"""
+                SELECT {_select_list(columns)} FROM {source} 
+                WHERE {where_clause}
+                """,
+            exclude=cls.where_clause_exclude
+        )
 
-        if not where_clause:
+        if statement is None:
             raise EmptyModelError()
 
-        query = (
-            f"""
-            SELECT * FROM {cls.view_name} 
-            WHERE {where_clause}
-            """
-        )
-        
-        cursor.execute(query, values)
-        
-        if cursor.rowcount > 1:
-            raise MultipleRowsReturnedError()
-        
-        result = cursor.fetchone()
-        
-        if commit_and_close:
-            cursor.connection.commit()
-            cursor.connection.close()
-                        
+        query, values = statement
+
+        def load():
+            with cls._use_cursor(cursor) as scoped_cursor:
+                cls._execute(scoped_cursor, query, values)
+
+                if scoped_cursor.rowcount > 1:
+                    raise MultipleRowsReturnedError()
+
+                return scoped_cursor.fetchone()
+
+        result = cls._cached_read(cursor, (query, *values), load)
+
         if result is None:
             return None
 
-        return cls.view_model_class(*result)
+        return _to_model(cls.view_model_class, columns, result)
 
     @classmethod
-    def view_many(cls, model : BaseViewModel, cursor : Optional[PgCursor] = None) -> list[BaseViewModel]:
+    def view_many(cls, model : BaseViewModel, cursor : Optional[PgCursor] = None, fields : Optional[Iterable[str]] = None) -> list[BaseViewModel]:
         """Retrieve multiple records from the associated view.
 
+        Selecting only the needed `fields` also lets PostgreSQL skip computing the view
+        columns that are left out, such as aggregated author and category lists.
+
         Args:
             model (BaseViewModel): View model instance containing filter fields.
             cursor (Optional[PgCursor]): Optional database cursor.
+            fields (Optional[Iterable[str]]): View model fields to read; the others are left `UNSET`. Defaults to all fields.
 
         Returns:
             list[BaseViewModel]: List of matching view model instances.
+
+        Raises:
+            ValueError: If `fields` is empty or names a field the view model does not have.
         """
-        commit_and_close = False
-        if cursor is None:
-            cursor = cls._get_cursor()
-            commit_and_close = True
+        source = cls._view_source()
+        columns = _projection(cls.view_model_class, fields)
+        statement = cached_where_statement(
+            (cls, "view_many", source, columns),
+            model,
+            lambda where_clause: f"""
+                SELECT {_select_list(columns)} FROM {source}
+                WHERE {where_clause}
+                LIMIT %s
+                """,
+            use_like_for_strings=True,
+            exclude=cls.where_clause_exclude
+        )
 
-        where_clause, values = build_where_clause(model, use_like_for_strings=True, exclude=cls.where_clause_exclude)
-        
-        if not where_clause:
-            query = (
-                f"""
-                SELECT * FROM {cls.view_name} 
-                LIMIT {cls.return_limit}
-                """
-            )
-            cursor.execute(query)
-            
+        if statement is None:
+            query, values = f"SELECT {_select_list(columns)} FROM {source} LIMIT %s", []
+        else:
+            query, values = statement
+
+        def load():
+            with cls._use_cursor(cursor) as scoped_cursor:
+                cls._execute(scoped_cursor, query, (*values, cls.return_limit))
+                return scoped_cursor.fetchall()
+
+        result = cls._cached_read(cursor, (query, *values, cls.return_limit), load)
+
+        return [_to_model(cls.view_model_class, columns, row) for row in result]
+    
+    @classmethod
+    def get_page(
+        cls,
+        model : BaseTableModel,
+        page_size : Optional[int] = None,
+        page_token : Optional[str] = None,
+        cursor : Optional[PgCursor] = None,
+        fields : Optional[Iterable[str]] = None
+    ) -> PageResult:
+        """Retrieve one page of records matching the model’s filtering fields, ordered by `page_key`.
+
+        Uses keyset pagination (`WHERE page_key > last_key ORDER BY page_key LIMIT n`), so every
+        page costs the same no matter how deep it is, and rows added or removed on earlier pages
+        do not shift later ones.
+
+        Example:
+            page = BookRepository.get_page(BookModel(), page_size=10)
+            while page.next_token is not None:
+                page = BookRepository.get_page(BookModel(), page_size=10, page_token=page.next_token)
+
+        Args:
+            model (BaseTableModel): Model instance used as a filter (non-null attributes form WHERE conditions).
+            page_size (Optional[int]): Maximum number of records per page. Defaults to `return_limit`.
+            page_token (Optional[str]): `next_token` of the previous page, or None for the first page.
+            cursor (Optional[PgCursor]): Optional cursor to reuse an existing transaction.
+            fields (Optional[Iterable[str]]): Model fields to read; the others are left `UNSET`. `page_key`
+                is always read. Defaults to all fields.
+
+        Returns:
+            PageResult: The records of the page and the token of the next page.
+
+        Raises:
+            InvalidPageTokenError: If `page_token` is malformed or belongs to another table.
+            RepositoryMethodNotAllowedError: If `get_many` is forbidden for this repository.
+            ValueError: If `page_size` is less than 1, or `fields` is empty or names a field the model does not have.
+        """
+        return cls._page(cls.table_name, cls.model_class, "get_page", model, page_size, page_token, cursor, fields=fields)
+
+    @classmethod
+    def view_page(
+        cls,
+        model : BaseViewModel,
+        page_size : Optional[int] = None,
+        page_token : Optional[str] = None,
+        cursor : Optional[PgCursor] = None,
+        fields : Optional[Iterable[str]] = None
+    ) -> PageResult:
+        """Retrieve one page of records from the associated view, ordered by `page_key`.
+
+        See `get_page` for the pagination semantics.
+
+        Args:
+            model (BaseViewModel): View model instance containing filter fields.
+            page_size (Optional[int]): Maximum number of records per page. Defaults to `return_limit`.
+            page_token (Optional[str]): `next_token` of the previous page, or None for the first page.
+            cursor (Optional[PgCursor]): Optional database cursor.
+            fields (Optional[Iterable[str]]): View model fields to read; the others are left `UNSET`. `page_key`
+                is always read. Defaults to all fields.
+
+        Returns:
+            PageResult: The records of the page and the token of the next page.
+
+        Raises:
+            InvalidPageTokenError: If `page_token` is malformed or belongs to another view.
+            RepositoryMethodNotAllowedError: If `view_many` is forbidden for this repository.
+            ValueError: If `page_size` is less than 1, or `fields` is empty or names a field the view model does not have.
+        """
+        return cls._page(cls.view_name, cls.view_model_class, "view_page", model, page_size, page_token, cursor, from_source=cls._view_source(), fields=fields)
+
+    @classmethod
+    def _page(
+        cls,
+        source : str,
+        model_class : type,
+        operation : Hashable,
+        model,
+        page_size : Optional[int],
+        page_token : Optional[str],
+        cursor : Optional[PgCursor],
+        conditions : str = "TRUE",
+        condition_values : tuple = (),
+        from_source : Optional[str] = None,
+        fields : Optional[Iterable[str]] = None
+    ) -> PageResult:
+        """Shared implementation of `get_page` and `view_page`.
+
+        Subclasses may pass extra SQL `conditions` (with `%s` placeholders bound to
+        `condition_values`); they are ANDed to the model filter. `operation` is part of
+        the statement cache key, so it must change whenever `conditions` does.
+        Rows are read from `from_source` (default `source`, e.g. a materialized copy of
+        the view); page tokens stay scoped to `source`. With `fields`, only those columns
+        and `page_key` are read.
+
+        Paging a table is refused where `get_many` is forbidden, and paging the view where
+        `view_many` is, so pages never expose rows the repository does not allow to list.
+        """
+        table_read = source == cls.table_name
+        if cls._is_forbidden("get_many" if table_read else "view_many"):
+            raise RepositoryMethodNotAllowedError("get_page" if table_read else "view_page", cls.__name__)
+
+        page_size = cls._page_size(page_size)
+
+        if from_source is None:
+            from_source = source
+
+        key = cls.page_key
+        columns = _projection(model_class, fields)
+        if columns is not None and key not in columns:
+            columns = _projection(model_class, (*columns, key))
+        after = [] if page_token is None else [_decode_page_token(page_token, source)]
+        key_condition = f"{key} > %s" if after else "TRUE"
+
+        statement = cached_where_statement(
+            (cls, operation, bool(after), from_source, columns),
+            model,
+            lambda where_clause: f"""
+                SELECT {_select_list(columns)} FROM {from_source}
+                WHERE {where_clause} AND {conditions} AND {key_condition}
+                ORDER BY {key}
+                LIMIT %s
+                """,
+            use_like_for_strings=True,
+            exclude=cls.where_clause_exclude
+        )
+
+        if statement is None:
+            query, values = f"SELECT {_select_list(columns)} FROM {from_source} WHERE {conditions} AND {key_condition} ORDER BY {key} LIMIT %s", []
         else:
-            query = (
-                f"""
-                SELECT * FROM {cls.view_name}
+            query, values = statement
+
+        return cls._fetch_page(source, model_class, query, (*values, *condition_values, *after), page_size, cursor, columns)
+
+    @classmethod
+    def _page_size(cls, page_size : Optional[int]) -> int:
+        """Resolve the `page_size` argument of a paged read.
+
+        Args:
+            page_size (Optional[int]): Requested records per page, or None for `return_limit`.
+
+        Returns:
+            int: The page size to read.
+
+        Raises:
+            ValueError: If `page_size` is less than 1.
+        """
+        if page_size is None:
+            return cls.return_limit
+
+        if page_size < 1:
+            raise ValueError(f"page_size must be at least 1, got {page_size}")
+
+        return page_size
+
+    @classmethod
+    def _fetch_page(
+        cls,
+        source : str,
+        model_class : type,
+        query : str,
+        values : tuple,
+        page_size : int,
+        cursor : Optional[PgCursor],
+        columns : Optional[tuple] = None
+    ) -> PageResult:
+        """Run a keyset page query and build its `PageResult`.
+
+        `query` must order by `page_key` and end with `LIMIT %s`; the limit is bound
+        here as `page_size + 1`, the extra row telling whether there is a next page.
+        `columns` names the selected columns when the query does not select `*`.
+        """
+        with cls._use_cursor(cursor) as cursor:
+            cls._execute(cursor, query, (*values, page_size + 1))
+            result = cursor.fetchall()
+
+        rows = [_to_model(model_class, columns, row) for row in result[:page_size]]
+        next_token = None
+
+        if len(result) > page_size:
+            next_token = _encode_page_token(source, getattr(rows[-1], cls.page_key))
+
+        return PageResult(rows, next_token)
+
+    @classmethod
+    def iter_many(
+        cls,
+        model : BaseTableModel,
+        itersize : Optional[int] = None,
+        cursor : Optional[PgCursor] = None,
+        fields : Optional[Iterable[str]] = None
+    ) -> Iterator[BaseTableModel]:
+        """Stream every record matching the provided model’s filtering fields.
+
+        Unlike `get_many`, the result is not capped by `return_limit` and is never held in
+        memory as a whole: rows are read through a server-side (named) cursor, `itersize`
+        rows per round trip, and turned into models as the caller iterates.
+
+        With `cursor`, or inside a `transaction()` scope, rows are read on that connection;
+        do not commit it while iterating. Otherwise the generator reads on a dedicated pooled
+        connection that stays checked out until it is exhausted or closed, so close it when
+        stopping early. It does not open a transaction scope, so repository calls made while
+        iterating run and commit on their own as usual.
+
+        Example:
+            for book in BookRepository.iter_many(BookModel(publisher_id=3)):
+                writer.writerow(astuple(book))
+
+        Args:
+            model (BaseTableModel): Model instance used as a filter (non-null attributes form WHERE conditions).
+            itersize (Optional[int]): Rows fetched per round trip. Defaults to `itersize`.
+            cursor (Optional[PgCursor]): Optional cursor to reuse an existing transaction.
+            fields (Optional[Iterable[str]]): Model fields to read; the others are left `UNSET`. Defaults to all fields.
+
+        Yields:
+            BaseTableModel: Matching records, one model at a time.
+
+        Raises:
+            RepositoryMethodNotAllowedError: If `get_many` is forbidden for this repository.
+            ValueError: If `fields` is empty or names a field the model does not have.
+        """
+        if cls._is_forbidden("get_many"):
+            raise RepositoryMethodNotAllowedError("iter_many", cls.__name__)
+
+        return cls._iterate(cls.table_name, cls.model_class, "iter_many", model, itersize, cursor, fields)
+
+    @classmethod
+    def iter_view(
+        cls,
+        model : BaseViewModel,
+        itersize : Optional[int] = None,
+        cursor : Optional[PgCursor] = None,
+        fields : Optional[Iterable[str]] = None
+    ) -> Iterator[BaseViewModel]:
+        """Stream every record of the associated view matching the provided model’s filters.
+
+        See `iter_many` for the streaming semantics.
+
+        Args:
+            model (BaseViewModel): View model instance containing filter fields.
+            itersize (Optional[int]): Rows fetched per round trip. Defaults to `itersize`.
+            cursor (Optional[PgCursor]): Optional database cursor.
+            fields (Optional[Iterable[str]]): View model fields to read; the others are left `UNSET`. Defaults to all fields.
+
+        Yields:
+            BaseViewModel: Matching view records, one model at a time.
+
+        Raises:
+            RepositoryMethodNotAllowedError: If `view_many` is forbidden for this repository.
+            ValueError: If `fields` is empty or names a field the view model does not have.
+        """
+        if cls._is_forbidden("view_many"):
+            raise RepositoryMethodNotAllowedError("iter_view", cls.__name__)
+
+        return cls._iterate(cls._view_source(), cls.view_model_class, "iter_view", model, itersize, cursor, fields)
+
+    @classmethod
+    def _iterate(
+        cls,
+        source : str,
+        model_class : type,
+        operation : Hashable,
+        model,
+        itersize : Optional[int],
+        cursor : Optional[PgCursor],
+        fields : Optional[Iterable[str]] = None
+    ) -> Iterator:
+        """Shared implementation of `iter_many` and `iter_view`.
+
+        The statement is built eagerly, so an invalid filter fails at the call rather than
+        at the first `next()`. Named cursors are declared with `DECLARE`, which cannot run
+        a prepared statement, so `use_prepared_statements` does not apply here.
+
+        Without an explicit cursor or active scope the generator must not enter
+        `transaction()`: it would bind the scope in the caller's context for as long as the
+        caller iterates, pulling the caller's writes into it and rolling them back when the
+        generator is closed early.
+        """
+        columns = _projection(model_class, fields)
+        statement = cached_where_statement(
+            (cls, operation, source, columns),
+            model,
+            lambda where_clause: f"""
+                SELECT {_select_list(columns)} FROM {source}
                 WHERE {where_clause}
-                LIMIT {cls.return_limit}
-                """
-            )
-            cursor.execute(query, values)
-            
-        result = cursor.fetchall()
-        
-        if commit_and_close:
-            cursor.connection.commit()
-            cursor.connection.close()
-            
-        return [cls.view_model_class(*row) for row in result]
+                """,
+            use_like_for_strings=True,
+            exclude=cls.where_clause_exclude
+        )
+
+        if statement is None:
+            query, values = f"SELECT {_select_list(columns)} FROM {source}", []
+        else:
+            query, values = statement
+
+        if itersize is None:
+            itersize = cls.itersize
+
+        def rows():
+            outer_cursor = cursor if cursor is not None else current_cursor()
+            dedicated = cls._get_connection() if outer_cursor is None else None
+            connection = dedicated if dedicated is not None else outer_cursor.connection
+
+            try:
+                named_cursor = connection.cursor(f"lca_iter_{next(_iter_cursor_counter)}")
+                named_cursor.itersize = itersize
+                try:
+                    named_cursor.execute(query, values)
+                    for row in named_cursor:
+                        yield _to_model(model_class, columns, row)
+                finally:
+                    named_cursor.close()
+            finally:
+                if dedicated is not None:
+                    # The stream only reads, so its transaction has nothing to keep.
+                    dedicated.rollback()
+                    dedicated.close()
+
+        return rows()
     
     @classmethod
     def add(cls, model : BaseTableModel, cursor : Optional[PgCursor] = None) -> BaseTableModel:
@@ -221,34 +554,132 @@ class CommonQueriesRepository(BaseRepository):
         Raises:
             EmptyModelError: Raise when attempting to add an empty model.    
         """
-        commit_and_close = False
-        if cursor is None:
-            cursor = cls._get_cursor()
-            commit_and_close = True
-
-        columns_clause, placeholders_clause, values = build_insert_clause(model, exclude=cls.insert_clause_exclude)
+        statement = cached_insert_statement(
+            (cls, "add"),
+            model,
+            lambda columns_clause, placeholders_clause: f"""
+                INSERT INTO {cls.table_name} (
+                    {columns_clause}
+                )
+                VALUES ({placeholders_clause})
+                RETURNING *
+                """,
+            exclude=cls.insert_clause_exclude
+        )
 
-        if not columns_clause:
+        if statement is None:
             raise EmptyModelError()
 
-        query = (
+        query, values = statement
+
+        with cls._use_cursor(cursor) as cursor:
+            cls._execute(cursor, query, values)
+            result = cursor.fetchone()
+            cls._after_write(cursor = cursor)
+
+        return cls.model_class(*result)
+    
+    @classmethod
+    def add_many(cls, models : list[BaseTableModel], cursor : Optional[PgCursor] = None) -> list[BaseTableModel]:
+        """Insert many records into the table with multi-row statements.
+
+        Models are grouped by the set of columns they provide (after `insert_clause_exclude`),
+        and each group is sent with `execute_values` in pages of `bulk_page_size` rows. Groups of
+        at least `bulk_copy_threshold` rows are streamed with `COPY FROM STDIN` into a temporary
+        table and moved over with one `INSERT ... SELECT`.
+
+        Args:
+            models (list[BaseTableModel]): Model instances containing data to insert.
+            cursor (Optional[PgCursor]): Optional database cursor.
+
+        Returns:
+            list[BaseTableModel]: The inserted records, in the same order as `models`.
+
+        Raises:
+            EmptyModelError: Raise when one of the models has nothing to insert.
+        """
+        groups : dict = {}
+        for index, model in enumerate(models):
+            shape, values = collect_insert_values(model, cls.insert_clause_exclude)
+
+            if not shape:
+                raise EmptyModelError()
+
+            groups.setdefault((type(model), shape), []).append((index, values))
+
+        results : list = [None] * len(models)
+
+        if not groups:
+            return results
+
+        with cls._use_cursor(cursor) as cursor:
+            for (model_class, shape), rows in groups.items():
+                columns = shape_columns(model_class, shape)
+                values = [row_values for _, row_values in rows]
+
+                if len(rows) >= cls.bulk_copy_threshold:
+                    inserted = cls._copy_insert(cursor, columns, values)
+                else:
+                    query = f"""
+                        INSERT INTO {cls.table_name} ({", ".join(columns)})
+                        VALUES %s
+                        RETURNING *
+                    """
+                    inserted = execute_values(cursor, query, values, page_size=cls.bulk_page_size, fetch=True)
+
+                for (index, _), row in zip(rows, inserted):
+                    results[index] = cls.model_class(*row)
+
+            cls._after_write(cursor = cursor)
+
+        return results
+
+    @classmethod
+    def _copy_insert(cls, cursor : PgCursor, columns : tuple, rows : list[list]) -> list[tuple]:
+        """Insert rows through `COPY FROM STDIN` and return the inserted records in input order.
+
+        `COPY` can not return rows, so the data is copied into a temporary table (with an
+        ordinal column) and then inserted into the real table with `INSERT ... SELECT ... RETURNING *`.
+
+        Args:
+            cursor (PgCursor): Cursor to execute on.
+            columns (tuple): Target column names.
+            rows (list[list]): Values of each row, in column order.
+
+        Returns:
+            list[tuple]: The inserted rows.
+        """
+        staging = f"_lca_copy_{next(_copy_table_counter)}"
+        column_list = ", ".join(columns)
+
+        cursor.execute(
             f"""
-            INSERT INTO {cls.table_name} (
-                {columns_clause}
-            )
-            VALUES ({placeholders_clause})
+            CREATE TEMP TABLE {staging} ON COMMIT DROP AS
+            SELECT 0::bigint AS _ordinal, {column_list} FROM {cls.table_name} WITH NO DATA
+            """
+        )
+
+        buffer = io.StringIO()
+        for ordinal, values in enumerate(rows):
+            buffer.write(str(ordinal))
+            for value in values:
+                buffer.write("\t")
+                buffer.write(_copy_text(value))
+            buffer.write("\n")
+        buffer.seek(0)
+
+        cursor.copy_expert(f"COPY {staging} (_ordinal, {column_list}) FROM STDIN", buffer)
+        cursor.execute(
+            f"""
+            INSERT INTO {cls.table_name} ({column_list})
+            SELECT {column_list} FROM {staging} ORDER BY _ordinal
             RETURNING *
             """
         )
-        
-        cursor.execute(query, values)
-        result = cursor.fetchone()
-        
-        if commit_and_close:
-            cursor.connection.commit()
-            cursor.connection.close()
-            
-        return cls.model_class(*result)
+        inserted = cursor.fetchall()
+        cursor.execute(f"DROP TABLE {staging}")
+
+        return inserted
     
     @classmethod
     def update(cls, model : BaseTableModel, cursor: Optional[PgCursor] = None) -> None:
@@ -261,28 +692,26 @@ class CommonQueriesRepository(BaseRepository):
         if model.id is None or isinstance(model.id, UnsetType):
             raise ValueError("Model must have an 'id' to perform update.")
     
-        commit_and_close = False
-        if cursor is None:
-            cursor = cls._get_cursor()
-            commit_and_close = True
-
-        set_clause, values = build_set_clause(model, exclude=cls.set_clause_exclude)
+        statement = cached_set_statement(
+            (cls, "update"),
+            model,
+            lambda set_clause: f"""
+                UPDATE {cls.table_name}
+                SET {set_clause}
+                WHERE id = %s
+            """,
+            exclude=cls.set_clause_exclude
+        )
 
-        if not set_clause:
+        if statement is None:
             return  # Nothing to update
 
-        query = f"""
-            UPDATE {cls.table_name}
-            SET {set_clause}
-            WHERE id = %s
-        """
-    
+        query, values = statement
         values.append(model.id)
-        cursor.execute(query, values)
 
-        if commit_and_close:
-            cursor.connection.commit()
-            cursor.connection.close()
+        with cls._use_cursor(cursor) as cursor:
+            cls._execute(cursor, query, values)
+            cls._after_write(cursor = cursor)
             
     @classmethod
     def delete(cls, id : int, cursor: Optional[PgCursor] = None) -> None:
@@ -292,21 +721,124 @@ class CommonQueriesRepository(BaseRepository):
             id (int): The ID of the record to delete.
             cursor (Optional[PgCursor]): Optional database cursor.
         """
-        commit_and_close = False
-        if cursor is None:
-            cursor = cls._get_cursor()
-            commit_and_close = True
-
-        query = f"""
-            DELETE FROM {cls.table_name}
-            WHERE id = %s
-        """
+        with cls._use_cursor(cursor) as cursor:
+            query = f"""
+                DELETE FROM {cls.table_name}
+                WHERE id = %s
+            """
     
-        cursor.execute(query, (id,))
+            cls._execute(cursor, query, (id,))
+            cls._after_write(cursor = cursor)
+            
+    @classmethod
+    def update_many(cls, models : list[BaseTableModel], cursor: Optional[PgCursor] = None) -> None:
+        """Update many existing records, each by its primary key, with set-based statements.
+
+        Models are grouped by the set of columns they change (after `set_clause_exclude`);
+        each group becomes one `UPDATE ... FROM (VALUES ...)` statement per `bulk_page_size`
+        rows. Models with nothing to change are skipped, as in `update`.
+
+        Args:
+            models (list[BaseTableModel]): Model instances containing updated data.
+            cursor (Optional[PgCursor]): Optional database cursor.
+
+        Raises:
+            ValueError: If one of the models has no `id`.
+            RepositoryMethodNotAllowedError: If `update` is forbidden for this repository.
+        """
+        if cls._is_forbidden("update"):
+            raise RepositoryMethodNotAllowedError("update_many", cls.__name__)
+
+        groups : dict = {}
+        for model in models:
+            if model.id is None or isinstance(model.id, UnsetType):
+                raise ValueError("Model must have an 'id' to perform update.")
+
+            shape, values = collect_set_values(model, cls.set_clause_exclude)
+
+            if shape:
+                groups.setdefault((type(model), shape), []).append((model.id, *values))
+
+        if not groups:
+            return  # Nothing to update
+
+        with cls._use_cursor(cursor) as cursor:
+            column_types = cls._column_types(cursor)
+
+            for (model_class, shape), rows in groups.items():
+                columns = shape_columns(model_class, shape)
+                set_clause = ", ".join(f"{column} = v.{column}" for column in columns)
+                template = "(" + ", ".join(f"%s::{column_types[column]}" for column in ("id", *columns)) + ")"
+
+                query = f"""
+                    UPDATE {cls.table_name} AS t
+                    SET {set_clause}
+                    FROM (VALUES %s) AS v(id, {", ".join(columns)})
+                    WHERE t.id = v.id
+                """
+                execute_values(cursor, query, rows, template=template, page_size=cls.bulk_page_size)
+
+            cls._after_write(cursor = cursor)
 
-        if commit_and_close:
-            cursor.connection.commit()
-            cursor.connection.close()
+    @classmethod
+    def delete_many(cls, ids : list, cursor: Optional[PgCursor] = None) -> int:
+        """Delete many records by their primary key IDs in one statement.
+
+        Args:
+            ids (list): IDs of the records to delete.
+            cursor (Optional[PgCursor]): Optional database cursor.
+
+        Returns:
+            int: Number of deleted records.
+
+        Raises:
+            RepositoryMethodNotAllowedError: If `delete` is forbidden for this repository.
+        """
+        if cls._is_forbidden("delete"):
+            raise RepositoryMethodNotAllowedError("delete_many", cls.__name__)
+
+        if not ids:
+            return 0
+
+        with cls._use_cursor(cursor) as cursor:
+            query = f"""
+                DELETE FROM {cls.table_name}
+                WHERE id = ANY(%s)
+            """
+
+            cls._execute(cursor, query, (list(ids),))
+            deleted = cursor.rowcount
+            cls._after_write(cursor = cursor)
+
+        return deleted
+
+    @classmethod
+    def _column_types(cls, cursor : PgCursor) -> dict[str, str]:
+        """Return the SQL type of every column of the table, read once from the catalog.
+
+        Needed to cast the untyped literals of a `VALUES` list to the column types.
+
+        Args:
+            cursor (PgCursor): Cursor to query the catalog with.
+
+        Returns:
+            dict[str, str]: Column name -> SQL type (e.g. `character varying(255)`).
+        """
+        column_types = _column_types_cache.get(cls.table_name)
+
+        if column_types is None:
+            cursor.execute(
+                """
+                SELECT attname, format_type(atttypid, atttypmod)
+                FROM pg_attribute
+                WHERE attrelid = %s::regclass AND attnum > 0 AND NOT attisdropped
+                """,
+                (cls.table_name,)
+            )
+            column_types = dict(cursor.fetchall())
+            _column_types_cache[cls.table_name] = column_types
+
+        return column_types
             
     @classmethod
     def remove(cls, model : BaseTableModel, use_like_for_strings : bool = True, cursor: Optional[PgCursor] = None) -> None:
@@ -320,26 +852,25 @@ class CommonQueriesRepository(BaseRepository):
         Raises:
             EmptyModelError: Raise when attempting to filter removing records by an empty model. Use clear() method instead.
         """
-        commit_and_close = False
-        if cursor is None:
-            cursor = cls._get_cursor()
-            commit_and_close = True
-
-        where_clause, values = build_where_clause(model, use_like_for_strings, cls.where_clause_exclude)
+        statement = cached_where_statement(
+            (cls, "remove"),
+            model,
+            lambda where_clause: f"""
+                DELETE FROM {cls.table_name}
+                WHERE {where_clause}
+            """,
+            use_like_for_strings=use_like_for_strings,
+            exclude=cls.where_clause_exclude
+        )
 
-        if not where_clause:
+        if statement is None:
             raise EmptyModelError()
 
-        query = f"""
-            DELETE FROM {cls.table_name}
-            WHERE {where_clause}
-        """
-    
-        cursor.execute(query, values)
+        query, values = statement
 
-        if commit_and_close:
-            cursor.connection.commit()
-            cursor.connection.close()
+        with cls._use_cursor(cursor) as cursor:
+            cls._execute(cursor, query, values)
+            cls._after_write(cursor = cursor)
             
     @classmethod
     def clear(cls, cursor: Optional[PgCursor] = None) -> None:
@@ -348,19 +879,12 @@ class CommonQueriesRepository(BaseRepository):
         Args:
             cursor (Optional[PgCursor]): Optional database cursor.
         """
-        commit_and_close = False
-        if cursor is None:
-            cursor = cls._get_cursor()
-            commit_and_close = True
-            
-        query = f"""
-            DELETE FROM {cls.table_name}
-        """
-        cursor.execute(query)
-
-        if commit_and_close:
-            cursor.connection.commit()
-            cursor.connection.close()
+        with cls._use_cursor(cursor) as cursor:
+            query = f"""
+                DELETE FROM {cls.table_name}
+            """
+            cursor.execute(query)
+            cls._after_write(cursor = cursor)
 
 
     # ─────────────────────────────── Generic Table Operations ───────────────────────────────   
@@ -377,34 +901,29 @@ class CommonQueriesRepository(BaseRepository):
         Returns:
             tuple: Tuple representing the retrieved row, or None if not found.
         """
-        commit_and_close = False
-        if cursor is None:
-            cursor = cls._get_cursor()
-            commit_and_close = True
-        
-        where_clause, values = build_where_clause(model, exclude=exclude)
+        statement = cached_where_statement(
+            (table, "get_one_from"),
+            model,
+            lambda where_clause: f"""
+                SELECT * FROM {table} 
+                WHERE {where_clause}
+                """,
+            exclude=exclude
+        )
 
-        if not where_clause:
+        if statement is None:
             raise EmptyModelError()
 
-        query = (
-            f"""
-            SELECT * FROM {table} 
-            WHERE {where_clause}
-            """
-        )
-        
-        cursor.execute(query, values)
-        
-        if cursor.rowcount > 1:
-            raise MultipleRowsReturnedError()
+        query, values = statement
+
+        with cls._use_cursor(cursor) as cursor:
+            cls._execute(cursor, query, values)
         
-        result = cursor.fetchone()
+            if cursor.rowcount > 1:
+                raise MultipleRowsReturnedError()
         
-        if commit_and_close:
-            cursor.connection.commit()
-            cursor.connection.close()
-            
+            result = cursor.fetchone()
+
         return result
        
     @classmethod
@@ -420,38 +939,27 @@ class CommonQueriesRepository(BaseRepository):
         Returns:
             list[tuple]: List of retrieved rows.
         """
-        commit_and_close = False
-        if cursor is None:
-            cursor = cls._get_cursor()
-            commit_and_close = True
-
-        where_clause, values = build_where_clause(model, use_like_for_strings=True, exclude=exclude)
-        
-        if not where_clause:
-            query = (
-                f"""
-                SELECT * FROM {table} 
-                LIMIT {cls.return_limit}
-                """
-            )
-            cursor.execute(query)
-            
-        else:
-            query = (
-                f"""
+        statement = cached_where_statement(
+            (table, "get_many_from"),
+            model,
+            lambda where_clause: f"""
                 SELECT * FROM {table}
                 WHERE {where_clause}
-                LIMIT {cls.return_limit}
-                """
-            )
-            cursor.execute(query, values)
-            
-        result = cursor.fetchall()
-        
-        if commit_and_close:
-            cursor.connection.commit()
-            cursor.connection.close()
-            
+                LIMIT %s
+                """,
+            use_like_for_strings=True,
+            exclude=exclude
+        )
+
+        if statement is None:
+            query, values = f"SELECT * FROM {table} LIMIT %s", []
+        else:
+            query, values = statement
+
+        with cls._use_cursor(cursor) as cursor:
+            cls._execute(cursor, query, (*values, cls.return_limit))
+            result = cursor.fetchall()
+
         return result
     
     @classmethod
@@ -467,33 +975,28 @@ class CommonQueriesRepository(BaseRepository):
         Returns:
             tuple: The inserted row (or tuple representing generated fields).
         """
-        commit_and_close = False
-        if cursor is None:
-            cursor = cls._get_cursor()
-            commit_and_close = True
-
-        columns_clause, placeholders_clause, values = build_insert_clause(model, exclude)
+        statement = cached_insert_statement(
+            (table, "add_to"),
+            model,
+            lambda columns_clause, placeholders_clause: f"""
+                INSERT INTO {table} (
+                    {columns_clause}
+                )
+                VALUES ({placeholders_clause})
+                RETURNING *
+                """,
+            exclude=exclude
+        )
 
-        if not columns_clause:
+        if statement is None:
             raise EmptyModelError()
 
-        query = (
-            f"""
-            INSERT INTO {table} (
-                {columns_clause}
-            )
-            VALUES ({placeholders_clause})
-            RETURNING *
-            """
-        )
-        
-        cursor.execute(query, values)
-        result = cursor.fetchone()
-        
-        if commit_and_close:
-            cursor.connection.commit()
-            cursor.connection.close()
-            
+        query, values = statement
+
+        with cls._use_cursor(cursor) as cursor:
+            cls._execute(cursor, query, values)
+            result = cursor.fetchone()
+
         return result
     
     @classmethod
@@ -509,28 +1012,25 @@ class CommonQueriesRepository(BaseRepository):
         if model.id is None or isinstance(model.id, UnsetType):
             raise ValueError("Model must have an 'id' to perform update.")
     
-        commit_and_close = False
-        if cursor is None:
-            cursor = cls._get_cursor()
-            commit_and_close = True
-
-        set_clause, values = build_set_clause(model, exclude)
+        statement = cached_set_statement(
+            (table, "update_from"),
+            model,
+            lambda set_clause: f"""
+                UPDATE {table}
+                SET {set_clause}
+                WHERE id = %s
+            """,
+            exclude=exclude
+        )
 
-        if not set_clause:
+        if statement is None:
             return  # Nothing to update
 
-        query = f"""
-            UPDATE {table}
-            SET {set_clause}
-            WHERE id = %s
-        """
-    
+        query, values = statement
         values.append(model.id)
-        cursor.execute(query, values)
 
-        if commit_and_close:
-            cursor.connection.commit()
-            cursor.connection.close()
+        with cls._use_cursor(cursor) as cursor:
+            cls._execute(cursor, query, values)
             
     @classmethod
     def delete_from(cls, id : int, table : str, cursor: Optional[PgCursor] = None) -> None:
@@ -541,21 +1041,13 @@ class CommonQueriesRepository(BaseRepository):
             table (str): Table name.
             cursor (Optional[PgCursor]): Optional database cursor.
         """
-        commit_and_close = False
-        if cursor is None:
-            cursor = cls._get_cursor()
-            commit_and_close = True
-
-        query = f"""
-            DELETE FROM {table}
-            WHERE id = %s
-        """
+        with cls._use_cursor(cursor) as cursor:
+            query = f"""
+                DELETE FROM {table}
+                WHERE id = %s
+            """
     
-        cursor.execute(query, (id,))
-
-        if commit_and_close:
-            cursor.connection.commit()
-            cursor.connection.close()
+            cls._execute(cursor, query, (id,))
             
     @classmethod
     def remove_from(cls, model, table : str, use_like_for_strings : bool = True, cursor: Optional[PgCursor] = None) -> None:
@@ -567,24 +1059,101 @@ class CommonQueriesRepository(BaseRepository):
             use_like_for_strings (bool): Whether to use SQL LIKE for string comparisons.
             cursor (Optional[PgCursor]): Optional database cursor.
         """
-        commit_and_close = False
-        if cursor is None:
-            cursor = cls._get_cursor()
-            commit_and_close = True
+        statement = cached_where_statement(
+            (table, "remove_from"),
+            model,
+            lambda where_clause: f"""
+                DELETE FROM {table}
+                WHERE {where_clause}
+            """,
+            use_like_for_strings=use_like_for_strings
+        )
 
-        where_clause, values = build_where_clause(model, use_like_for_strings)
-        
-        if not where_clause:
+        if statement is None:
             raise EmptyModelError()
 
-        query = f"""
-            DELETE FROM {table}
-            WHERE {where_clause}
-        """
-    
-        cursor.execute(query, values)
+        query, values = statement
+
+        with cls._use_cursor(cursor) as cursor:
+            cls._execute(cursor, query, values)
+
 
-        if commit_and_close:
-            cursor.connection.commit()
-            cursor.connection.close()
-            
\ No newline at end of file
+_copy_table_counter = count(1)
+_iter_cursor_counter = count(1)
+_column_types_cache : dict = {}
+
+
+def _projection(model_class : type, fields : Optional[Iterable[str]]) -> Optional[tuple]:
+    """Validate a read's field subset and put it in model field order (None reads every column).
+
+    The order is canonical so that the same subset always maps to the same cached statement.
+    """
+    if fields is None:
+        return None
+
+    if isinstance(fields, str):
+        fields = (fields,)
+    requested = set(fields)
+    names = model_field_names(model_class)
+
+    unknown = requested.difference(names)
+    if unknown:
+        raise ValueError(f"{model_class.__name__} has no fields {sorted(unknown)}")
+    if not requested:
+        raise ValueError("fields must name at least one field")
+
+    return tuple(name for name in names if name in requested)
+
+
+def _select_list(columns : Optional[tuple]) -> str:
+    """Render the SELECT list of a read: `*`, or the quoted column names."""
+    if columns is None:
+        return "*"
+    return ", ".join(f'"{column}"' for column in columns)
+
+
+def _to_model(model_class : type, columns : Optional[tuple], row : tuple) -> Any:
+    """Build a model from a row selected with `_select_list(columns)`; unselected fields stay `UNSET`."""
+    if columns is None:
+        return model_class(*row)
+    return model_class(**dict(zip(columns, row)))
+
+
+def _copy_text(value) -> str:
+    """Render a Python value as a field of PostgreSQL's `COPY` text format."""
+    if value is None:
+        return "\\N"
+    if isinstance(value, Enum):
+        value = value.value
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+def _encode_page_token(source : str, last_key : Any) -> str:
+    """Pack the table/view name and the last key of a page into an opaque URL-safe token."""
+    if isinstance(last_key, UUID):
+        last_key = str(last_key)
+    payload = json.dumps([source, last_key], ensure_ascii=False).encode("utf-8")
+    return base64.urlsafe_b64encode(payload).decode("ascii")
+
+
+def _decode_page_token(token : str, source : str) -> Any:
+    """Unpack a token made by `_encode_page_token`, checking that it belongs to `source`."""
+    try:
+        token_source, last_key = json.loads(base64.urlsafe_b64decode(token.encode("ascii")))
+    except (ValueError, TypeError, UnicodeError) as error:
+        raise InvalidPageTokenError("malformed page token") from error
+
+    if token_source != source:
+        raise InvalidPageTokenError("page token belongs to another query")
+
+    return last_key
@@ -1,25 +1,350 @@
 ﻿import psycopg2
 import os
+import re
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Optional, Sequence
 from dotenv import load_dotenv
 from pathlib import Path
 from psycopg2.extensions import connection as PgConnection, cursor as PgCursor
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE, TRANSACTION_STATUS_UNKNOWN
+from Exceptions.Exceptions import ConnectionPoolExhaustedError
+
+
+class PooledConnection(PgConnection):
+    """PostgreSQL connection that belongs to a `ConnectionPool`.
+
+    Calling `close()` does not tear down the TCP session; it hands the
+    connection back to the pool it was borrowed from. This keeps the
+    existing `cursor.connection.close()` calls across the repositories
+    working unchanged while turning them into cheap pool returns.
+
+    The connection also remembers which server-side prepared statements
+    exist in its session (see `execute_prepared`), since prepared statements
+    live and die with the database session.
+
+    Attributes:
+        _pool (Optional[ConnectionPool]): Owning pool, or None for a detached connection.
+        _last_used (float): Monotonic time when the connection was last returned to the pool.
+        _checked_out (bool): Whether the connection is currently borrowed; guards against double release.
+        _prepared (OrderedDict[str, str]): SQL text -> prepared statement name, in LRU order.
+        _prepared_counter (int): Sequence used to name new prepared statements.
+    """
+
+    _placeholder_pattern = re.compile(r"%(s|%)")
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._pool = None
+        self._last_used = time.monotonic()
+        self._checked_out = False
+        self._prepared : OrderedDict = OrderedDict()
+        self._prepared_counter = 0
+
+    def close(self) -> None:
+        """Return the connection to its pool, or close it if it is not pooled."""
+        if self._pool is not None:
+            self._pool.release(self)
+        else:
+            super().close()
+
+    def _close_physical(self) -> None:
+        """Really close the underlying database session."""
+        self._pool = None
+        self._prepared.clear()
+        super().close()
+
+    @classmethod
+    def _to_positional(cls, sql: str) -> str:
+        """Rewrite psycopg2 `%s` placeholders as PostgreSQL `$1, $2, ...` parameters."""
+        counter = 0
+
+        def replace(match):
+            nonlocal counter
+            if match.group(1) == "%":
+                return "%"
+            counter += 1
+            return f"${counter}"
+
+        return cls._placeholder_pattern.sub(replace, sql)
+
+    def execute_prepared(self, cursor: PgCursor, sql: str, values: Sequence = (), limit: int = 64) -> None:
+        """Execute `sql` through a server-side prepared statement.
+
+        The first time a statement is seen on this connection it is sent with
+        `PREPARE`, so PostgreSQL parses and plans it once per session; later
+        calls only send `EXECUTE` with the parameter values. At most `limit`
+        statements are kept per connection; the least recently used one is
+        released with `DEALLOCATE` when the bound is exceeded.
+
+        Args:
+            cursor (PgCursor): Cursor opened on this connection.
+            sql (str): Statement using `%s` placeholders.
+            values (Sequence): Parameter values, in placeholder order.
+            limit (int): Maximum number of prepared statements kept on this connection.
+        """
+        name = self._prepared.get(sql)
+
+        if name is None:
+            while len(self._prepared) >= limit > 0:
+                _, evicted = self._prepared.popitem(last=False)
+                cursor.execute(f"DEALLOCATE {evicted}")
+
+            self._prepared_counter += 1
+            name = f"lca_stmt_{self._prepared_counter}"
+            cursor.execute(f"PREPARE {name} AS {self._to_positional(sql)}")
+            self._prepared[sql] = name
+        else:
+            self._prepared.move_to_end(sql)
+
+        if values:
+            placeholders = ", ".join(["%s"] * len(values))
+            cursor.execute(f"EXECUTE {name} ({placeholders})", values)
+        else:
+            cursor.execute(f"EXECUTE {name}")
+
+
+class ConnectionPool:
+    """Bounded, thread-safe pool of `PooledConnection` objects.
+
+    Connections are created lazily up to `max_size`. When every connection
+    is borrowed, `acquire()` blocks until one is returned or `checkout_timeout`
+    expires. Idle connections above `min_size` are closed after `idle_timeout`
+    seconds, and connections that have been idle longer than `ping_after`
+    seconds are checked with a `SELECT 1` before being handed out.
+
+    Attributes:
+        min_size (int): Number of connections kept open even when idle.
+        max_size (int): Maximum number of connections (idle + borrowed).
+        idle_timeout (float): Seconds after which an idle connection above `min_size` is closed.
+        checkout_timeout (float): Seconds `acquire()` waits for a free connection.
+        ping_after (float): Idle seconds after which a connection is pinged on checkout.
+        prepared_statements (bool): Whether repositories should run their generated SQL as prepared statements.
+        prepared_statements_limit (int): Maximum number of prepared statements kept per connection.
+    """
+
+    def __init__(
+        self,
+        min_size: int,
+        max_size: int,
+        idle_timeout: float,
+        checkout_timeout: float,
+        ping_after: float,
+        prepared_statements: bool = False,
+        prepared_statements_limit: int = 64,
+        **connect_kwargs
+    ):
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError("pool sizes must satisfy 0 <= min_size <= max_size and max_size >= 1")
+
+        self.min_size = min_size
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.checkout_timeout = checkout_timeout
+        self.ping_after = ping_after
+        self.prepared_statements = prepared_statements
+        self.prepared_statements_limit = prepared_statements_limit
+        self._connect_kwargs = connect_kwargs
+
+        self._idle : deque = deque()
+        self._total = 0
+        self._closed = False
+        self._condition = threading.Condition(threading.Lock())
+
+        for _ in range(min_size):
+            self._idle.append(self._connect())
+            self._total += 1
+
+    def _connect(self) -> PooledConnection:
+        """Open a new physical connection and attach it to this pool."""
+        conn = psycopg2.connect(connection_factory=PooledConnection, **self._connect_kwargs)
+        conn._pool = self
+        conn._checked_out = True
+        return conn
+
+    def _is_healthy(self, conn: PooledConnection) -> bool:
+        """Check that an idle connection can still be used."""
+        if conn.closed or conn.get_transaction_status() == TRANSACTION_STATUS_UNKNOWN:
+            return False
+
+        if time.monotonic() - conn._last_used < self.ping_after:
+            return True
+
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    def _evict_idle(self) -> list:
+        """Pop idle connections that exceeded `idle_timeout` (caller holds the lock)."""
+        expired = []
+        now = time.monotonic()
+        while self._idle and self._total > self.min_size:
+            oldest = self._idle[0]
+            if now - oldest._last_used < self.idle_timeout:
+                break
+            expired.append(self._idle.popleft())
+            self._total -= 1
+        return expired
+
+    def acquire(self) -> PooledConnection:
+        """Borrow a connection from the pool.
+
+        Returns:
+            PooledConnection: A healthy connection. Call `close()` on it to give it back.
+
+        Raises:
+            ConnectionPoolExhaustedError: If no connection becomes free within `checkout_timeout`.
+            psycopg2.OperationalError: If a new connection cannot be opened.
+        """
+        deadline = time.monotonic() + self.checkout_timeout
+
+        while True:
+            with self._condition:
+                if self._closed:
+                    raise ConnectionPoolExhaustedError("connection pool is closed")
+
+                expired = self._evict_idle()
+                conn = None
+                create = False
+                timed_out = False
+
+                if self._idle:
+                    conn = self._idle.pop()
+                elif self._total < self.max_size:
+                    self._total += 1
+                    create = True
+                else:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0 or not self._condition.wait(remaining):
+                        timed_out = not self._idle and self._total >= self.max_size
+
+            for old in expired:
+                old._close_physical()
+
+            if timed_out:
+                raise ConnectionPoolExhaustedError(
+                    f"no database connection available after {self.checkout_timeout} seconds"
+                )
+
+            if create:
+                try:
+                    return self._connect()
+                except Exception:
+                    with self._condition:
+                        self._total -= 1
+                        self._condition.notify()
+                    raise
+
+            if conn is not None:
+                if self._is_healthy(conn):
+                    conn._checked_out = True
+                    return conn
+                self._discard(conn)
+
+    def release(self, conn: PooledConnection) -> None:
+        """Return a borrowed connection to the pool.
+
+        Any transaction left open is rolled back so the next borrower starts clean.
+        Broken connections are discarded instead of being reused. Releasing a
+        connection that is not borrowed (e.g. a second `close()`) does nothing, so
+        two borrowers can never share one session.
+
+        Args:
+            conn (PooledConnection): Connection previously returned by `acquire()`.
+        """
+        with self._condition:
+            if not conn._checked_out:
+                return
+            conn._checked_out = False
+
+        if conn.closed:
+            self._discard(conn)
+            return
+
+        if conn.get_transaction_status() != TRANSACTION_STATUS_IDLE:
+            try:
+                conn.rollback()
+            except psycopg2.Error:
+                self._discard(conn)
+                return
+
+        conn._last_used = time.monotonic()
+
+        with self._condition:
+            if self._closed:
+                close_now = True
+            else:
+                close_now = False
+                self._idle.append(conn)
+                self._condition.notify()
+
+        if close_now:
+            conn._close_physical()
+
+    def _discard(self, conn: PooledConnection) -> None:
+        """Drop a connection from the pool accounting and close it."""
+        with self._condition:
+            self._total -= 1
+            self._condition.notify()
+        try:
+            conn._close_physical()
+        except psycopg2.Error:
+            pass
+
+    def close_all(self) -> None:
+        """Close every idle connection and refuse further checkouts."""
+        with self._condition:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._total -= len(idle)
+            self._condition.notify_all()
+
+        for conn in idle:
+            conn._close_physical()
+
+    @property
+    def size(self) -> int:
+        """Number of open connections (idle + borrowed)."""
+        with self._condition:
+            return self._total
+
+    @property
+    def idle_count(self) -> int:
+        """Number of connections currently waiting in the pool."""
+        with self._condition:
+            return len(self._idle)
 
 
 class DatabaseConnector:
     """Singleton class for managing PostgreSQL database connections.
 
     This class provides a centralized interface to load environment
-    variables from a `.env` file and create connections and cursors
-    for PostgreSQL using the `psycopg2` library. Ensures only one
-    instance of the connector exists across the application.
+    variables from a `.env` file and hand out pooled connections and
+    cursors for PostgreSQL using the `psycopg2` library. Ensures only one
+    instance of the connector (and therefore one pool) exists across the
+    application.
+
+    Pool settings are read from the `.env` file:
+        DB_POOL_MIN_SIZE, DB_POOL_MAX_SIZE, DB_POOL_IDLE_TIMEOUT_SECONDS,
+        DB_POOL_CHECKOUT_TIMEOUT_SECONDS, DB_POOL_PING_AFTER_SECONDS,
+        DB_PREPARED_STATEMENTS, DB_PREPARED_STATEMENTS_LIMIT.
 
     Attributes:
         _instance (Optional[DatabaseConnector]): Singleton instance of the connector.
         _env_loaded (bool): Flag indicating whether environment variables have been loaded.
+        _pool (Optional[ConnectionPool]): Lazily created connection pool.
     """
 
     _instance = None
     _env_loaded = False
+    _pool : Optional[ConnectionPool] = None
+    _pool_lock = threading.Lock()
 
     def __new__(cls):
         """Create or return the singleton instance.
@@ -39,14 +364,39 @@ class DatabaseConnector:
             load_dotenv(dotenv_path=dotenv_path)
             DatabaseConnector._env_loaded = True
 
-    def get_connection(self) -> PgConnection:
-        """Create and return a new PostgreSQL connection.
+    def get_pool(self) -> ConnectionPool:
+        """Return the shared connection pool, creating it on first use.
 
-        Reads database credentials from environment variables loaded
-        from the `.env` file and creates a connection using psycopg2.
+        Returns:
+            ConnectionPool: The application-wide connection pool.
+        """
+        if DatabaseConnector._pool is None:
+            with DatabaseConnector._pool_lock:
+                if DatabaseConnector._pool is None:
+                    DatabaseConnector._pool = ConnectionPool(
+                        min_size=int(os.getenv("DB_POOL_MIN_SIZE", "1")),
+                        max_size=int(os.getenv("DB_POOL_MAX_SIZE", "10")),
+                        idle_timeout=float(os.getenv("DB_POOL_IDLE_TIMEOUT_SECONDS", "300")),
+                        checkout_timeout=float(os.getenv("DB_POOL_CHECKOUT_TIMEOUT_SECONDS", "30")),
+                        ping_after=float(os.getenv("DB_POOL_PING_AFTER_SECONDS", "30")),
+                        prepared_statements=os.getenv("DB_PREPARED_STATEMENTS", "false").lower() in ("1", "true", "yes"),
+                        prepared_statements_limit=int(os.getenv("DB_PREPARED_STATEMENTS_LIMIT", "64")),
+                        dbname=os.getenv("DB_NAME"),
+                        user=os.getenv("DB_USER"),
+                        password=os.getenv("DB_PASSWORD"),
+                        host=os.getenv("DB_HOST"),
+                        port=os.getenv("DB_PORT")
+                    )
+        return DatabaseConnector._pool
+
+    def connect(self) -> PgConnection:
+        """Open a connection outside the pool.
+
+        For long-lived sessions that must not hold a pooled connection, such as
+        the `LISTEN` connection of the cache invalidation bus. The caller closes it.
 
         Returns:
-            PgConnection: A new connection object to the PostgreSQL database.
+            PgConnection: A new, unpooled connection to the PostgreSQL database.
 
         Raises:
             psycopg2.OperationalError: If the connection to the database fails.
@@ -59,10 +409,25 @@ class DatabaseConnector:
             port=os.getenv("DB_PORT")
         )
 
+    def get_connection(self) -> PgConnection:
+        """Borrow a PostgreSQL connection from the pool.
+
+        The returned connection goes back to the pool when `close()` is
+        called on it, so callers keep the usual commit-and-close pattern.
+
+        Returns:
+            PgConnection: A pooled connection object to the PostgreSQL database.
+
+        Raises:
+            psycopg2.OperationalError: If the connection to the database fails.
+            ConnectionPoolExhaustedError: If every pooled connection stays busy past the checkout timeout.
+        """
+        return self.get_pool().acquire()
+
     def get_cursor(self) -> PgCursor:
         """Create and return a new database cursor.
 
-        Opens a new connection via `get_connection()` and returns
+        Borrows a connection via `get_connection()` and returns
         a cursor object for executing SQL statements.
 
         Returns:
@@ -70,3 +435,11 @@ class DatabaseConnector:
         """
         conn = self.get_connection()
         return conn.cursor()
+
+    def close_all(self) -> None:
+        """Close every pooled connection. The next call to `get_connection()` builds a fresh pool."""
+        with DatabaseConnector._pool_lock:
+            pool = DatabaseConnector._pool
+            DatabaseConnector._pool = None
+        if pool is not None:
+            pool.close_all()
@@ -1,5 +1,6 @@
 ﻿from typing import Type, Callable, TypeVar, Union
 from functools import wraps
+from DataAccess.Transaction import transaction
 from Exceptions.Exceptions import MultipleRowsReturnedError, RepositoryMethodNotAllowedError
 
 T = TypeVar("T")
@@ -96,6 +97,10 @@ def forbidden_method(func):
     it raises a `RepositoryMethodNotAllowedError` with details about 
     the method and repository name.
 
+    The wrapper is marked with a `_forbidden` attribute so that generic 
+    operations built on top of a method (e.g. `update_many` on `update`) 
+    can detect the restriction via `BaseRepository._is_forbidden`.
+
     Example:
         @classmethod
         @forbidden_method
@@ -109,4 +114,29 @@ def forbidden_method(func):
     @wraps(func)
     def wrapper(cls, *args, **kwargs):
         raise RepositoryMethodNotAllowedError(func.__name__, cls.__name__)
+    wrapper._forbidden = True
+    return wrapper
+
+def transactional(func):
+    """
+    Decorator that runs the wrapped function inside a `transaction()` scope.
+
+    Every repository call made by the function (and by anything it calls) 
+    shares one pooled connection. The transaction commits when the function 
+    returns and rolls back if it raises. When a scope is already active, the 
+    function simply joins it.
+
+    Example:
+        @transactional
+        def borrow_and_log(borrowing, log):
+            BorrowingRepository.add(borrowing)
+            LibrarianActivityLogRepository.add(log)
+
+    Returns:
+        Callable: The wrapped function.
+    """
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        with transaction():
+            return func(*args, **kwargs)
     return wrapper
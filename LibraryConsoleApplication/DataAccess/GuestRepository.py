@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional
+from typing import Iterable, Optional
 from uuid import UUID, uuid4
 from zoneinfo import ZoneInfo
 from DataAccess.CommonQueriesRepository import CommonQueriesRepository
@@ -59,16 +59,17 @@ class GuestRepository(CommonQueriesRepository):
         return super().add(model, cursor)
     
     @classmethod
-    def increase_request(cls, model : model_class, cursor : Optional[PgCursor] = None) -> None:
+    def increase_request(cls, model : model_class, cursor : Optional[PgCursor] = None) -> model_class:
         """
         Increments the request count of a guest by 1.
 
-        This method fetches the guest record from the database, increases its 
-        `request_count` by one, and updates the record. If no cursor is provided, 
-        the method opens a new connection and commits the transaction automatically.
+        The increment is done by PostgreSQL in a single `UPDATE ... SET request_count =
+        request_count + 1` statement, so concurrent requests from the same guest can not
+        overwrite each other's count. If no cursor is provided, the method opens a new
+        connection and commits the transaction automatically.
 
         Args:
-            model (GuestModel): The guest record to update.
+            model (GuestModel): The guest record to update. Only `id` is used.
             cursor (Optional[PgCursor], optional): Database cursor to use. 
                 If not provided, a new connection will be created automatically.
 
@@ -76,38 +77,121 @@ class GuestRepository(CommonQueriesRepository):
             NotSuchModelInDataBaseError: If the guest does not exist in the database.
 
         Returns:
-            None
+            GuestModel: The guest record after the increment.
         """
-        commit_and_close = False
-        if cursor is None:
-            cursor = cls._get_cursor()
-            commit_and_close = True
-            
-        db_model = cls.get_one(model, cursor)
-        
-        if db_model is None:
+        query = f"""
+            UPDATE {cls.table_name}
+            SET {DBTableColumns.Guest.REQUEST_COUNT} = {DBTableColumns.Guest.REQUEST_COUNT} + 1
+            WHERE {DBTableColumns.Guest.ID} = %s
+            RETURNING *
+        """
+
+        with cls._use_cursor(cursor) as cursor:
+            cls._execute(cursor, query, (model.id,))
+            result = cursor.fetchone()
+
+        if result is None:
             raise NotSuchModelInDataBaseError('can not find guest', model)
-        
-        db_model.request_count += 1
-        
-        super().update(db_model, cursor)
 
-        if commit_and_close:
-            cursor.connection.commit()
-            cursor.connection.close()
-  
+        return cls.model_class(*result)
+
+    @classmethod
+    def consume_request(
+        cls,
+        model : model_class,
+        max_requests : int,
+        life_time_minutes : int,
+        cursor : Optional[PgCursor] = None
+    ) -> Optional[model_class]:
+        """
+        Atomically checks a guest's quota and, if allowed, counts one more request.
+
+        The test and the increment are one conditional `UPDATE`: the row is only
+        updated while `request_count` is below `max_requests` and the guest was
+        created less than `life_time_minutes` ago. Only when nothing was updated is
+        a second query made, to tell an exhausted quota from an unknown guest.
+
+        Args:
+            model (GuestModel): The guest making the request. Only `id` is used.
+            max_requests (int): Maximum number of requests a guest may make.
+            life_time_minutes (int): Minutes after creation during which the guest may make requests.
+            cursor (Optional[PgCursor], optional): Database cursor to use. 
+                If not provided, a new connection will be created automatically.
+
+        Raises:
+            NotSuchModelInDataBaseError: If the guest does not exist in the database.
+
+        Returns:
+            Optional[GuestModel]: The guest record after the increment, or None if the
+                                  request limit is reached or the guest has expired.
+        """
+        query = f"""
+            UPDATE {cls.table_name}
+            SET {DBTableColumns.Guest.REQUEST_COUNT} = {DBTableColumns.Guest.REQUEST_COUNT} + 1
+            WHERE {DBTableColumns.Guest.ID} = %s
+              AND {DBTableColumns.Guest.REQUEST_COUNT} < %s
+              AND {DBTableColumns.Guest.CREATED_TIME} > now() - %s * interval '1 minute'
+            RETURNING *
+        """
+
+        with cls._use_cursor(cursor) as cursor:
+            cls._execute(cursor, query, (model.id, max_requests, life_time_minutes))
+            result = cursor.fetchone()
+
+            if result is None:
+                if cls.get_one(GuestModel(id=model.id), cursor) is None:
+                    raise NotSuchModelInDataBaseError('can not find guest', model)
+                return None
+
+        return cls.model_class(*result)
+
+
+    @classmethod
+    def add_request_counts(cls, counts : dict[UUID, int], cursor : Optional[PgCursor] = None) -> None:
+        """
+        Adds pending request counts to many guests in one statement.
+
+        Used to write back request counts that were tracked in memory. Each guest's
+        `request_count` is increased by its entry in `counts`; unknown ids are ignored.
+
+        Args:
+            counts (dict[UUID, int]): Guest id -> number of requests to add.
+            cursor (Optional[PgCursor], optional): Database cursor to use. 
+                If not provided, a new connection will be created automatically.
+
+        Returns:
+            None
+        """
+        if not counts:
+            return
+
+        query = f"""
+            UPDATE {cls.table_name} AS g
+            SET {DBTableColumns.Guest.REQUEST_COUNT} = g.{DBTableColumns.Guest.REQUEST_COUNT} + v.delta
+            FROM (VALUES %s) AS v(id, delta)
+            WHERE g.{DBTableColumns.Guest.ID} = v.id
+        """
+
+        with cls._use_cursor(cursor) as cursor:
+            psycopg2.extras.execute_values(
+                cursor, query, list(counts.items()), template="(%s::uuid, %s::integer)"
+            )
 
 
     # Inherited Methods
 
     @classmethod
-    def get_one(cls, model : model_class, cursor : Optional[PgCursor] = None) -> Optional[model_class]:
-        return super().get_one(model, cursor)
+    def get_one(cls, model : model_class, cursor : Optional[PgCursor] = None, fields : Optional[Iterable[str]] = None) -> Optional[model_class]:
+        return super().get_one(model, cursor, fields)
                 
     @classmethod
     def delete(cls, id : UUID, cursor: Optional[PgCursor] = None) -> None:
         return super().delete(id, cursor)
 
+    @classmethod
+    def delete_many(cls, ids : list[UUID], cursor: Optional[PgCursor] = None) -> int:
+        return super().delete_many(ids, cursor)
+
     @classmethod
     def clear(cls, cursor: Optional[PgCursor] = None) -> None:
         return super().clear(cursor)
@@ -145,6 +229,12 @@ class GuestRepository(CommonQueriesRepository):
         """Disabled method. Not allowed for this repository."""
         pass
 
+    @classmethod
+    @forbidden_method
+    def add_many(cls, models, cursor : Optional[PgCursor] = None):
+        """Disabled method. Not allowed for this repository."""
+        pass
+
             
 if __name__ == '__main__':
     
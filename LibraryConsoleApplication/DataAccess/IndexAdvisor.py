@@ -0,0 +1,259 @@
+"""
+Reports repository queries that PostgreSQL can only answer with a sequential scan.
+
+For every `CommonQueriesRepository` and every column it may filter on, the statements that
+`get_one` and `get_many` (and, with `--views`, `view_many`) generate for that column are run
+through `EXPLAIN` with `enable_seqscan` turned off. The planner then uses an index whenever
+one can serve the filter, so a sequential scan left in the plan means no usable index
+exists. This also works on a small seeded database, where the planner would otherwise
+prefer scanning the few rows anyway.
+
+String filters of `get_many` and `view_many` use `LIKE '%...%'`, which a B-tree index
+cannot serve (see Migrations/001_trigram_indexes.sql).
+
+Each query is explained in its own savepoint. A query the database rejects (e.g. a filter on
+a column whose name is a reserved word) is reported as a failed probe and the check goes on.
+
+Run from the project directory:
+    python -m DataAccess.IndexAdvisor
+    python -m DataAccess.IndexAdvisor --views
+"""
+import argparse
+import importlib
+import pkgutil
+import typing
+from dataclasses import dataclass
+from datetime import datetime
+from enum import Enum
+from typing import Any, Optional
+from uuid import UUID
+import psycopg2
+import DataAccess
+from DataAccess.CommonQueriesRepository import CommonQueriesRepository
+from DataAccess.SqlBuilder import cached_where_statement, model_field_names
+from psycopg2.extensions import TRANSACTION_STATUS_INERROR, cursor as PgCursor
+
+
+@dataclass
+class SequentialScan:
+    """
+    A generated query whose plan scans a relation sequentially.
+
+    Attributes:
+        repository (str): Repository class name.
+        method (str): Repository method that generates the query.
+        column (str): Column the query filters on.
+        relation (str): Relation read with a sequential scan.
+    """
+    repository: str
+    method: str
+    column: str
+    relation: str
+
+
+@dataclass
+class FailedProbe:
+    """
+    A generated query the database refused to explain.
+
+    Attributes:
+        repository (str): Repository class name.
+        method (str): Repository method that generates the query.
+        column (str): Column the query filters on.
+        error (str): The database error.
+    """
+    repository: str
+    method: str
+    column: str
+    error: str
+
+
+_SAMPLE_VALUES = {
+    int: 1,
+    str: 'a',
+    bool: False,
+    datetime: datetime(2000, 1, 1),
+    UUID: UUID(int = 1),
+}
+
+
+def sample_value(annotation: Any) -> Any:
+    """
+    Returns a value of a model field's type to bind in an explained query.
+
+    Args:
+        annotation (Any): Field annotation, e.g. `Union[int, None, UnsetType]`.
+
+    Returns:
+        Any: A value of the field's type, or None if the type is not supported.
+    """
+    for option in typing.get_args(annotation) or (annotation,):
+        if option in _SAMPLE_VALUES:
+            return _SAMPLE_VALUES[option]
+        if isinstance(option, type) and issubclass(option, Enum):
+            return next(iter(option))
+    return None
+
+
+def sequential_scans(plan: dict) -> list[str]:
+    """
+    Lists the relations a plan reads with a sequential scan.
+
+    Args:
+        plan (dict): A plan node of `EXPLAIN (FORMAT JSON)` output.
+
+    Returns:
+        list[str]: Relation names, in plan order.
+    """
+    relations = []
+    if plan.get("Node Type") == "Seq Scan":
+        relations.append(plan["Relation Name"])
+    for child in plan.get("Plans", []):
+        relations.extend(sequential_scans(child))
+    return relations
+
+
+def check_repository(
+    repository: type[CommonQueriesRepository],
+    cursor: PgCursor,
+    include_views: bool = False,
+    failures: Optional[list[FailedProbe]] = None
+) -> list[SequentialScan]:
+    """
+    Explains the filter queries of one repository.
+
+    Args:
+        repository (type[CommonQueriesRepository]): Repository to check.
+        cursor (PgCursor): Cursor whose transaction has `enable_seqscan` turned off.
+        include_views (bool): Also check `view_many` on the repository's view.
+        failures (Optional[list[FailedProbe]]): Receives the queries that could not be explained.
+
+    Returns:
+        list[SequentialScan]: One entry per query and sequentially scanned relation.
+    """
+    probes = [
+        ("get_one", repository.table_name, repository.model_class, False),
+        ("get_many", repository.table_name, repository.model_class, True),
+    ]
+    if include_views and repository.view_name is not None:
+        probes.append(("view_many", repository.view_name, repository.view_model_class, True))
+
+    findings = []
+
+    for method, source, model_class, use_like in probes:
+        hints = typing.get_type_hints(model_class)
+        limit = " LIMIT %s" if use_like else ""
+
+        for name in model_field_names(model_class):
+            value = sample_value(hints[name])
+            if name in repository.where_clause_exclude or value is None:
+                continue
+            # Without LIKE the WHERE clause equals get_one's, which is already checked.
+            if method != "get_one" and not isinstance(value, str) and source == repository.table_name:
+                continue
+
+            query, values = cached_where_statement(
+                (repository, "explain", method),
+                model_class(**{name: value}),
+                lambda where_clause: f"SELECT * FROM {source} WHERE {where_clause}{limit}",
+                use_like_for_strings=use_like,
+                exclude=repository.where_clause_exclude
+            )
+            if use_like:
+                values = (*values, repository.return_limit)
+
+            cursor.execute("SAVEPOINT index_advisor_probe")
+            try:
+                cursor.execute("EXPLAIN (FORMAT JSON) " + query, values)
+            except psycopg2.Error as error:
+                cursor.execute("ROLLBACK TO SAVEPOINT index_advisor_probe")
+                if failures is not None:
+                    failures.append(FailedProbe(repository.__name__, method, name, str(error).strip()))
+                continue
+            plan = cursor.fetchone()[0][0]["Plan"]
+            cursor.execute("RELEASE SAVEPOINT index_advisor_probe")
+
+            for relation in dict.fromkeys(sequential_scans(plan)):
+                findings.append(SequentialScan(repository.__name__, method, name, relation))
+
+    return findings
+
+
+def repositories() -> tuple[list[type[CommonQueriesRepository]], dict[str, Exception]]:
+    """
+    Imports the repository modules of `DataAccess` and collects their repositories.
+
+    Returns:
+        tuple[list[type[CommonQueriesRepository]], dict[str, Exception]]: Repositories sorted by
+            name, and the modules that failed to import with their errors.
+    """
+    failures = {}
+    for module in pkgutil.iter_modules(DataAccess.__path__):
+        if module.name.endswith("Repository"):
+            try:
+                importlib.import_module(f"DataAccess.{module.name}")
+            except ImportError as error:
+                failures[module.name] = error
+
+    found = {}
+    pending = list(CommonQueriesRepository.__subclasses__())
+    while pending:
+        repository = pending.pop()
+        pending.extend(repository.__subclasses__())
+        if hasattr(repository, "table_name") and hasattr(repository, "model_class"):
+            found[repository.__name__] = repository
+
+    return [found[name] for name in sorted(found)], failures
+
+
+def advise(
+    include_views: bool = False,
+    cursor: Optional[PgCursor] = None,
+    failures: Optional[list[FailedProbe]] = None
+) -> list[SequentialScan]:
+    """
+    Explains the filter queries of all repositories.
+
+    Args:
+        include_views (bool): Also check `view_many` queries.
+        cursor (Optional[PgCursor]): Optional cursor; a pooled connection is used otherwise.
+        failures (Optional[list[FailedProbe]]): Receives the queries that could not be explained.
+
+    Returns:
+        list[SequentialScan]: Queries left with a sequential scan.
+    """
+    findings = []
+
+    with CommonQueriesRepository._use_cursor(cursor) as scoped_cursor:
+        scoped_cursor.execute("SELECT current_setting('enable_seqscan'), set_config('enable_seqscan', 'off', true)")
+        previous = scoped_cursor.fetchone()[0]
+        try:
+            for repository in repositories()[0]:
+                findings.extend(check_repository(repository, scoped_cursor, include_views, failures))
+        finally:
+            # An aborted transaction is rolled back by the caller, which restores the setting too.
+            if scoped_cursor.connection.get_transaction_status() != TRANSACTION_STATUS_INERROR:
+                scoped_cursor.execute("SELECT set_config('enable_seqscan', %s, true)", (previous,))
+
+    return findings
+
+
+def main():
+    parser = argparse.ArgumentParser(description = "Report repository queries that need a sequential scan.")
+    parser.add_argument("--views", action = "store_true", help = "also check view_many on the repository views")
+    arguments = parser.parse_args()
+
+    for module, error in repositories()[1].items():
+        print(f"# {module} skipped: {error}")
+
+    failures = []
+    findings = advise(arguments.views, failures = failures)
+    for finding in findings:
+        print(f"{finding.repository}.{finding.method}({finding.column}): Seq Scan on {finding.relation}")
+    for failure in failures:
+        print(f"# {failure.repository}.{failure.method}({failure.column}) failed: {failure.error}")
+    print(f"# {len(findings)} sequential scans, {len(failures)} failed probes")
+
+
+if __name__ == '__main__':
+    main()
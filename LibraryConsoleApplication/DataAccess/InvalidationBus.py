@@ -0,0 +1,211 @@
+import logging
+import os
+import select
+import socket
+import threading
+from typing import Callable, Iterable, Optional
+import psycopg2
+from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT, cursor as PgCursor
+from DataAccess.Connection import DatabaseConnector
+
+
+_logger = logging.getLogger(__name__)
+
+
+class InvalidationBus:
+    """
+    Carries cache invalidations between application instances over PostgreSQL `LISTEN/NOTIFY`.
+
+    Writers call `publish` on the cursor of their write. The `NOTIFY` joins the write's
+    transaction, so it is delivered when (and only if) the write commits. Each table has its
+    own channel (see `channel`). A background thread listens on a dedicated connection to the
+    channels that local caches `subscribe` to, and runs their callbacks when a notification
+    arrives, whichever process sent it.
+
+    Notifications sent while the listener is disconnected are lost, so every callback is also
+    run after each (re)connect and when its channel is first listened to. `subscribe` waits for
+    that first run, so a cache filled after subscribing is not cleared by it. A callback that
+    raises is logged and does not stop the listener.
+
+    Attributes:
+        enabled (bool): Whether writes publish notifications and the listener runs.
+        poll_seconds (float): Longest wait for a notification before the listener checks whether it was stopped.
+        reconnect_seconds (float): Pause before reconnecting after a lost connection.
+    """
+
+    CHANNEL_PREFIX = 'lca_cache_'
+
+    def __init__(self, enabled: bool = False, poll_seconds: float = 1.0, reconnect_seconds: float = 5.0):
+        self.enabled = enabled
+        self.poll_seconds = poll_seconds
+        self.reconnect_seconds = reconnect_seconds
+        self._callbacks : dict[str, list[Callable[[], None]]] = {}
+        self._listening : dict[str, threading.Event] = {}
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread : Optional[threading.Thread] = None
+        self._wakeup : Optional[tuple[socket.socket, socket.socket]] = None
+
+    @classmethod
+    def channel(cls, table: str) -> str:
+        """
+        Returns the notification channel of a table.
+
+        Args:
+            table (str): Quoted table name, e.g. `'"Category"'`.
+
+        Returns:
+            str: Channel name, e.g. `lca_cache_category`.
+        """
+        return cls.CHANNEL_PREFIX + table.strip('"').lower()
+
+    def publish(self, cursor: PgCursor, tables: Iterable[str]) -> None:
+        """
+        Queues a notification for each of `tables` in the transaction of `cursor`.
+
+        Args:
+            cursor (PgCursor): Cursor of the write.
+            tables (Iterable[str]): Quoted names of the tables whose caches the write makes stale.
+        """
+        channels = sorted({self.channel(table) for table in tables})
+
+        if not self.enabled or not channels:
+            return
+
+        cursor.execute("SELECT pg_notify(channel, '') FROM unnest(%s::text[]) AS channel", (channels,))
+
+    def subscribe(self, table: str, callback: Callable[[], None]) -> None:
+        """
+        Runs `callback` whenever a committed write, in this or another process, publishes `table`.
+
+        Starts the listener thread on first use, and waits (up to `reconnect_seconds`) until the
+        channel is listened to and `callback` has run once.
+
+        Args:
+            table (str): Quoted table name.
+            callback (Callable[[], None]): Usually the `invalidate` method of a cache.
+        """
+        if not self.enabled:
+            return
+
+        channel = self.channel(table)
+
+        with self._lock:
+            self._callbacks.setdefault(channel, []).append(callback)
+            listening = self._listening.setdefault(channel, threading.Event())
+            # A channel that is already listened to must still hear the new callback once.
+            listening.clear()
+
+            if self._wakeup is None:
+                self._wakeup = socket.socketpair()
+                self._wakeup[1].setblocking(False)
+
+            if self._thread is None:
+                self._stopped.clear()
+                self._thread = threading.Thread(target=self._listen_loop, name="cache-invalidation-listener", daemon=True)
+                self._thread.start()
+            listener = self._thread
+            self._wake_listener()
+
+        # Callbacks that subscribe run on the listener thread, which cannot wait for itself.
+        if threading.current_thread() is not listener:
+            listening.wait(self.reconnect_seconds)
+
+    def stop(self) -> None:
+        """Stops the listener thread; a later `subscribe` starts it again."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+            self._stopped.set()
+            if self._wakeup is not None:
+                self._wake_listener()
+
+        if thread is not None:
+            thread.join()
+
+    def _wake_listener(self) -> None:
+        """Interrupts the listener's wait so it picks up new subscriptions; called with `_lock` held."""
+        try:
+            self._wakeup[1].send(b"\0")
+        except BlockingIOError:
+            pass  # A wake-up is already pending.
+
+    def _dispatch(self, channels: Iterable[str]) -> None:
+        with self._lock:
+            callbacks = [callback for channel in channels for callback in self._callbacks.get(channel, ())]
+
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception:
+                _logger.exception("cache invalidation callback %r failed", callback)
+
+    def _listen_loop(self) -> None:
+        while not self._stopped.is_set():
+            connection = None
+            try:
+                connection = DatabaseConnector().connect()
+                connection.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+                listening = set()
+
+                while not self._stopped.is_set():
+                    with self._lock:
+                        new_channels = set(self._callbacks) - listening
+                        waiting = {channel for channel, event in self._listening.items() if not event.is_set()}
+
+                    if new_channels:
+                        with connection.cursor() as cursor:
+                            for channel in new_channels:
+                                cursor.execute(f'LISTEN "{channel}"')
+                        listening |= new_channels
+
+                    if new_channels or waiting:
+                        # Writes committed before LISTEN took effect were not heard.
+                        self._dispatch(new_channels | waiting)
+                        with self._lock:
+                            for channel in new_channels | waiting:
+                                self._listening[channel].set()
+
+                    readable, _, _ = select.select([connection, self._wakeup[0]], [], [], self.poll_seconds)
+                    if self._wakeup[0] in readable:
+                        self._wakeup[0].recv(4096)
+                    if connection not in readable:
+                        continue
+
+                    connection.poll()
+                    channels = {notify.channel for notify in connection.notifies}
+                    connection.notifies.clear()
+                    self._dispatch(channels)
+
+            except (psycopg2.Error, OSError):
+                self._stopped.wait(self.reconnect_seconds)
+            finally:
+                if connection is not None:
+                    connection.close()
+
+
+_bus : Optional[InvalidationBus] = None
+_bus_lock = threading.Lock()
+
+
+def invalidation_bus() -> InvalidationBus:
+    """
+    Returns the application-wide invalidation bus, configured from the `.env` settings.
+
+    Settings:
+        CACHE_INVALIDATION_BUS: `false` to stop publishing and listening (default true).
+        CACHE_INVALIDATION_POLL_SECONDS: Listener wake-up interval (default 1).
+
+    Returns:
+        InvalidationBus: The shared bus.
+    """
+    global _bus
+
+    if _bus is None:
+        with _bus_lock:
+            if _bus is None:
+                DatabaseConnector()  # loads .env
+                _bus = InvalidationBus(
+                    enabled=os.getenv("CACHE_INVALIDATION_BUS", "true").lower() in ("1", "true", "yes"),
+                    poll_seconds=float(os.getenv("CACHE_INVALIDATION_POLL_SECONDS", "1"))
+                )
+    return _bus
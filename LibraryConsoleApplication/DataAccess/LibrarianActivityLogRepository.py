@@ -1,6 +1,6 @@
 ﻿
 from datetime import datetime
-from typing import Optional
+from typing import Iterable, Iterator, Optional
 from zoneinfo import ZoneInfo
 from DataAccess.CommonQueriesRepository import CommonQueriesRepository
 from DataAccess.Decorators import forbidden_method
@@ -42,20 +42,28 @@ class LibrarianActivityLogRepository(CommonQueriesRepository):
     # Inherited Methods
 
     @classmethod
-    def get_one(cls, model : model_class, cursor : Optional[PgCursor] = None) -> Optional[model_class]:
-        return super().get_one(model, cursor)
+    def get_one(cls, model : model_class, cursor : Optional[PgCursor] = None, fields : Optional[Iterable[str]] = None) -> Optional[model_class]:
+        return super().get_one(model, cursor, fields)
        
     @classmethod
-    def get_many(cls, model : model_class, cursor : Optional[PgCursor] = None) -> list[model_class]:
-        return super().get_many(model, cursor)
+    def get_many(cls, model : model_class, cursor : Optional[PgCursor] = None, fields : Optional[Iterable[str]] = None) -> list[model_class]:
+        return super().get_many(model, cursor, fields)
+
+    @classmethod
+    def iter_many(cls, model : model_class, itersize : Optional[int] = None, cursor : Optional[PgCursor] = None, fields : Optional[Iterable[str]] = None) -> Iterator[model_class]:
+        return super().iter_many(model, itersize, cursor, fields)
     
     @classmethod
-    def view_one(cls, model : view_model_class, cursor : Optional[PgCursor] = None) -> Optional[view_model_class]:
-        return super().view_one(model, cursor)
+    def view_one(cls, model : view_model_class, cursor : Optional[PgCursor] = None, fields : Optional[Iterable[str]] = None) -> Optional[view_model_class]:
+        return super().view_one(model, cursor, fields)
        
     @classmethod
-    def view_many(cls, model : view_model_class, cursor : Optional[PgCursor] = None) -> list[view_model_class]:
-        return super().view_many(model, cursor)
+    def view_many(cls, model : view_model_class, cursor : Optional[PgCursor] = None, fields : Optional[Iterable[str]] = None) -> list[view_model_class]:
+        return super().view_many(model, cursor, fields)
+
+    @classmethod
+    def iter_view(cls, model : view_model_class, itersize : Optional[int] = None, cursor : Optional[PgCursor] = None, fields : Optional[Iterable[str]] = None) -> Iterator[view_model_class]:
+        return super().iter_view(model, itersize, cursor, fields)
 
     @classmethod
     def clear(cls, cursor: Optional[PgCursor] = None) -> None:
@@ -81,6 +89,12 @@ class LibrarianActivityLogRepository(CommonQueriesRepository):
     def remove(cls, model, use_like_for_strings : bool = True, cursor: Optional[PgCursor] = None):
         """Disabled method. Not allowed for this repository."""
         pass
+
+    @classmethod
+    @forbidden_method
+    def add_many(cls, models, cursor : Optional[PgCursor] = None):
+        """Disabled method. Not allowed for this repository."""
+        pass
   
 
 
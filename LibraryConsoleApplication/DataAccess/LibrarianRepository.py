@@ -1,4 +1,4 @@
-﻿from typing import Optional
+﻿from typing import Iterable, Optional
 from DataAccess.CommonQueriesRepository import CommonQueriesRepository
 from DataAccess.Decorators import forbidden_method
 from Models.Models import LibrarianModel, LibrarianViewModel, PlainUserModel
@@ -58,44 +58,40 @@ class LibrarianRepository(CommonQueriesRepository):
             ValueError:
                 If required fields are missing or invalid.
         """
-        commit_and_close = False
-        if cursor is None:
-            cursor = cls._get_cursor()
-            commit_and_close = True
-        
-        user_model = UserRepository.hash_password_and_add_user(plain_user_model, cursor) 
-        model.id = user_model.id
+        with cls._use_cursor(cursor) as cursor:
+            user_model = UserRepository.hash_password_and_add_user(plain_user_model, cursor) 
+            model.id = user_model.id
+
+            result = super().add(model, cursor)
 
-        result = super().add(model, cursor)
-        
-        if commit_and_close:
-            cursor.connection.commit()
-            cursor.connection.close()
-            
         return result    
 
 
     # Inherited Methods
 
     @classmethod
-    def get_one(cls, model : model_class, cursor : Optional[PgCursor] = None) -> Optional[model_class]:
-        return super().get_one(model, cursor)
+    def get_one(cls, model : model_class, cursor : Optional[PgCursor] = None, fields : Optional[Iterable[str]] = None) -> Optional[model_class]:
+        return super().get_one(model, cursor, fields)
        
     @classmethod
-    def get_many(cls, model : model_class, cursor : Optional[PgCursor] = None) -> list[model_class]:
-        return super().get_many(model, cursor)
+    def get_many(cls, model : model_class, cursor : Optional[PgCursor] = None, fields : Optional[Iterable[str]] = None) -> list[model_class]:
+        return super().get_many(model, cursor, fields)
     
     @classmethod
-    def view_one(cls, model : view_model_class, cursor : Optional[PgCursor] = None) -> Optional[view_model_class]:
-        return super().view_one(model, cursor)
+    def view_one(cls, model : view_model_class, cursor : Optional[PgCursor] = None, fields : Optional[Iterable[str]] = None) -> Optional[view_model_class]:
+        return super().view_one(model, cursor, fields)
        
     @classmethod
-    def view_many(cls, model : view_model_class, cursor : Optional[PgCursor] = None) -> list[view_model_class]:
-        return super().view_many(model, cursor)
+    def view_many(cls, model : view_model_class, cursor : Optional[PgCursor] = None, fields : Optional[Iterable[str]] = None) -> list[view_model_class]:
+        return super().view_many(model, cursor, fields)
     
     @classmethod
     def update(cls, model : model_class, cursor: Optional[PgCursor] = None) -> None:
         return super().update(model, cursor)
+
+    @classmethod
+    def update_many(cls, models : list[model_class], cursor: Optional[PgCursor] = None) -> None:
+        return super().update_many(models, cursor)
     
 
     # Forbidden Methods
@@ -118,6 +114,12 @@ class LibrarianRepository(CommonQueriesRepository):
         """Disabled method. Not allowed for this repository."""
         pass
 
+    @classmethod
+    @forbidden_method
+    def add_many(cls, models, cursor : Optional[PgCursor] = None):
+        """Disabled method. Not allowed for this repository."""
+        pass
+
 
  
 if __name__ == '__main__':
@@ -0,0 +1,221 @@
+import os
+import threading
+import time
+from typing import Iterable, Optional
+from DataAccess.Connection import DatabaseConnector
+from DataAccess.InvalidationBus import InvalidationBus, invalidation_bus
+
+
+class MaterializedViewRefresher:
+    """
+    Keeps the materialized copies of the catalogue views (see
+    `Migrations/002_materialized_catalogue_views.sql`) close to their source tables.
+
+    Repositories report writes with `mark_stale`. A view is refreshed with
+    `REFRESH MATERIALIZED VIEW CONCURRENTLY` once no write has touched it for
+    `debounce_seconds`, or at the latest `max_staleness_seconds` after the first
+    unrefreshed write. Readers ask `is_fresh` and fall back to the live view
+    while a materialized view is stale for longer than `max_staleness_seconds`.
+
+    Writers also publish the views they touch on the invalidation bus, and every
+    view this process reads or writes is subscribed to there, so writes committed
+    by other application instances mark it stale as well. Without the bus, such
+    views are refreshed every `max_staleness_seconds` instead.
+
+    Attributes:
+        enabled (bool): Whether repositories read from materialized views and the background refresh runs.
+        debounce_seconds (float): Quiet time after the last write before a view is refreshed.
+        max_staleness_seconds (float): Longest time a stale materialized view may still be read.
+        bus (Optional[InvalidationBus]): Bus that carries writes of other instances; None or disabled to poll.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        debounce_seconds: float = 2.0,
+        max_staleness_seconds: float = 30.0,
+        bus: Optional[InvalidationBus] = None
+    ):
+        self.enabled = enabled
+        self.debounce_seconds = debounce_seconds
+        self.max_staleness_seconds = max_staleness_seconds
+        self.bus = bus
+        self._stale_since : dict[str, float] = {}
+        self._last_write : dict[str, float] = {}
+        self._refreshed_at : dict[str, float] = {}
+        self._watched : set[str] = set()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread : Optional[threading.Thread] = None
+
+    def mark_stale(self, views: Iterable[str]) -> None:
+        """
+        Records a committed write to the tables behind `views`.
+
+        Args:
+            views (Iterable[str]): Quoted names of the materialized views to refresh.
+        """
+        views = set(views)
+        now = time.monotonic()
+        with self._lock:
+            for view in views:
+                self._stale_since.setdefault(view, now)
+                self._last_write[view] = now
+
+            self._start_refresh_loop()
+        self._wake.set()
+        self._watch(views)
+
+    def is_fresh(self, view: str) -> bool:
+        """
+        Checks whether `view` is within the staleness bound.
+
+        Args:
+            view (str): Quoted name of the materialized view.
+
+        Returns:
+            bool: True if the view has no unrefreshed writes, or has had them for at most `max_staleness_seconds`.
+        """
+        self._watch((view,))
+        with self._lock:
+            stale_since = self._stale_since.get(view)
+        return stale_since is None or time.monotonic() - stale_since <= self.max_staleness_seconds
+
+    def refresh(self, view: str) -> None:
+        """
+        Refreshes `view` now, without blocking readers of it.
+
+        Writes reported while the refresh runs keep the view marked stale.
+
+        Args:
+            view (str): Quoted name of the materialized view.
+        """
+        started = time.monotonic()
+        connection = DatabaseConnector().get_connection()
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {view}")
+            connection.commit()
+        except BaseException:
+            connection.rollback()
+            raise
+        finally:
+            connection.close()
+
+        with self._lock:
+            self._refreshed_at[view] = started
+            if self._last_write.get(view, 0.0) < started:
+                self._stale_since.pop(view, None)
+                self._last_write.pop(view, None)
+
+    def refresh_due(self) -> Optional[float]:
+        """
+        Refreshes every view whose debounce (or staleness bound) has passed, and, without
+        the invalidation bus, every watched view last refreshed `max_staleness_seconds` ago.
+
+        Returns:
+            Optional[float]: Seconds until the next view falls due, or None if nothing is stale.
+        """
+        now = time.monotonic()
+        due = []
+        wait = None
+
+        with self._lock:
+            for view, stale_since in self._stale_since.items():
+                due_at = min(self._last_write[view] + self.debounce_seconds, stale_since + self.max_staleness_seconds)
+                if due_at <= now:
+                    due.append(view)
+                else:
+                    wait = due_at - now if wait is None else min(wait, due_at - now)
+
+            if not self._hears_remote_writes():
+                for view in self._watched - set(self._stale_since):
+                    due_at = self._refreshed_at[view] + self.max_staleness_seconds
+                    if due_at <= now:
+                        due.append(view)
+                    else:
+                        wait = due_at - now if wait is None else min(wait, due_at - now)
+
+        for view in due:
+            self.refresh(view)
+
+        if not self._hears_remote_writes() and self._watched.intersection(due):
+            # Refreshed views are polled again one staleness bound from now.
+            wait = self.max_staleness_seconds if wait is None else min(wait, self.max_staleness_seconds)
+
+        return wait
+
+    def _hears_remote_writes(self) -> bool:
+        return self.bus is not None and self.bus.enabled
+
+    def _watch(self, views: Iterable[str]) -> None:
+        """Follows writes of other instances to `views` once the refresher is enabled."""
+        if not self.enabled:
+            return
+
+        with self._lock:
+            new_views = set(views) - self._watched
+            self._watched |= new_views
+            for view in new_views:
+                self._refreshed_at.setdefault(view, time.monotonic())
+            if new_views:
+                self._start_refresh_loop()
+
+        if not new_views:
+            return
+
+        if self._hears_remote_writes():
+            for view in new_views:
+                self.bus.subscribe(view, lambda view=view: self.mark_stale((view,)))
+        else:
+            # Let the refresh loop schedule the new views.
+            self._wake.set()
+
+    def _start_refresh_loop(self) -> None:
+        """Starts the background refresh; called with `_lock` held."""
+        if self.enabled and self._thread is None:
+            self._thread = threading.Thread(target=self._refresh_loop, name="materialized-view-refresh", daemon=True)
+            self._thread.start()
+
+    def _refresh_loop(self) -> None:
+        wait = None
+        while True:
+            self._wake.wait(wait)
+            self._wake.clear()
+            try:
+                wait = self.refresh_due()
+            except Exception:
+                # The database may be briefly unavailable; stale views are retried after the debounce.
+                wait = self.debounce_seconds
+
+
+_refresher : Optional[MaterializedViewRefresher] = None
+_refresher_lock = threading.Lock()
+
+
+def materialized_views() -> MaterializedViewRefresher:
+    """
+    Returns the application-wide refresher, configured from the `.env` settings.
+
+    Settings:
+        MATERIALIZED_VIEWS: `true` to read catalogue views from their materialized copies (default false).
+        MATERIALIZED_VIEWS_DEBOUNCE_SECONDS: Quiet time before a refresh (default 2).
+        MATERIALIZED_VIEWS_MAX_STALENESS_SECONDS: Staleness bound for reads, and the refresh
+            interval while CACHE_INVALIDATION_BUS is off (default 30).
+
+    Returns:
+        MaterializedViewRefresher: The shared refresher.
+    """
+    global _refresher
+
+    if _refresher is None:
+        with _refresher_lock:
+            if _refresher is None:
+                DatabaseConnector()  # loads .env
+                _refresher = MaterializedViewRefresher(
+                    enabled=os.getenv("MATERIALIZED_VIEWS", "false").lower() in ("1", "true", "yes"),
+                    debounce_seconds=float(os.getenv("MATERIALIZED_VIEWS_DEBOUNCE_SECONDS", "2")),
+                    max_staleness_seconds=float(os.getenv("MATERIALIZED_VIEWS_MAX_STALENESS_SECONDS", "30")),
+                    bus=invalidation_bus()
+                )
+    return _refresher
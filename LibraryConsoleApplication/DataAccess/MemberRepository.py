@@ -1,4 +1,5 @@
-﻿from typing import Optional
+﻿from dataclasses import replace
+from typing import Iterable, Optional
 from datetime import datetime
 from zoneinfo import ZoneInfo
 from DataAccess.CommonQueriesRepository import CommonQueriesRepository
@@ -57,24 +58,16 @@ class MemberRepository(CommonQueriesRepository):
             IntegrityError:
                 If a user with the same username already exists.
         """
-        commit_and_close = False
-        if cursor is None:
-            cursor = cls._get_cursor()
-            commit_and_close = True
-
-        user_model = UserRepository.hash_password_and_add_user(plain_user_model, cursor)
+        with cls._use_cursor(cursor) as cursor:
+            user_model = UserRepository.hash_password_and_add_user(plain_user_model, cursor)
          
-        now = datetime.now(ZoneInfo("Asia/Tehran"))
+            now = datetime.now(ZoneInfo("Asia/Tehran"))
         
-        model.id = user_model.id
-        model.join_date = now
+            model.id = user_model.id
+            model.join_date = now
+
+            result = super().add(model, cursor)
 
-        result = super().add(model, cursor)
-        
-        if commit_and_close:
-            cursor.connection.commit()
-            cursor.connection.close()
-            
         return result
 
     @classmethod
@@ -94,6 +87,23 @@ class MemberRepository(CommonQueriesRepository):
         """
         model.active = UnsetType()
         return super().update(model, cursor)
+
+    @classmethod
+    def update_many(cls, models : list[model_class], cursor: Optional[PgCursor] = None) -> None:
+        """
+        Updates many member records in one set-based statement, excluding the `active` field.
+
+        Like `update()`, the `active` status is never changed here; use
+        `activate_many()` or `deactivate_many()` instead. The given models are not modified.
+
+        Args:
+            models (list[model_class]):
+                The member models containing updated data.
+            cursor (Optional[PgCursor], optional):
+                Database cursor for executing the update. If omitted, a new one is created automatically.
+        """
+        models = [replace(model, active=UnsetType()) for model in models]
+        return super().update_many(models, cursor)
     
     @classmethod
     def _active_or_deactive_member(cls, model : model_class, active : bool, cursor : Optional[PgCursor] = None) -> None:
@@ -121,32 +131,24 @@ class MemberRepository(CommonQueriesRepository):
             MemberAlreadyDeactivatedError:
                 If the member is already inactive and deactivation is requested.
         """
-        commit_and_close = False
-        if cursor is None:
-            cursor = cls._get_cursor()
-            commit_and_close = True
-
-        db_model = cls.get_one(model, cursor)
+        with cls._use_cursor(cursor) as cursor:
+            db_model = cls.get_one(model, cursor)
         
-        if db_model is None:
-            raise NotSuchModelInDataBaseError('cannot find member', model)
+            if db_model is None:
+                raise NotSuchModelInDataBaseError('cannot find member', model)
         
-        if db_model.active == active:
-            if active:
-                raise MemberAlreadyActivatedError(f'member {db_model.name} is already active.')
-            else:
-                raise MemberAlreadyDeactivatedError(f'member {db_model.name} is already inactive.')
+            if db_model.active == active:
+                if active:
+                    raise MemberAlreadyActivatedError(f'member {db_model.name} is already active.')
+                else:
+                    raise MemberAlreadyDeactivatedError(f'member {db_model.name} is already inactive.')
         
-        updated_model = MemberModel(
-            id=db_model.id,
-            active=active
-        )
+            updated_model = MemberModel(
+                id=db_model.id,
+                active=active
+            )
         
-        super().update(updated_model, cursor)
-
-        if commit_and_close:
-            cursor.connection.commit()
-            cursor.connection.close()
+            super().update(updated_model, cursor)
             
     @classmethod
     def deactivate_member(cls, model : model_class, cursor : Optional[PgCursor] = None) -> None:
@@ -189,26 +191,100 @@ class MemberRepository(CommonQueriesRepository):
                 If the member is already active.
         """
         return cls._active_or_deactive_member(model, active=True, cursor=cursor)
+
+    @classmethod
+    def _set_active_many(cls, ids : list[int], active : bool, cursor : Optional[PgCursor] = None) -> list[int]:
+        """
+        Internal helper that sets the `active` status of many members in one statement.
+
+        Members that are missing or already in the requested state are left alone.
+
+        Args:
+            ids (list[int]):
+                IDs of the members to change.
+            active (bool):
+                Desired activation state.
+            cursor (Optional[PgCursor], optional):
+                Existing database cursor. If not provided, a new one is created automatically.
+
+        Returns:
+            list[int]: IDs of the members whose status changed.
+        """
+        if not ids:
+            return []
+
+        query = f"""
+            UPDATE {cls.table_name}
+            SET {DBTableColumns.Member.ACTIVE} = %s
+            WHERE {DBTableColumns.Member.ID} = ANY(%s)
+            AND {DBTableColumns.Member.ACTIVE} IS DISTINCT FROM %s
+            RETURNING {DBTableColumns.Member.ID}
+        """
+
+        with cls._use_cursor(cursor) as cursor:
+            cls._execute(cursor, query, (active, list(ids), active))
+            changed = [row[0] for row in cursor.fetchall()]
+            cls._after_write(cursor = cursor)
+
+        return changed
+
+    @classmethod
+    def deactivate_many(cls, ids : list[int], cursor : Optional[PgCursor] = None) -> list[int]:
+        """
+        Deactivates many member accounts with a single `UPDATE`.
+
+        Unlike `deactivate_member()`, members that are missing or already inactive
+        are skipped instead of raising.
+
+        Args:
+            ids (list[int]):
+                IDs of the members to deactivate.
+            cursor (Optional[PgCursor], optional):
+                Existing database cursor. If not provided, a new one is created automatically.
+
+        Returns:
+            list[int]: IDs of the members that were deactivated.
+        """
+        return cls._set_active_many(ids, active=False, cursor=cursor)
+
+    @classmethod
+    def activate_many(cls, ids : list[int], cursor : Optional[PgCursor] = None) -> list[int]:
+        """
+        Activates many member accounts with a single `UPDATE`.
+
+        Unlike `activate_member()`, members that are missing or already active
+        are skipped instead of raising.
+
+        Args:
+            ids (list[int]):
+                IDs of the members to activate.
+            cursor (Optional[PgCursor], optional):
+                Existing database cursor. If not provided, a new one is created automatically.
+
+        Returns:
+            list[int]: IDs of the members that were activated.
+        """
+        return cls._set_active_many(ids, active=True, cursor=cursor)
     
 
 
     # Inherited Methods
 
     @classmethod
-    def get_one(cls, model : model_class, cursor : Optional[PgCursor] = None) -> Optional[model_class]:
-        return super().get_one(model, cursor)
+    def get_one(cls, model : model_class, cursor : Optional[PgCursor] = None, fields : Optional[Iterable[str]] = None) -> Optional[model_class]:
+        return super().get_one(model, cursor, fields)
        
     @classmethod
-    def get_many(cls, model : model_class, cursor : Optional[PgCursor] = None) -> list[model_class]:
-        return super().get_many(model, cursor)
+    def get_many(cls, model : model_class, cursor : Optional[PgCursor] = None, fields : Optional[Iterable[str]] = None) -> list[model_class]:
+        return super().get_many(model, cursor, fields)
     
     @classmethod
-    def view_one(cls, model : view_model_class, cursor : Optional[PgCursor] = None) -> Optional[view_model_class]:
-        return super().view_one(model, cursor)
+    def view_one(cls, model : view_model_class, cursor : Optional[PgCursor] = None, fields : Optional[Iterable[str]] = None) -> Optional[view_model_class]:
+        return super().view_one(model, cursor, fields)
        
     @classmethod
-    def view_many(cls, model : view_model_class, cursor : Optional[PgCursor] = None) -> list[view_model_class]:
-        return super().view_many(model, cursor)
+    def view_many(cls, model : view_model_class, cursor : Optional[PgCursor] = None, fields : Optional[Iterable[str]] = None) -> list[view_model_class]:
+        return super().view_many(model, cursor, fields)
     
 
     # Forbidden Methods
@@ -231,6 +307,12 @@ class MemberRepository(CommonQueriesRepository):
         """Disabled method. Not allowed for this repository."""
         pass
 
+    @classmethod
+    @forbidden_method
+    def add_many(cls, models, cursor : Optional[PgCursor] = None):
+        """Disabled method. Not allowed for this repository."""
+        pass
+
       
 
 
@@ -1,14 +1,14 @@
 
 from datetime import datetime
-from typing import Optional
+from typing import Iterable, Optional
 from zoneinfo import ZoneInfo
 from DataAccess.Decorators import forbidden_method
-from Exceptions.Exceptions import NotSuchModelInDataBaseError
+from DataAccess.SqlBuilder import cached_where_statement
+from Exceptions.Exceptions import EmptyModelError, MultipleRowsReturnedError, NotSuchModelInDataBaseError
 from DataAccess.UserRepository import UserRepository
-from DataAccess.CommonQueriesRepository import CommonQueriesRepository
-from DataAccess.BaseRepository import map_to_model
-from Models.Models import MessageModel, MessageViewModel, UserModel
-from Models.Schema import DBTableColumns, DBTables, DBViews
+from DataAccess.CommonQueriesRepository import CommonQueriesRepository, _decode_page_token, _encode_page_token
+from Models.Models import MessageModel, MessageViewModel, PageResult, UserModel
+from Models.Schema import DBTableColumns, DBTables, DBViewColumns, DBViews
 from psycopg2.extensions import cursor as PgCursor
 
 
@@ -40,57 +40,137 @@ class MessageRepository(CommonQueriesRepository):
         return super().add(model, cursor)
     
     @classmethod
-    def _update_seen(cls, user_model: UserModel, cursor: Optional[PgCursor] = None) -> None:
+    def inbox_page(
+        cls,
+        user_model : UserModel,
+        page_size : Optional[int] = None,
+        page_token : Optional[str] = None,
+        unread_only : bool = False,
+        cursor : Optional[PgCursor] = None
+    ) -> PageResult:
         """
-        Marks all messages for a specific user as seen.
+        Retrieves one page of a user's messages, newest first, and marks exactly those messages as seen.
 
-        This internal method updates the `seen` status of all messages
-        belonging to the given user to `True`.  
-        It is typically called after retrieving messages from a user's inbox.
+        The user lookup, the page read and the seen-marking run as a single statement. The returned
+        models carry the `seen` value from before this call, so callers can tell which messages are new.
 
         Args:
             user_model (UserModel):
-                The user whose messages should be marked as seen.
+                The user whose inbox is read (e.g. by `id` or `username`).
+            page_size (Optional[int], optional):
+                Messages per page. Defaults to `return_limit`.
+            page_token (Optional[str], optional):
+                `next_token` of the previous page, or None for the newest messages.
+            unread_only (bool, optional):
+                Only return messages that were not seen yet.
             cursor (Optional[PgCursor], optional):
                 Existing database cursor. If not provided, a new one will be created automatically.
 
+        Returns:
+            PageResult: The messages as `MessageViewModel` instances and the token of the next (older) page.
+
         Raises:
+            EmptyModelError:
+                If `user_model` has no fields to look the user up by.
             NotSuchModelInDataBaseError:
                 If the specified user record cannot be found in the database.
-            DatabaseError:
-                If the update operation fails.
+            MultipleRowsReturnedError:
+                If `user_model` matches more than one user; nothing is marked as seen then.
+            InvalidPageTokenError:
+                If `page_token` is malformed or belongs to another query.
+            ValueError:
+                If `page_size` is less than 1.
         """
-        commit_and_close = False
-        if cursor is None:
-            cursor = cls._get_cursor()
-            commit_and_close = True 
-        
-        model = UserRepository.get_one(user_model, cursor)
-        
-        if model is None:
+        page_size = cls._page_size(page_size)
+
+        before = [] if page_token is None else [_decode_page_token(page_token, cls.view_name)]
+        conditions = ["TRUE"]
+        if unread_only:
+            conditions.append(f"NOT message.{DBTableColumns.Message.SEEN}")
+        if before:
+            conditions.append(f"message.{DBTableColumns.Message.ID} < %s")
+
+        # Rows are built from the tables rather than `MessageView`, whose ORDER BY would make
+        # PostgreSQL sort every message before picking the page. One row more than the page
+        # is read to tell whether an older page exists; it is neither returned nor marked as seen.
+        # At most two users are looked up, and messages are only read when exactly one matched.
+        statement = cached_where_statement(
+            (cls, "inbox_page", unread_only, bool(before)),
+            user_model,
+            lambda where_clause: f"""
+                WITH recipient AS (
+                    SELECT
+                        {DBViewColumns.UserWithoutPasswordView.ID},
+                        {DBViewColumns.UserWithoutPasswordView.USERNAME},
+                        {DBViewColumns.UserWithoutPasswordView.USER_TYPE}
+                    FROM {DBViews.USER_WITHOUT_PASSWORD_VIEW}
+                    WHERE {where_clause}
+                    LIMIT 2
+                ), candidates AS (
+                    SELECT message.{DBTableColumns.Message.ID} FROM {cls.table_name} message
+                    WHERE message.{DBTableColumns.Message.USER_ID} = (
+                        SELECT {DBViewColumns.UserWithoutPasswordView.ID} FROM recipient
+                        WHERE (SELECT count(*) FROM recipient) = 1
+                    )
+                    AND {" AND ".join(conditions)}
+                    ORDER BY message.{DBTableColumns.Message.ID} DESC
+                    LIMIT %s
+                ), marked AS (
+                    UPDATE {cls.table_name}
+                    SET {DBTableColumns.Message.SEEN} = TRUE
+                    WHERE {DBTableColumns.Message.ID} IN (
+                        SELECT {DBTableColumns.Message.ID} FROM candidates
+                        ORDER BY {DBTableColumns.Message.ID} DESC
+                        LIMIT %s
+                    )
+                    AND NOT {DBTableColumns.Message.SEEN}
+                )
+                SELECT
+                    (SELECT count(*) FROM recipient),
+                    message.{DBTableColumns.Message.ID},
+                    recipient.{DBViewColumns.UserWithoutPasswordView.USERNAME},
+                    recipient.{DBViewColumns.UserWithoutPasswordView.USER_TYPE},
+                    message.{DBTableColumns.Message.MESSAGE},
+                    message.{DBTableColumns.Message.CREATED_TIME},
+                    message.{DBTableColumns.Message.SEEN}
+                FROM recipient
+                LEFT JOIN {cls.table_name} message
+                    ON message.{DBTableColumns.Message.ID} IN (SELECT {DBTableColumns.Message.ID} FROM candidates)
+                ORDER BY message.{DBTableColumns.Message.ID} DESC NULLS LAST
+                """,
+            exclude=UserRepository.where_clause_exclude
+        )
+
+        if statement is None:
+            raise EmptyModelError()
+
+        query, values = statement
+
+        with cls._use_cursor(cursor) as cursor:
+            cls._execute(cursor, query, (*values, *before, page_size + 1, page_size))
+            result = cursor.fetchall()
+            cls._after_write(cursor = cursor)
+
+        if not result:
             raise NotSuchModelInDataBaseError('user not found', user_model)
-        
-        query = f"""
-            UPDATE {DBTables.MESSAGE}
-            SET {DBTableColumns.Message.SEEN} = %s
-            WHERE {DBTableColumns.Message.USER_ID} = %s
-        """
+        if result[0][0] > 1:
+            raise MultipleRowsReturnedError()
+
+        rows = [cls.view_model_class(*row[1:]) for row in result[:page_size] if row[1] is not None]
+        next_token = None
 
-        cursor.execute(query, (True, model.id))
+        if len(result) > page_size:
+            next_token = _encode_page_token(cls.view_name, rows[-1].id)
 
-        if commit_and_close:
-            cursor.connection.commit()
-            cursor.connection.close()
+        return PageResult(rows, next_token)
 
     @classmethod
-    @map_to_model(MessageViewModel)
     def inbox(cls, user_model: UserModel, cursor: Optional[PgCursor] = None) -> list[MessageViewModel]:
         """
-        Retrieves all messages received by the specified user and marks them as seen.
+        Retrieves the newest messages received by the specified user and marks them as seen.
 
-        This method fetches all messages where the recipient matches the given user's username.
-        The returned messages are mapped to `MessageViewModel` instances.  
-        After fetching, all retrieved messages are automatically marked as seen.
+        Returns the first page of `inbox_page` (at most `return_limit` messages); older messages
+        stay unseen until they are read.
 
         Args:
             user_model (UserModel):
@@ -105,40 +185,15 @@ class MessageRepository(CommonQueriesRepository):
         Raises:
             NotSuchModelInDataBaseError:
                 If the specified user record cannot be found in the database.
-            DatabaseError:
-                If the query or update operation fails.
         """
-        commit_and_close = False
-        if cursor is None:
-            cursor = cls._get_cursor()
-            commit_and_close = True
-
-        model = UserRepository.get_one(user_model, cursor)
-        
-        if model is None:
-            raise NotSuchModelInDataBaseError('user not found', user_model)
-        
-        message_model = MessageViewModel(to=model.username)
-        
-        result = cls.view_many(message_model, cursor)
-        
-        cls._update_seen(user_model, cursor)
-
-        if commit_and_close:
-            cursor.connection.commit()
-            cursor.connection.close()
-
-        return result
+        return cls.inbox_page(user_model, cursor = cursor).rows
 
     @classmethod
-    @map_to_model(MessageViewModel)
     def unread_inbox(cls, user_model: UserModel, cursor: Optional[PgCursor] = None) -> list[MessageViewModel]:
         """
-        Retrieves only unread messages for the specified user and marks them as seen.
+        Retrieves the newest unread messages for the specified user and marks them as seen.
 
-        This method fetches all messages addressed to the given user
-        that have not yet been marked as seen (`seen = False`).  
-        After retrieving the messages, it automatically updates their `seen` status to `True`.
+        Returns the first page of `inbox_page` with `unread_only`.
 
         Args:
             user_model (UserModel):
@@ -153,49 +208,91 @@ class MessageRepository(CommonQueriesRepository):
         Raises:
             NotSuchModelInDataBaseError:
                 If the specified user record cannot be found in the database.
-            DatabaseError:
-                If the query or update operation fails.
         """
-        commit_and_close = False
-        if cursor is None:
-            cursor = cls._get_cursor()
-            commit_and_close = True
-
-        model = UserRepository.get_one(user_model, cursor)
-        
-        if model is None:
-            raise NotSuchModelInDataBaseError('user not found', user_model)
-        
-        message_model = MessageViewModel(to=model.username, seen=False)
-        
-        result = cls.view_many(message_model, cursor)
-        
-        cls._update_seen(user_model, cursor)
+        return cls.inbox_page(user_model, unread_only = True, cursor = cursor).rows
 
-        if commit_and_close:
-            cursor.connection.commit()
-            cursor.connection.close()
+    @classmethod
+    def unread_count(cls, user_model: UserModel, cursor: Optional[PgCursor] = None) -> int:
+        """
+        Counts the messages the specified user has not seen yet.
 
-        return result
+        Answered from the partial index on unseen messages
+        (Migrations/007_message_inbox_indexes.sql) without touching seen history.
+
+        Args:
+            user_model (UserModel):
+                The user whose unread messages are counted.
+            cursor (Optional[PgCursor], optional):
+                Existing database cursor. If not provided, a new one will be created automatically.
+
+        Returns:
+            int: Number of unread messages.
+
+        Raises:
+            EmptyModelError:
+                If `user_model` has no fields to look the user up by.
+            NotSuchModelInDataBaseError:
+                If the specified user record cannot be found in the database.
+            MultipleRowsReturnedError:
+                If `user_model` matches more than one user.
+        """
+        statement = cached_where_statement(
+            (cls, "unread_count"),
+            user_model,
+            lambda where_clause: f"""
+                WITH recipient AS (
+                    SELECT {DBTableColumns.User.ID} FROM {DBTables.USER}
+                    WHERE {where_clause}
+                    LIMIT 2
+                )
+                SELECT
+                    (SELECT count(*) FROM recipient),
+                    (
+                        SELECT count(*) FROM {cls.table_name} message
+                        WHERE message.{DBTableColumns.Message.USER_ID} = (
+                            SELECT {DBTableColumns.User.ID} FROM recipient
+                            WHERE (SELECT count(*) FROM recipient) = 1
+                        )
+                        AND NOT message.{DBTableColumns.Message.SEEN}
+                    )
+                """,
+            exclude=UserRepository.where_clause_exclude
+        )
+
+        if statement is None:
+            raise EmptyModelError()
+
+        query, values = statement
+
+        with cls._use_cursor(cursor) as cursor:
+            cls._execute(cursor, query, values)
+            matched, unread = cursor.fetchone()
+
+        if matched == 0:
+            raise NotSuchModelInDataBaseError('user not found', user_model)
+        if matched > 1:
+            raise MultipleRowsReturnedError()
+
+        return unread
 
 
     # Inherited Methods
 
     @classmethod
-    def get_one(cls, model : model_class, cursor : Optional[PgCursor] = None) -> Optional[model_class]:
-        return super().get_one(model, cursor)
+    def get_one(cls, model : model_class, cursor : Optional[PgCursor] = None, fields : Optional[Iterable[str]] = None) -> Optional[model_class]:
+        return super().get_one(model, cursor, fields)
        
     @classmethod
-    def get_many(cls, model : model_class, cursor : Optional[PgCursor] = None) -> list[model_class]:
-        return super().get_many(model, cursor)
+    def get_many(cls, model : model_class, cursor : Optional[PgCursor] = None, fields : Optional[Iterable[str]] = None) -> list[model_class]:
+        return super().get_many(model, cursor, fields)
     
     @classmethod
-    def view_one(cls, model : view_model_class, cursor : Optional[PgCursor] = None) -> Optional[view_model_class]:
-        return super().view_one(model, cursor)
+    def view_one(cls, model : view_model_class, cursor : Optional[PgCursor] = None, fields : Optional[Iterable[str]] = None) -> Optional[view_model_class]:
+        return super().view_one(model, cursor, fields)
        
     @classmethod
-    def view_many(cls, model : view_model_class, cursor : Optional[PgCursor] = None) -> list[view_model_class]:
-        return super().view_many(model, cursor)
+    def view_many(cls, model : view_model_class, cursor : Optional[PgCursor] = None, fields : Optional[Iterable[str]] = None) -> list[view_model_class]:
+        return super().view_many(model, cursor, fields)
 
     @classmethod
     def clear(cls, cursor: Optional[PgCursor] = None) -> None:
@@ -222,3 +319,9 @@ class MessageRepository(CommonQueriesRepository):
         """Disabled method. Not allowed for this repository."""
         pass
 
+    @classmethod
+    @forbidden_method
+    def add_many(cls, models, cursor : Optional[PgCursor] = None):
+        """Disabled method. Not allowed for this repository."""
+        pass
+
@@ -0,0 +1,202 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Iterable, Optional
+from DataAccess.Connection import DatabaseConnector
+from DataAccess.InvalidationBus import invalidation_bus
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE, connection as PgConnection
+
+
+class QueryCache:
+    """
+    Read-through cache of query results with LRU eviction and a time-to-live.
+
+    Repositories cache the raw rows of their reads here (see `BaseRepository._cached_read`)
+    and clear the cache after every committed write (`BaseRepository._after_write`).
+    Writes made by other processes arrive through the `InvalidationBus`; entries also expire
+    after `ttl_seconds`, which bounds staleness if a notification is missed.
+
+    A write on a caller-owned cursor commits whenever the caller does, so it `hold`s the cache
+    instead: until that connection's transaction has ended, reads run the query but store
+    nothing, and the cache is cleared once more when it ends.
+
+    Attributes:
+        ttl_seconds (float): Lifetime of an entry.
+        max_size (int): Number of entries kept; the least recently used one is evicted first.
+        hits (int): Reads answered from the cache.
+        misses (int): Reads that had to run the query.
+    """
+
+    def __init__(self, ttl_seconds: float = 60.0, max_size: int = 256):
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries : OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._generation = 0
+        self._held : list[PgConnection] = []
+        self._lock = threading.Lock()
+
+    def get_or_load(self, key: Hashable, load: Callable[[], Any]) -> Any:
+        """
+        Returns the cached value of `key`, calling `load` to fill it if it is missing or expired.
+
+        A value loaded while the cache was invalidated, or while it is held, is returned but
+        not stored, so a read racing a write cannot put the pre-write result back.
+
+        Args:
+            key (Hashable): Identifies the query, e.g. its SQL text and parameter values.
+            load (Callable[[], Any]): Runs the query.
+
+        Returns:
+            Any: The cached or freshly loaded value.
+        """
+        now = time.monotonic()
+
+        with self._lock:
+            self._release_ended()
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+
+            self.misses += 1
+            generation = None if self._held else self._generation
+
+        value = load()
+
+        with self._lock:
+            if generation == self._generation:
+                self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+
+        return value
+
+    def invalidate(self) -> None:
+        """Drops every entry."""
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+
+    def hold(self, connection: PgConnection) -> None:
+        """
+        Drops every entry and stops storing new ones until the transaction of `connection` ends.
+
+        Args:
+            connection (PgConnection): Connection with an uncommitted write to the cached table.
+        """
+        with self._lock:
+            if not any(held is connection for held in self._held):
+                self._held.append(connection)
+            self._entries.clear()
+            self._generation += 1
+
+    def _release_ended(self) -> None:
+        """Releases held connections whose transaction has ended; called with `_lock` held."""
+        self._held = [connection for connection in self._held if _in_transaction(connection)]
+
+    def stats(self) -> dict[str, int]:
+        """
+        Returns the hit and miss counters and the current number of entries.
+
+        Returns:
+            dict[str, int]: `{'hits': ..., 'misses': ..., 'size': ...}`.
+        """
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'size': len(self._entries)}
+
+
+def _in_transaction(connection: PgConnection) -> bool:
+    return not connection.closed and connection.get_transaction_status() != TRANSACTION_STATUS_IDLE
+
+
+_caches : dict[str, QueryCache] = {}
+_caches_lock = threading.Lock()
+# Holds on caches that are not created yet, applied when they are.
+_pending_holds : dict[str, list[PgConnection]] = {}
+_enabled : Optional[bool] = None
+
+
+def query_cache(name: str, ttl_seconds: float, max_size: int) -> Optional[QueryCache]:
+    """
+    Returns the shared cache called `name`, creating it on first use and subscribing it to
+    the invalidation bus channel of the table with that name.
+
+    Settings:
+        QUERY_CACHE: `false` to disable every query cache (default true).
+
+    Args:
+        name (str): Cache name; repositories use their `table_name`.
+        ttl_seconds (float): Entry lifetime for a newly created cache.
+        max_size (int): Entry limit for a newly created cache.
+
+    Returns:
+        Optional[QueryCache]: The cache, or None when caching is disabled.
+    """
+    global _enabled
+
+    if _enabled is None:
+        DatabaseConnector()  # loads .env
+        _enabled = os.getenv("QUERY_CACHE", "true").lower() in ("1", "true", "yes")
+
+    if not _enabled:
+        return None
+
+    cache = _caches.get(name)
+    if cache is None:
+        with _caches_lock:
+            cache = _caches.get(name)
+            if cache is None:
+                cache = _caches[name] = QueryCache(ttl_seconds, max_size)
+                for connection in _pending_holds.pop(name, ()):
+                    cache.hold(connection)
+                invalidation_bus().subscribe(name, cache.invalidate)
+    return cache
+
+
+def invalidate_query_caches(names: Iterable[str]) -> None:
+    """
+    Clears the caches called `names`; names without a cache are ignored.
+
+    Args:
+        names (Iterable[str]): Cache names.
+    """
+    for name in names:
+        cache = _caches.get(name)
+        if cache is not None:
+            cache.invalidate()
+
+
+def hold_query_caches(names: Iterable[str], connection: PgConnection) -> None:
+    """
+    Holds the caches called `names` until the transaction of `connection` ends (see `QueryCache.hold`).
+
+    A cache that does not exist yet is held from its creation, so its first read cannot store
+    rows from before the commit either.
+
+    Args:
+        names (Iterable[str]): Cache names.
+        connection (PgConnection): Connection with the uncommitted write.
+    """
+    for name in names:
+        with _caches_lock:
+            cache = _caches.get(name)
+            if cache is None:
+                pending = [held for held in _pending_holds.get(name, ()) if _in_transaction(held) and held is not connection]
+                _pending_holds[name] = [*pending, connection]
+        if cache is not None:
+            cache.hold(connection)
+
+
+def query_cache_stats() -> dict[str, dict[str, int]]:
+    """
+    Returns the counters of every cache created so far.
+
+    Returns:
+        dict[str, dict[str, int]]: `QueryCache.stats()` by cache name.
+    """
+    return {name: cache.stats() for name, cache in list(_caches.items())}
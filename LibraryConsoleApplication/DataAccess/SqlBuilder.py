@@ -1,5 +1,6 @@
-from dataclasses import asdict
-from typing import Tuple, Any
+import threading
+from dataclasses import asdict, fields
+from typing import Callable, Hashable, Optional, Tuple, Any
 from Models.Models import UnsetType
 
 def build_set_clause(model: Any, exclude: set = {"id"}) -> Tuple[str, list]:
@@ -100,4 +101,321 @@ def build_insert_clause(model: Any, exclude: set = {"id"}) -> Tuple[str, str, li
     columns_clause = ", ".join(columns)
     placeholders_clause = ", ".join(placeholders)
     
-    return columns_clause, placeholders_clause, values
\ No newline at end of file
+    return columns_clause, placeholders_clause, values
+
+
+# ─────────────────────────────── Cached Statements ───────────────────────────────
+#
+# The builders above walk `asdict(model)` and re-render the clause on every call.
+# The functions below render each distinct statement once and reuse it: a statement
+# is identified by a caller supplied key (usually `(repository class, operation)`),
+# the model class and a "shape" integer that records, per field, whether it takes
+# part in the statement and how. Per call, only the shape and the values are
+# collected, in a single pass of `getattr` over the cached field names.
+
+_SKIP, _EQUALS, _IS_NULL, _LIKE = 0, 1, 2, 3
+_SHAPE_BITS = 2
+_SHAPE_MASK = (1 << _SHAPE_BITS) - 1
+
+_field_names_cache : dict = {}
+
+
+def model_field_names(model_class: type) -> Tuple[str, ...]:
+    """
+    Returns the dataclass field names of a model class, in declaration order.
+
+    The result is computed once per class and cached.
+
+    Args:
+        model_class (type): A dataclass type.
+
+    Returns:
+        Tuple[str, ...]: Field names of the model class.
+    """
+    names = _field_names_cache.get(model_class)
+    if names is None:
+        names = tuple(field.name for field in fields(model_class))
+        _field_names_cache[model_class] = names
+    return names
+
+
+class StatementCache:
+    """
+    Bounded, thread-safe map from a statement key to its rendered SQL.
+
+    When the cache is full the oldest entry is dropped. The number of distinct
+    shapes per repository is small, so in practice every hot statement stays cached.
+
+    Attributes:
+        max_size (int): Maximum number of cached statements.
+        hits (int): Number of lookups served from the cache.
+        misses (int): Number of lookups that had to render the statement.
+    """
+
+    def __init__(self, max_size: int = 4096):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries : dict = {}
+        self._lock = threading.Lock()
+
+    def get_or_render(self, key: Hashable, render: Callable[[], str]) -> str:
+        """
+        Returns the SQL cached under `key`, rendering and storing it on a miss.
+
+        Args:
+            key (Hashable): Statement key.
+            render (Callable[[], str]): Produces the SQL when it is not cached yet.
+
+        Returns:
+            str: The rendered SQL statement.
+        """
+        sql = self._entries.get(key)
+        if sql is not None:
+            self.hits += 1
+            return sql
+
+        sql = render()
+        with self._lock:
+            self.misses += 1
+            if len(self._entries) >= self.max_size:
+                self._entries.pop(next(iter(self._entries)))
+            self._entries[key] = sql
+        return sql
+
+    def clear(self) -> None:
+        """Drops every cached statement and resets the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+statement_cache = StatementCache()
+
+
+def _collect_conditions(model: Any, use_like_for_strings: bool, exclude: set) -> Tuple[int, list]:
+    """Single pass over the model computing the WHERE shape and its parameter values."""
+    shape = 0
+    offset = 0
+    values = []
+
+    for name in model_field_names(type(model)):
+        if name not in exclude:
+            value = getattr(model, name)
+            if value is None:
+                shape |= _IS_NULL << offset
+            elif isinstance(value, UnsetType):
+                pass
+            elif use_like_for_strings and isinstance(value, str):
+                shape |= _LIKE << offset
+                values.append(f"%{value}%")
+            else:
+                shape |= _EQUALS << offset
+                values.append(value)
+        offset += _SHAPE_BITS
+
+    return shape, values
+
+
+def _collect_assignments(model: Any, exclude: set) -> Tuple[int, list]:
+    """Single pass over the model computing the SET/INSERT shape and its values."""
+    shape = 0
+    offset = 0
+    values = []
+
+    for name in model_field_names(type(model)):
+        if name not in exclude:
+            value = getattr(model, name)
+            if not isinstance(value, UnsetType):
+                shape |= _EQUALS << offset
+                values.append(value)
+        offset += _SHAPE_BITS
+
+    return shape, values
+
+
+def _shape_fields(model_class: type, shape: int) -> list:
+    """Decodes a shape into `(field name, code)` pairs for the participating fields."""
+    result = []
+    for name in model_field_names(model_class):
+        code = shape & _SHAPE_MASK
+        if code != _SKIP:
+            result.append((name, code))
+        shape >>= _SHAPE_BITS
+    return result
+
+
+def _render_where(model_class: type, shape: int) -> str:
+    conditions = []
+    for name, code in _shape_fields(model_class, shape):
+        if code == _IS_NULL:
+            conditions.append(f"{name} IS NULL")
+        elif code == _LIKE:
+            conditions.append(f"{name} LIKE %s")
+        else:
+            conditions.append(f"{name} = %s")
+    return " AND ".join(conditions)
+
+
+def cached_where_statement(
+    key: Hashable,
+    model: Any,
+    render: Callable[[str], str],
+    use_like_for_strings: bool = False,
+    exclude: set = set()
+) -> Optional[Tuple[str, list]]:
+    """
+    Cached counterpart of `build_where_clause` that returns a complete statement.
+
+    `render` receives the WHERE clause (e.g. `"name LIKE %s AND age = %s"`) and
+    returns the full SQL. It is only called the first time a given
+    `(key, model class, shape)` combination is seen.
+
+    Example:
+        statement = cached_where_statement(
+            (cls, "get_one"), model,
+            lambda where: f"SELECT * FROM {cls.table_name} WHERE {where}",
+            exclude=cls.where_clause_exclude
+        )
+
+    Args:
+        key (Hashable): Identifies the statement template, e.g. `(repository class, operation)`.
+        model (Any): A dataclass instance whose non-Unset fields form the conditions.
+        render (Callable[[str], str]): Builds the SQL around the WHERE clause.
+        use_like_for_strings (bool): Whether to use LIKE for string fields.
+        exclude (set): Field names ignored when building the conditions.
+
+    Returns:
+        Optional[Tuple[str, list]]: SQL statement and parameter values,
+                                    or None if the model has no usable fields.
+    """
+    shape, values = _collect_conditions(model, use_like_for_strings, exclude)
+    if not shape:
+        return None
+
+    model_class = type(model)
+    sql = statement_cache.get_or_render(
+        (key, model_class, shape, use_like_for_strings),
+        lambda: render(_render_where(model_class, shape))
+    )
+    return sql, values
+
+
+def cached_set_statement(
+    key: Hashable,
+    model: Any,
+    render: Callable[[str], str],
+    exclude: set = {"id"}
+) -> Optional[Tuple[str, list]]:
+    """
+    Cached counterpart of `build_set_clause` that returns a complete statement.
+
+    Args:
+        key (Hashable): Identifies the statement template, e.g. `(repository class, operation)`.
+        model (Any): A dataclass instance whose non-Unset fields are assigned.
+        render (Callable[[str], str]): Builds the SQL around the SET clause (e.g. `"name = %s, age = %s"`).
+        exclude (set): Field names that are never assigned.
+
+    Returns:
+        Optional[Tuple[str, list]]: SQL statement and parameter values,
+                                    or None if there is nothing to assign.
+    """
+    shape, values = _collect_assignments(model, exclude)
+    if not shape:
+        return None
+
+    model_class = type(model)
+    sql = statement_cache.get_or_render(
+        (key, model_class, shape),
+        lambda: render(", ".join(f"{name} = %s" for name, _ in _shape_fields(model_class, shape)))
+    )
+    return sql, values
+
+
+def cached_insert_statement(
+    key: Hashable,
+    model: Any,
+    render: Callable[[str, str], str],
+    exclude: set = {"id"}
+) -> Optional[Tuple[str, list]]:
+    """
+    Cached counterpart of `build_insert_clause` that returns a complete statement.
+
+    Args:
+        key (Hashable): Identifies the statement template, e.g. `(repository class, operation)`.
+        model (Any): The dataclass instance to insert.
+        render (Callable[[str, str], str]): Builds the SQL from the column list and the placeholder list.
+        exclude (set): Field names that are never inserted.
+
+    Returns:
+        Optional[Tuple[str, list]]: SQL statement and parameter values,
+                                    or None if there is nothing to insert.
+    """
+    shape, values = _collect_assignments(model, exclude)
+    if not shape:
+        return None
+
+    model_class = type(model)
+
+    def render_insert() -> str:
+        names = [name for name, _ in _shape_fields(model_class, shape)]
+        return render(", ".join(names), ", ".join(["%s"] * len(names)))
+
+    sql = statement_cache.get_or_render((key, model_class, shape), render_insert)
+    return sql, values
+
+
+def collect_insert_values(model: Any, exclude: set = {"id"}) -> Tuple[int, list]:
+    """
+    Collects the values a model contributes to an INSERT, together with its shape.
+
+    Models with the same class and shape insert the same columns, so the shape can be
+    used to group models for multi-row inserts (see `shape_columns`).
+
+    Args:
+        model (Any): The dataclass instance to insert.
+        exclude (set): Field names that are never inserted.
+
+    Returns:
+        Tuple[int, list]: Shape of the model (0 if nothing is inserted) and its values in column order.
+    """
+    return _collect_assignments(model, exclude)
+
+
+def collect_set_values(model: Any, exclude: set = {"id"}) -> Tuple[int, list]:
+    """
+    Collects the values a model assigns in an UPDATE, together with its shape.
+
+    Args:
+        model (Any): A dataclass instance whose non-Unset fields are assigned.
+        exclude (set): Field names that are never assigned.
+
+    Returns:
+        Tuple[int, list]: Shape of the model (0 if nothing is assigned) and its values in column order.
+    """
+    return _collect_assignments(model, exclude)
+
+def shape_columns(model_class: type, shape: int) -> Tuple[str, ...]:
+    """
+    Returns the column names encoded by an INSERT/SET shape, in field order.
+
+    Args:
+        model_class (type): The dataclass type the shape was collected from.
+        shape (int): Shape returned by `collect_insert_values`.
+
+    Returns:
+        Tuple[str, ...]: Names of the participating columns.
+    """
+    key = (model_class, shape)
+    columns = _shape_columns_cache.get(key)
+    if columns is None:
+        columns = tuple(name for name, _ in _shape_fields(model_class, shape))
+        _shape_columns_cache[key] = columns
+    return columns
+
+
+_shape_columns_cache : dict = {}
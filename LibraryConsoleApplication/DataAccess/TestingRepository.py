@@ -1,6 +1,6 @@
-from typing import Optional
+from typing import Iterable, Iterator, Optional
 from psycopg2.extensions import cursor as PgCursor
-from Models.Models import TestingModel, TestingViewModel
+from Models.Models import PageResult, TestingModel, TestingViewModel
 from Models.Schema import DBTableColumns, DBTables, DBViews 
 from DataAccess.CommonQueriesRepository import CommonQueriesRepository
 
@@ -19,33 +19,61 @@ class TestingRepository(CommonQueriesRepository):
     where_clause_exclude = set()
 
     @classmethod
-    def get_one(cls, model : model_class, cursor : Optional[PgCursor] = None) -> Optional[model_class]:
-        return super().get_one(model, cursor)
+    def get_one(cls, model : model_class, cursor : Optional[PgCursor] = None, fields : Optional[Iterable[str]] = None) -> Optional[model_class]:
+        return super().get_one(model, cursor, fields)
        
     @classmethod
-    def get_many(cls, model : model_class, cursor : Optional[PgCursor] = None) -> list[model_class]:
-        return super().get_many(model, cursor)
+    def get_many(cls, model : model_class, cursor : Optional[PgCursor] = None, fields : Optional[Iterable[str]] = None) -> list[model_class]:
+        return super().get_many(model, cursor, fields)
+
+    @classmethod
+    def get_page(cls, model : model_class, page_size : Optional[int] = None, page_token : Optional[str] = None, cursor : Optional[PgCursor] = None, fields : Optional[Iterable[str]] = None) -> PageResult:
+        return super().get_page(model, page_size, page_token, cursor, fields)
+
+    @classmethod
+    def iter_many(cls, model : model_class, itersize : Optional[int] = None, cursor : Optional[PgCursor] = None, fields : Optional[Iterable[str]] = None) -> Iterator[model_class]:
+        return super().iter_many(model, itersize, cursor, fields)
     
     @classmethod
-    def view_one(cls, model : view_model_class, cursor : Optional[PgCursor] = None) -> Optional[view_model_class]:
-        return super().view_one(model, cursor)
+    def view_one(cls, model : view_model_class, cursor : Optional[PgCursor] = None, fields : Optional[Iterable[str]] = None) -> Optional[view_model_class]:
+        return super().view_one(model, cursor, fields)
        
     @classmethod
-    def view_many(cls, model : view_model_class, cursor : Optional[PgCursor] = None) -> list[view_model_class]:
-        return super().view_many(model, cursor)
+    def view_many(cls, model : view_model_class, cursor : Optional[PgCursor] = None, fields : Optional[Iterable[str]] = None) -> list[view_model_class]:
+        return super().view_many(model, cursor, fields)
+
+    @classmethod
+    def view_page(cls, model : view_model_class, page_size : Optional[int] = None, page_token : Optional[str] = None, cursor : Optional[PgCursor] = None, fields : Optional[Iterable[str]] = None) -> PageResult:
+        return super().view_page(model, page_size, page_token, cursor, fields)
+
+    @classmethod
+    def iter_view(cls, model : view_model_class, itersize : Optional[int] = None, cursor : Optional[PgCursor] = None, fields : Optional[Iterable[str]] = None) -> Iterator[view_model_class]:
+        return super().iter_view(model, itersize, cursor, fields)
     
     @classmethod
     def add(cls, model : model_class, cursor : Optional[PgCursor] = None) -> model_class:
         return super().add(model, cursor)
+
+    @classmethod
+    def add_many(cls, models : list[model_class], cursor : Optional[PgCursor] = None) -> list[model_class]:
+        return super().add_many(models, cursor)
     
     @classmethod
     def update(cls, model : model_class, cursor: Optional[PgCursor] = None) -> None:
         return super().update(model, cursor)
+
+    @classmethod
+    def update_many(cls, models : list[model_class], cursor: Optional[PgCursor] = None) -> None:
+        return super().update_many(models, cursor)
             
     @classmethod
     def delete(cls, id : int, cursor: Optional[PgCursor] = None) -> None:
         return super().delete(id, cursor)
 
+    @classmethod
+    def delete_many(cls, ids : list[int], cursor: Optional[PgCursor] = None) -> int:
+        return super().delete_many(ids, cursor)
+
     @classmethod
     def remove(cls, model : model_class, use_like_for_strings : bool = True, cursor: Optional[PgCursor] = None):
         return super().remove(model, use_like_for_strings, cursor)
@@ -0,0 +1,106 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Iterator, Optional
+from DataAccess.Connection import DatabaseConnector
+from psycopg2.extensions import cursor as PgCursor
+
+
+_current_cursor : ContextVar[Optional[PgCursor]] = ContextVar("_current_cursor", default=None)
+_commit_callbacks : ContextVar[Optional[list]] = ContextVar("_commit_callbacks", default=None)
+
+
+def current_cursor() -> Optional[PgCursor]:
+    """Return the cursor bound to the active transaction scope, if any.
+
+    Returns:
+        Optional[PgCursor]: Cursor of the innermost `transaction()` block, or None outside of one.
+    """
+    return _current_cursor.get()
+
+
+def after_commit(callback: Callable[[], None]) -> None:
+    """Run `callback` once the active `transaction()` scope has committed.
+
+    Callbacks are dropped if the transaction rolls back. Outside of a scope
+    (including calls on a caller-owned cursor) the callback runs immediately.
+
+    Args:
+        callback (Callable[[], None]): Function to call after the commit.
+    """
+    callbacks = _commit_callbacks.get()
+
+    if callbacks is None:
+        callback()
+        return
+
+    callbacks.append(callback)
+
+
+@contextmanager
+def transaction() -> Iterator[PgCursor]:
+    """Unit-of-work scope that binds one pooled connection to the current call chain.
+
+    The outermost `transaction()` borrows a connection from the pool and makes its
+    cursor visible to every repository method called inside the block, so nested
+    calls such as `BorrowingRepository.add` -> `BookRepository.get_one` run on the
+    same connection and in the same transaction. Nested `transaction()` blocks join
+    the outer one instead of opening a new connection.
+
+    On normal exit the outermost scope commits and then runs the `after_commit`
+    callbacks; if an exception escapes it rolls back. In both cases the connection
+    is returned to the pool.
+
+    Example:
+        with transaction() as cursor:
+            borrowing = BorrowingRepository.add(model)
+            LibrarianActivityLogRepository.add(log_model)
+
+    Yields:
+        PgCursor: Cursor of the (possibly shared) transaction.
+    """
+    cursor = _current_cursor.get()
+
+    if cursor is not None:
+        yield cursor
+        return
+
+    cursor = DatabaseConnector().get_cursor()
+    token = _current_cursor.set(cursor)
+    callbacks = []
+    callbacks_token = _commit_callbacks.set(callbacks)
+
+    try:
+        yield cursor
+        cursor.connection.commit()
+    except BaseException:
+        cursor.connection.rollback()
+        raise
+    finally:
+        _commit_callbacks.reset(callbacks_token)
+        _current_cursor.reset(token)
+        cursor.connection.close()
+
+    for callback in callbacks:
+        callback()
+
+
+@contextmanager
+def cursor_scope(cursor: Optional[PgCursor] = None) -> Iterator[PgCursor]:
+    """Resolve the cursor a repository method should run on.
+
+    An explicitly passed cursor always wins and is left untouched (the caller owns
+    its transaction). Otherwise the method joins the active `transaction()` scope,
+    or runs in a transaction of its own when there is none.
+
+    Args:
+        cursor (Optional[PgCursor]): Cursor passed by the caller, if any.
+
+    Yields:
+        PgCursor: Cursor to execute statements on.
+    """
+    if cursor is not None:
+        yield cursor
+        return
+
+    with transaction() as cursor:
+        yield cursor
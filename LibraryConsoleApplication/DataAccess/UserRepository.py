@@ -1,7 +1,7 @@
-﻿from typing import Optional
+﻿from typing import Iterable, Optional
 from DataAccess.CommonQueriesRepository import CommonQueriesRepository
 from DataAccess.Decorators import forbidden_method
-from Exceptions.Exceptions import AuthenticationFailed, NotSuchModelInDataBaseError
+from Exceptions.Exceptions import AuthenticationFailed, NotSuchModelInDataBaseError, PasswordHashingBusyError
 from Models.Models import PlainUserModel, UserModel, UserType, UserViewModel, UserWithoutPasswordViewModel
 from Models.Schema import DBTableColumns, DBTables, DBViews
 from psycopg2.extensions import cursor as PgCursor
@@ -32,6 +32,10 @@ class UserRepository(CommonQueriesRepository):
         """
         Verifies a user's credentials by comparing the provided plain password with the stored hash.
 
+        When the stored hash was made with other Argon2 parameters than the current
+        `HASH_*` settings, the password is rehashed and the new hash is saved, so cost
+        changes reach existing accounts as users log in.
+
         Args:
             plain_user_model (PlainUserModel):
                 The plain user data containing the username and password to verify.
@@ -41,39 +45,128 @@ class UserRepository(CommonQueriesRepository):
         Returns:
             Optional[UserWithoutPasswordViewModel]:
                 Returns a user view model (without password) if credentials are valid; None otherwise.
+
+        Raises:
+            PasswordHashingBusyError: If too many password checks are already waiting.
+        """
+        db_model = cls._check_credentials(plain_user_model, cursor)
+
+        if db_model is None:
+            return None
+
+        if PasswordManager().needs_rehash(db_model.hashed_password):
+            cls._rehash_password(db_model.id, db_model.hashed_password, plain_user_model.password, cursor)
+        
+        return UserWithoutPasswordViewModel(db_model.id, db_model.username, db_model.name, db_model.user_type)
+
+    @classmethod
+    def _check_credentials(cls, plain_user_model : PlainUserModel, cursor : Optional[PgCursor] = None) -> Optional[view_model_class]:
+        """
+        Looks the user up and checks the plain password against the stored hash, without rehashing.
+
+        Args:
+            plain_user_model (PlainUserModel): The username and password to check.
+            cursor (Optional[PgCursor], optional): Existing database cursor. 
+                If not provided, a new one will be created automatically.
+
+        Returns:
+            Optional[UserViewModel]: The user with its stored hash if the password matches; None otherwise.
+
+        Raises:
+            PasswordHashingBusyError: If too many password checks are already waiting.
         """
         if (not isinstance(plain_user_model.username, str)) or (not isinstance(plain_user_model.password, str)):
             raise ValueError('username and password must be string')
 
-        commit_and_close = False
-        if cursor is None:
-            cursor = cls._get_cursor()
-            commit_and_close = True
-
-        model = UserViewModel(username = plain_user_model.username)
-        db_model = cls.view_one(model, cursor)
+        db_model = cls.get_credentials(plain_user_model.username, cursor)
         
         if db_model is None:
-            if commit_and_close:
-                cursor.connection.commit()
-                cursor.connection.close()
             return None
-    
-        password_manager = PasswordManager()
-        
-        verification = password_manager.verify_password(
+
+        # Verified after the lookup's connection is released, as verification may queue
+        # for a hashing worker.
+        verification = PasswordManager().verify_password(
             plain_password=plain_user_model.password,
             hashed_password=db_model.hashed_password
         )
-        
-        if commit_and_close:
-            cursor.connection.commit()
-            cursor.connection.close()
-            
-        if not verification:
+
+        return db_model if verification else None
+
+    @classmethod
+    def get_credentials(cls, username : str, cursor : Optional[PgCursor] = None) -> Optional[view_model_class]:
+        """
+        Loads what a login needs: the user's ID, password hash, name and role.
+
+        A narrow counterpart of `view_one(UserViewModel(username=...))`: it reads `"User"` by
+        username (an index-only scan with Migrations/005_user_credentials_index.sql) and
+        joins `"Librarian"` and `"Member"` by primary key, instead of going through the
+        ordered `UserView`.
+
+        Args:
+            username (str): Username to look up.
+            cursor (Optional[PgCursor], optional): Existing database cursor. 
+                If not provided, a new one will be created automatically.
+
+        Returns:
+            Optional[UserViewModel]: The user, or None if the username does not exist.
+        """
+        user, librarian, member = DBTables.USER, DBTables.LIBRARIAN, DBTables.MEMBER
+
+        query = f"""
+            SELECT
+                {user}.{DBTableColumns.User.ID},
+                {user}.{DBTableColumns.User.HASHED_PASSWORD},
+                COALESCE({member}.{DBTableColumns.Member.NAME}, {librarian}.{DBTableColumns.Librarian.NAME}),
+                CASE
+                    WHEN {librarian}.{DBTableColumns.Librarian.ID} IS NOT NULL THEN 'librarian'::"UserType"
+                    WHEN {member}.{DBTableColumns.Member.ID} IS NOT NULL THEN 'member'::"UserType"
+                    ELSE 'admin'::"UserType"
+                END
+            FROM {user}
+            LEFT JOIN {librarian} ON {librarian}.{DBTableColumns.Librarian.ID} = {user}.{DBTableColumns.User.ID}
+            LEFT JOIN {member} ON {member}.{DBTableColumns.Member.ID} = {user}.{DBTableColumns.User.ID}
+            WHERE {user}.{DBTableColumns.User.USERNAME} = %s
+        """
+
+        with cls._use_cursor(cursor) as cursor:
+            cls._execute(cursor, query, (username,))
+            result = cursor.fetchone()
+
+        if result is None:
             return None
-        
-        return UserWithoutPasswordViewModel(db_model.id, db_model.username, db_model.name, db_model.user_type)
+
+        id, hashed_password, name, user_type = result
+        return cls.view_model_class(id, username, hashed_password, name, user_type)
+
+    @classmethod
+    def _rehash_password(cls, id : int, old_hashed_password : str, plain_password : str, cursor : Optional[PgCursor] = None) -> None:
+        """
+        Replaces an outdated password hash with one made with the current parameters.
+
+        The update only applies while the stored hash is still `old_hashed_password`, so a
+        password changed in the meantime is never overwritten. A full hashing queue skips the
+        rehash; the next login tries again.
+
+        Args:
+            id (int): ID of the user.
+            old_hashed_password (str): Hash the password was just verified against.
+            plain_password (str): The verified plain password.
+            cursor (Optional[PgCursor], optional): Existing database cursor. 
+                If not provided, a new one will be created automatically.
+        """
+        try:
+            new_hashed_password = PasswordManager().hash_password(plain_password)
+        except PasswordHashingBusyError:
+            return
+
+        query = f"""
+            UPDATE {DBTables.USER}
+            SET {DBTableColumns.User.HASHED_PASSWORD} = %s
+            WHERE {DBTableColumns.User.ID} = %s AND {DBTableColumns.User.HASHED_PASSWORD} = %s
+        """
+
+        with cls._use_cursor(cursor) as cursor:
+            cursor.execute(query, (new_hashed_password, id, old_hashed_password))
 
     @classmethod
     def hash_password_and_add_user(cls, plain_user_model : PlainUserModel, cursor : Optional[PgCursor] = None) -> UserModel:
@@ -119,7 +212,8 @@ class UserRepository(CommonQueriesRepository):
         Change the password of a user after verifying their current credentials.
 
         The user must provide a valid username and current password to confirm identity.
-        After successful verification, the password is securely re-hashed and updated in the database.
+        After successful verification, the new password is hashed and stored. An outdated hash of
+        the current password is not rehashed first, as it is replaced anyway.
 
         Args:
             plain_user_model (PlainUserModel): 
@@ -136,32 +230,22 @@ class UserRepository(CommonQueriesRepository):
         Returns:
             None
         """
-        commit_and_close = False
-        if cursor is None:
-            cursor = cls._get_cursor()
-            commit_and_close = True
-
-        verification = cls.verify_user(plain_user_model, cursor)
-        
-        if not verification:
+        if cls._check_credentials(plain_user_model, cursor) is None:
             raise AuthenticationFailed('Username or password is wrong')
 
-        password_manager = PasswordManager()
-        new_hashed_password = password_manager.hash_password(new_password)
-
-        query = (
-            f"""
-            UPDATE {DBTables.USER} 
-            SET {DBTableColumns.User.HASHED_PASSWORD} = %s
-            WHERE {DBTableColumns.User.USERNAME} = %s
-            """
-        )
-        
-        cursor.execute(query, (new_hashed_password, plain_user_model.username))
+        # Hashed before a connection is taken, as hashing may queue for a worker.
+        new_hashed_password = PasswordManager().hash_password(new_password)
+
+        with cls._use_cursor(cursor) as cursor:
+            query = (
+                f"""
+                UPDATE {DBTables.USER} 
+                SET {DBTableColumns.User.HASHED_PASSWORD} = %s
+                WHERE {DBTableColumns.User.USERNAME} = %s
+                """
+            )
         
-        if commit_and_close:
-            cursor.connection.commit()
-            cursor.connection.close()
+            cursor.execute(query, (new_hashed_password, plain_user_model.username))
 
     @classmethod
     def _change_password_by_role(cls, username: str, new_password: str, user_type: UserType, cursor: Optional[PgCursor] = None) -> None:
@@ -188,30 +272,22 @@ class UserRepository(CommonQueriesRepository):
         Returns:
             None
         """
-        commit_and_close = False
-        if cursor is None:
-            cursor = cls._get_cursor()
-            commit_and_close = True
-
-        model = UserViewModel(username=username, user_type=user_type)
-        user = cls.view_one(model, cursor=cursor)
+        with cls._use_cursor(cursor) as cursor:
+            model = UserViewModel(username=username, user_type=user_type)
+            user = cls.view_one(model, cursor=cursor)
     
-        if not user:
-            raise NotSuchModelInDataBaseError(f"Cannot find {user_type.value}", model)
+            if not user:
+                raise NotSuchModelInDataBaseError(f"Cannot find {user_type.value}", model)
 
-        password_manager = PasswordManager()
-        new_hashed_password = password_manager.hash_password(new_password)
+            password_manager = PasswordManager()
+            new_hashed_password = password_manager.hash_password(new_password)
 
-        query = f"""
-            UPDATE {DBTables.USER}
-            SET {DBTableColumns.User.HASHED_PASSWORD} = %s
-            WHERE {DBTableColumns.User.USERNAME} = %s
-        """
-        cursor.execute(query, (new_hashed_password, username))
-
-        if commit_and_close:
-            cursor.connection.commit()
-            cursor.connection.close()
+            query = f"""
+                UPDATE {DBTables.USER}
+                SET {DBTableColumns.User.HASHED_PASSWORD} = %s
+                WHERE {DBTableColumns.User.USERNAME} = %s
+            """
+            cursor.execute(query, (new_hashed_password, username))
         
     @classmethod
     def change_member_password(cls, username: str, new_password: str, cursor: Optional[PgCursor] = None) -> None:
@@ -272,48 +348,40 @@ class UserRepository(CommonQueriesRepository):
         Returns:
             None
         """
-        commit_and_close = False
-        if cursor is None:
-            cursor = cls._get_cursor()
-            commit_and_close = True
-
-        verification = cls.verify_user(plain_user_model, cursor)
+        with cls._use_cursor(cursor) as cursor:
+            verification = cls.verify_user(plain_user_model, cursor)
         
-        if not verification:
-            raise AuthenticationFailed('Username or password is wrong')
-
-        query = (
-            f"""
-            UPDATE {DBTables.USER} 
-            SET {DBTableColumns.User.USERNAME} = %s
-            WHERE {DBTableColumns.User.USERNAME} = %s
-            """
-        )
-        
-        cursor.execute(query, (new_username, plain_user_model.username))
+            if not verification:
+                raise AuthenticationFailed('Username or password is wrong')
+
+            query = (
+                f"""
+                UPDATE {DBTables.USER} 
+                SET {DBTableColumns.User.USERNAME} = %s
+                WHERE {DBTableColumns.User.USERNAME} = %s
+                """
+            )
         
-        if commit_and_close:
-            cursor.connection.commit()
-            cursor.connection.close()
+            cursor.execute(query, (new_username, plain_user_model.username))
 
 
     # Inherited Methods
 
     @classmethod
-    def get_one(cls, model : model_class, cursor : Optional[PgCursor] = None) -> Optional[model_class]:
-        return super().get_one(model, cursor)
+    def get_one(cls, model : model_class, cursor : Optional[PgCursor] = None, fields : Optional[Iterable[str]] = None) -> Optional[model_class]:
+        return super().get_one(model, cursor, fields)
        
     @classmethod
-    def get_many(cls, model : model_class, cursor : Optional[PgCursor] = None) -> list[model_class]:
-        return super().get_many(model, cursor)
+    def get_many(cls, model : model_class, cursor : Optional[PgCursor] = None, fields : Optional[Iterable[str]] = None) -> list[model_class]:
+        return super().get_many(model, cursor, fields)
     
     @classmethod
-    def view_one(cls, model : view_model_class, cursor : Optional[PgCursor] = None) -> Optional[view_model_class]:
-        return super().view_one(model, cursor)
+    def view_one(cls, model : view_model_class, cursor : Optional[PgCursor] = None, fields : Optional[Iterable[str]] = None) -> Optional[view_model_class]:
+        return super().view_one(model, cursor, fields)
        
     @classmethod
-    def view_many(cls, model : view_model_class, cursor : Optional[PgCursor] = None) -> list[view_model_class]:
-        return super().view_many(model, cursor)
+    def view_many(cls, model : view_model_class, cursor : Optional[PgCursor] = None, fields : Optional[Iterable[str]] = None) -> list[view_model_class]:
+        return super().view_many(model, cursor, fields)
     
     @classmethod
     def add(cls, model : model_class, cursor : Optional[PgCursor] = None) -> model_class:
@@ -322,6 +390,10 @@ class UserRepository(CommonQueriesRepository):
     @classmethod
     def delete(cls, id : int, cursor: Optional[PgCursor] = None) -> None:
         return super().delete(id, cursor)
+
+    @classmethod
+    def delete_many(cls, ids : list[int], cursor: Optional[PgCursor] = None) -> int:
+        return super().delete_many(ids, cursor)
     
 
     # Forbidden Methods
@@ -344,6 +416,12 @@ class UserRepository(CommonQueriesRepository):
         """Disabled method. Not allowed for this repository."""
         pass
 
+    @classmethod
+    @forbidden_method
+    def add_many(cls, models, cursor : Optional[PgCursor] = None):
+        """Disabled method. Not allowed for this repository."""
+        pass
+
 
 
 
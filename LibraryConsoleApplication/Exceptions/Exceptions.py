@@ -71,4 +71,17 @@ class NotFocusableElementError(Exception):
 
 class NotClickableElementError(Exception):
     """Raised when try to click on not clickable element like 'Text'."""
-    pass
\ No newline at end of file
+    pass
+
+class ConnectionPoolExhaustedError(Exception):
+    """Raised when no pooled database connection becomes available before the checkout timeout."""
+    pass
+
+class InvalidPageTokenError(Exception):
+    """Raised when a pagination token is malformed or was not produced by the repository."""
+    pass
+
+class PasswordHashingBusyError(Exception):
+    """Raised when the password hashing queue is full; the caller should retry later."""
+    def __init__(self, message: str = "Too many logins in progress, please try again"):
+        super().__init__(message)
@@ -631,4 +631,17 @@ class PlainUserModel:
         password (str): User's raw password.
     """
     username: Union[str, None, UnsetType] = UNSET
-    password: Union[str, None, UnsetType] = UNSET
\ No newline at end of file
+    password: Union[str, None, UnsetType] = UNSET
+
+
+@dataclass
+class PageResult:
+    """
+    One page of a keyset-paginated query.
+
+    Attributes:
+        rows (list): Records of this page, ordered by the repository's page key.
+        next_token (str | None): Opaque token for the next page, or None on the last page.
+    """
+    rows: list
+    next_token: Optional[str] = None
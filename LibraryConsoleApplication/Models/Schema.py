@@ -19,6 +19,8 @@ class DBTables:
     MEMBER = '"Member"'
     MESSAGE = '"Message"'
     PUBLISHER = '"Publisher"'
+    BOOK_SEARCH = '"BookSearch"'
+    CATALOGUE_CHANGE = '"CatalogueChange"'
     USER = '"User"'
     TESTING = '"Testing"'
 
@@ -38,6 +40,9 @@ class DBViews:
     USER_VIEW = '"UserView"'
     USER_WITHOUT_PASSWORD_VIEW = '"UserWithoutPasswordView"'
     TESTING_VIEW = '"TestingView"'
+    BOOK_VIEW_MATERIALIZED = '"BookViewMaterialized"'
+    AUTHOR_VIEW_MATERIALIZED = '"AuthorViewMaterialized"'
+    CATEGORY_VIEW_MATERIALIZED = '"CategoryViewMaterialized"'
 
 class DBTableColumns:
     class Admin:
@@ -62,6 +67,14 @@ class DBTableColumns:
     class BookCategory:
         BOOK_ID = "book_id"
         CATEGORY_ID = "category_id"
+
+    class BookSearch:
+        BOOK_ID = "book_id"
+        DOCUMENT = "document"
+
+    class CatalogueChange:
+        BOOK_ID = "book_id"
+        CHANGED_AT = "changed_at"
        
     class BorrowRequest:
         ID = "id"
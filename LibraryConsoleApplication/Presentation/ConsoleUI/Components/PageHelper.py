@@ -1,4 +1,6 @@
-﻿from Presentation.ConsoleUI.Components.Page import Page
+﻿from typing import Callable, Optional
+from Models.Models import PageResult
+from Presentation.ConsoleUI.Components.Page import Page
 
 
 class PageHelper:
@@ -20,3 +22,40 @@ class PageHelper:
             return
 
         page.bag_set(table_page_bag_key, table_page + 1)
+
+    @staticmethod
+    def lazy_table_first_func(page : Page, fetch_page : Callable[[Optional[str]], PageResult], table_data_bag_key : str, table_page_bag_key : str, table_tokens_bag_key : str):
+        """Fetch the first page with `fetch_page(None)` and reset the page number and token stack."""
+        result = fetch_page(None)
+
+        page.bag_set(table_data_bag_key, result)
+        page.bag_set(table_tokens_bag_key, [None])
+        page.bag_set(table_page_bag_key, 1)
+
+    @staticmethod
+    def lazy_table_next_func(page : Page, fetch_page : Callable[[Optional[str]], PageResult], table_data_bag_key : str, table_page_bag_key : str, table_tokens_bag_key : str):
+        """Fetch the page after the current one, using the `next_token` of the current `PageResult`."""
+        current : Optional[PageResult] = page.bag_get(table_data_bag_key)
+
+        if current is None or current.next_token is None:
+            return
+
+        result = fetch_page(current.next_token)
+
+        page.bag_get(table_tokens_bag_key).append(current.next_token)
+        page.bag_set(table_data_bag_key, result)
+        page.bag_set(table_page_bag_key, page.bag_get(table_page_bag_key, 1) + 1)
+
+    @staticmethod
+    def lazy_table_prev_func(page : Page, fetch_page : Callable[[Optional[str]], PageResult], table_data_bag_key : str, table_page_bag_key : str, table_tokens_bag_key : str):
+        """Re-fetch the previous page from the token it was first fetched with."""
+        tokens : list = page.bag_get(table_tokens_bag_key, [None])
+
+        if len(tokens) <= 1:
+            return
+
+        result = fetch_page(tokens[-2])
+
+        tokens.pop()
+        page.bag_set(table_data_bag_key, result)
+        page.bag_set(table_page_bag_key, page.bag_get(table_page_bag_key, 1) - 1)
@@ -511,13 +511,11 @@ class GuestPanel:
         
         def refresh_books_table():
             start_row = (page.bag_get("table_page", 1) - 1) * 10
-            end_row = (page.bag_get("table_page", 1) * 10)
-            end_row = min(len(page.bag_get('fetch')), end_row)
         
             table_content : List[List[Element]] = [
                 page.bag_get('table_header')
             ]
-            for row in page.bag_get('fetch')[start_row:end_row]:
+            for row in page.bag_get('fetch').rows:
                 table_row = [
                     Text(ConsoleExtension.short_text(row.title, 30),halign='c'),
                     Text(ConsoleExtension.short_text(row.publisher, 20),halign='c'),
@@ -540,13 +538,15 @@ class GuestPanel:
             prev_button.position.top = books_table.position.bottom + 1
 
 
+        def fetch_books_page(page_token):
+            return self.service_provider.book_search_page(book_name_input_box.content, page_token, 10)
+
         def search():
             try:
-                page.bag_set('fetch', self.service_provider.book_search(book_name_input_box.content))
+                PageHelper.lazy_table_first_func(page, fetch_books_page, 'fetch', 'table_page', 'page_tokens')
             except ReachedToRequestLimitError:
                 return self.get_request_limited_page()
                 
-            page.bag_set('table_page', 1)
             cur_page.content = f'صفحه {page.bag_get("table_page", 1)}'
             refresh_books_table()
         search_button.click_func = search
@@ -556,13 +556,19 @@ class GuestPanel:
         advance_search_button.click_func = advance_search
 
         def next():
-            PageHelper.table_next_func(page, 'fetch', 'table_page', 10)
+            try:
+                PageHelper.lazy_table_next_func(page, fetch_books_page, 'fetch', 'table_page', 'page_tokens')
+            except ReachedToRequestLimitError:
+                return self.get_request_limited_page()
             cur_page.content = f'صفحه {page.bag_get("table_page", 1)}'
             refresh_books_table()
         next_button.click_func = next
 
         def prev():
-            PageHelper.table_prev_func(page, 'fetch', 'table_page', 10)
+            try:
+                PageHelper.lazy_table_prev_func(page, fetch_books_page, 'fetch', 'table_page', 'page_tokens')
+            except ReachedToRequestLimitError:
+                return self.get_request_limited_page()
             cur_page.content = f'صفحه {page.bag_get("table_page", 1)}'
             refresh_books_table()   
         prev_button.click_func = prev
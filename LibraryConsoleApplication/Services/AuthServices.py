@@ -1,10 +1,12 @@
 from Core.JWT import JWTManager
+from DataAccess.Decorators import transactional
 from DataAccess.GuestRepository import GuestRepository
 from DataAccess.MemberRepository import MemberRepository
 from DataAccess.UserRepository import UserRepository
 from Exceptions.Exceptions import AuthenticationError
 from Models.Models import MemberModel, PlainUserModel, UserType, UserWithoutPasswordViewModel
 from Services.LoginResultModel import LoginResult
+from Services.TokenCache import revoke_token
 
 
 class AuthServices:
@@ -20,6 +22,10 @@ class AuthServices:
 
         return LoginResult(token, user)
     
+    @classmethod
+    def logout(cls, token: str) -> None:
+        revoke_token(token)
+    
     @classmethod
     def login_as_guest(cls) -> str:
         guest = GuestRepository.add()
@@ -38,6 +44,7 @@ class AuthServices:
         return token
     
     @classmethod
+    @transactional
     def signup(cls, plain_user: PlainUserModel, member_model: MemberModel) -> LoginResult:
         member = MemberRepository.add(plain_user, member_model)
         return cls.login(plain_user)
\ No newline at end of file
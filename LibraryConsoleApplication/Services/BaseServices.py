@@ -1,27 +1,21 @@
 ﻿from abc import ABC
-from uuid import UUID
 from typing import Optional
-from Core.JWT import JWTManager
+from Exceptions.Exceptions import InvalidPageTokenError
+from Services.CatalogueIndex import catalogue_index
 from Services.Decorators import token_required
+from Services.TokenCache import token_cache
 from DataAccess.BookRepository import BookRepository
-from Models.Models import UserWithoutPasswordViewModel
 from DataAccess.AuthorRepository import AuthorRepository
 from DataAccess.CategoryRepository import CategoryRepository
 from DataAccess.PublisherRepository import PublisherRepository
-from Models.Models import UNSET, AuthorViewModel, BookViewModel, CategoryModel, CategoryViewModel, PublisherViewModel
+from Models.Models import UNSET, AuthorViewModel, BookViewModel, CategoryModel, CategoryViewModel, PageResult, PublisherViewModel
 
 
 class BaseServices(ABC):
     
     def __init__(self, token):
         self.token = token
-        jwt_manager = JWTManager()
-        payload = jwt_manager.decode_token(self.token)
-        try:
-            payload["id"] = UUID(payload["id"])
-        except:
-            pass
-        self.user_model = UserWithoutPasswordViewModel(payload['id'], payload['username'], payload['name'], payload['user_type'])
+        _, self.user_model = token_cache().authenticate(self.token)
         
 
     def my_info(self):
@@ -61,8 +55,9 @@ class BaseServices(ABC):
         categories: Optional[list[str]] = None,
         just_available: bool = False
     ):
-        if categories is None:
-            categories = []
+        index = catalogue_index()
+        if index is not None:
+            return index.search(title, publisher, author, categories, just_available, BookRepository.return_limit)
 
         if title == '':
             title = UNSET
@@ -73,39 +68,47 @@ class BaseServices(ABC):
         if author == '':
             author = UNSET
 
-        result = []
-            
-        if not categories:
-            book_model = BookViewModel(
-                title = title,
-                publisher = publisher,
-                author = author
-            )
-            result = BookRepository.view_many(book_model)
-        
-        else:
-            for category in categories:
-                book_model = BookViewModel(
-                    title = title,
-                    publisher = publisher,
-                    author = author,
-                    category = category
-                )
-                result += BookRepository.view_many(book_model)
-                
-            books_dict = {book.id : book for book in result}
-            result = list(books_dict.values())
-
-        if just_available:
-            result = [book for book in result if book.available_copies != 0]
-            
-        return result
+        book_model = BookViewModel(
+            title = title,
+            publisher = publisher,
+            author = author
+        )
+        return BookRepository.advance_search(book_model, categories, just_available).rows
     
     def book_search(self, title : str = ''):
+        index = catalogue_index()
+        if index is not None:
+            return index.search(title, limit = BookRepository.return_limit)
+
+        if title == '':
+            title = UNSET
+        book_model = BookViewModel(title = title)
+        return BookRepository.advance_search(book_model).rows
+
+    def book_search_page(self, title : str = '', page_token : Optional[str] = None, page_size : int = 10) -> PageResult:
+        if title.strip() and BookRepository.full_text_search_enabled():
+            return self._full_text_search_page(title, page_token, page_size)
+
         if title == '':
             title = UNSET
         book_model = BookViewModel(title = title)
-        return BookRepository.view_many(book_model)
+        return BookRepository.advance_search(book_model, page_size = page_size, page_token = page_token)
+
+    def book_full_text_search_page(self, query : str, page_token : Optional[str] = None, page_size : int = 10) -> PageResult:
+        return self._full_text_search_page(query, page_token, page_size)
+
+    def _full_text_search_page(self, query : str, page_token : Optional[str], page_size : int) -> PageResult:
+        # Results are ranked, not keyed, so the token is the offset of the next page.
+        if page_token is None:
+            offset = 0
+        elif page_token.isdigit():
+            offset = int(page_token)
+        else:
+            raise InvalidPageTokenError('malformed page token')
+
+        books = BookRepository.full_text_search(query, page_size + 1, offset)
+        next_token = str(offset + page_size) if len(books) > page_size else None
+        return PageResult(books[:page_size], next_token)
     
     def about_us(self):
         # بعدا یه جدول در دیتابیس مختص داده های این مدلی درست میکنم که از دیتا بیس اطلاعات برگردونده شه
@@ -0,0 +1,268 @@
+import bisect
+import itertools
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Iterable, Optional
+from Core.TextNormalizer import TextNormalizer
+from DataAccess.BookRepository import BookRepository
+from Models.Models import BookViewModel
+
+
+# Separator used by `string_agg` in BookView.
+_NAME_SEPARATOR = ' ،'
+
+
+class CatalogueIndex:
+    """
+    In-process search index over `BookView`.
+
+    All rows are loaded once; after that the index polls `BookRepository.catalogue_changes`
+    and applies only the books changed since the last poll. Title, publisher, author and
+    category text is folded with `TextNormalizer` and indexed by word, so a search costs a
+    few dictionary lookups and set intersections instead of a database round trip.
+
+    Matching is by word prefix: every word of a filter must start a word of the field
+    (`هری پات` finds `هری پاتر`). Unlike the `LIKE '%x%'` filters of `BookRepository`, text
+    inside a word (`پاتر` for `هریپاتر`) is not found. Categories match by exact name.
+
+    Attributes:
+        refresh_seconds (float): Minimum time between two change polls.
+        overlap_seconds (float): How far before the last seen change each poll starts again,
+            to catch transactions that committed late.
+    """
+
+    FIELDS = ('title', 'publisher', 'author', 'category')
+
+    def __init__(self, refresh_seconds: float = 5.0, overlap_seconds: float = 5.0):
+        self.refresh_seconds = refresh_seconds
+        self.overlap_seconds = overlap_seconds
+        self._books : dict[int, BookViewModel] = {}
+        self._words : dict[str, dict[str, set[int]]] = {field: {} for field in self.FIELDS}
+        self._sorted_words : dict[str, Optional[list[str]]] = {field: None for field in self.FIELDS}
+        self._categories : dict[str, set[int]] = {}
+        self._available : set[int] = set()
+        self._sorted_ids : Optional[list[int]] = None
+        self._watermark : Optional[datetime] = None
+        self._checked_at : Optional[float] = None
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._books)
+
+    # Loading
+
+    def load(self, books: Iterable[BookViewModel]) -> None:
+        """Replaces the whole content of the index."""
+        with self._lock:
+            self._books.clear()
+            self._categories.clear()
+            self._available.clear()
+            for field in self.FIELDS:
+                self._words[field].clear()
+                self._sorted_words[field] = None
+            self._sorted_ids = None
+
+            for book in books:
+                self._add(book)
+
+    def apply(self, books: Iterable[BookViewModel], removed: Iterable[int] = ()) -> None:
+        """Adds or replaces `books` and drops the books with the `removed` IDs."""
+        with self._lock:
+            for book in books:
+                self._remove(book.id)
+                self._add(book)
+            for book_id in removed:
+                self._remove(book_id)
+
+    def refresh(self) -> None:
+        """
+        Polls the database: loads every book on the first call, only the changes afterwards.
+        """
+        with self._refresh_lock:
+            since = None if self._watermark is None else self._watermark - timedelta(seconds=self.overlap_seconds)
+            books, removed, latest = BookRepository.catalogue_changes(since)
+
+            if since is None:
+                self.load(books)
+            else:
+                self.apply(books, removed)
+
+            if latest is not None and (self._watermark is None or latest > self._watermark):
+                self._watermark = latest
+            self._checked_at = time.monotonic()
+
+    def refresh_if_due(self) -> None:
+        """Calls `refresh` if `refresh_seconds` have passed since the last poll and no other thread is polling."""
+        if self._checked_at is not None and time.monotonic() - self._checked_at < self.refresh_seconds:
+            return
+
+        if self._checked_at is not None and self._refresh_lock.locked():
+            return  # Another thread is polling; serve the current content meanwhile.
+
+        self.refresh()
+
+    def _add(self, book: BookViewModel) -> None:
+        self._books[book.id] = book
+        if self._sorted_ids is not None:
+            bisect.insort(self._sorted_ids, book.id)
+        if book.available_copies:
+            self._available.add(book.id)
+
+        for field in self.FIELDS:
+            words = self._words[field]
+            for word in TextNormalizer.tokens(getattr(book, field) or ''):
+                ids = words.get(word)
+                if ids is None:
+                    words[word] = ids = set()
+                    if self._sorted_words[field] is not None:
+                        bisect.insort(self._sorted_words[field], word)
+                ids.add(book.id)
+
+        for name in self._names(book.category):
+            self._categories.setdefault(name, set()).add(book.id)
+
+    def _remove(self, book_id: int) -> None:
+        book = self._books.pop(book_id, None)
+        if book is None:
+            return
+        if self._sorted_ids is not None:
+            del self._sorted_ids[bisect.bisect_left(self._sorted_ids, book_id)]
+        self._available.discard(book_id)
+
+        for field in self.FIELDS:
+            words = self._words[field]
+            for word in TextNormalizer.tokens(getattr(book, field) or ''):
+                ids = words.get(word)
+                if ids is not None:
+                    ids.discard(book_id)
+                    if not ids:
+                        del words[word]
+                        if self._sorted_words[field] is not None:
+                            sorted_words = self._sorted_words[field]
+                            del sorted_words[bisect.bisect_left(sorted_words, word)]
+
+        for name in self._names(book.category):
+            ids = self._categories.get(name)
+            if ids is not None:
+                ids.discard(book_id)
+                if not ids:
+                    del self._categories[name]
+
+    @staticmethod
+    def _names(value: Optional[str]) -> list[str]:
+        return value.split(_NAME_SEPARATOR) if value else []
+
+    # Searching
+
+    def search(
+        self,
+        title: str = '',
+        publisher: str = '',
+        author: str = '',
+        categories: Optional[list[str]] = None,
+        just_available: bool = False,
+        limit: int = 100
+    ) -> list[BookViewModel]:
+        """
+        Finds books the way `BaseServices.book_advance_search` does, from memory.
+
+        Args:
+            title (str): Words that must start words of the title.
+            publisher (str): Words that must start words of the publisher name.
+            author (str): Words that must start words of an author name.
+            categories (Optional[list[str]]): Category names; a book matches if it has any of them.
+            just_available (bool): Only return books with available copies.
+            limit (int): Maximum number of books.
+
+        Returns:
+            list[BookViewModel]: Matching books ordered by ID.
+        """
+        with self._lock:
+            # Each constraint is a group of ID sets; a book satisfies it if it is in any of them.
+            constraints = []
+
+            for field, text in (('title', title), ('publisher', publisher), ('author', author)):
+                for word in TextNormalizer.tokens(text):
+                    constraints.append(self._ids_with_prefix(field, word))
+
+            if categories:
+                constraints.append([self._categories[name] for name in categories if name in self._categories])
+
+            sizes = [sum(len(ids) for ids in group) for group in constraints]
+            if 0 in sizes:
+                return []
+            constraints = [group for _, group in sorted(zip(sizes, constraints), key=lambda pair: pair[0])]
+
+            # Expected number of matches if the constraints were independent.
+            expected = len(self._books)
+            for size in sizes:
+                expected *= size / len(self._books)
+
+            if not constraints or expected >= limit * 4:
+                # Dense result: walk the ID order and stop at `limit`, without building any set.
+                ordered = self._ordered_ids()
+            else:
+                # Sparse result: only the books of the most selective constraint are candidates.
+                smallest = constraints.pop(0)
+                ordered = sorted(smallest[0] if len(smallest) == 1 else set().union(*smallest))
+
+            if just_available:
+                constraints.append([self._available])
+
+            # `filter` over `set.__contains__` keeps the walk in C for single-set constraints.
+            for group in constraints:
+                if len(group) == 1:
+                    ordered = filter(group[0].__contains__, ordered)
+                else:
+                    ordered = filter(lambda book_id, group=group: any(book_id in ids for ids in group), ordered)
+
+            return [self._books[book_id] for book_id in itertools.islice(ordered, limit)]
+
+    def _ids_with_prefix(self, field: str, prefix: str) -> list[set[int]]:
+        words = self._words[field]
+
+        sorted_words = self._sorted_words[field]
+        if sorted_words is None:
+            sorted_words = self._sorted_words[field] = sorted(words)
+
+        start = bisect.bisect_left(sorted_words, prefix)
+        end = bisect.bisect_left(sorted_words, prefix + '\U0010FFFF', start)
+
+        return [words[word] for word in sorted_words[start:end]]
+
+    def _ordered_ids(self) -> list[int]:
+        if self._sorted_ids is None:
+            self._sorted_ids = sorted(self._books)
+        return self._sorted_ids
+
+
+_index : Optional[CatalogueIndex] = None
+_index_lock = threading.Lock()
+
+
+def catalogue_index() -> Optional[CatalogueIndex]:
+    """
+    Returns the application-wide catalogue index, or None when it is disabled.
+
+    Settings:
+        CATALOGUE_INDEX: `true` to answer book searches from memory (default false).
+        CATALOGUE_INDEX_REFRESH_SECONDS: Minimum time between change polls (default 5).
+
+    Returns:
+        Optional[CatalogueIndex]: The shared index, refreshed if a poll is due.
+    """
+    global _index
+
+    if os.getenv("CATALOGUE_INDEX", "false").lower() not in ("1", "true", "yes"):
+        return None
+
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = CatalogueIndex(float(os.getenv("CATALOGUE_INDEX_REFRESH_SECONDS", "5")))
+
+    _index.refresh_if_due()
+    return _index
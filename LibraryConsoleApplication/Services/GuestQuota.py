@@ -0,0 +1,236 @@
+import atexit
+import logging
+import os
+import threading
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from uuid import UUID
+from zoneinfo import ZoneInfo
+from DataAccess.GuestRepository import GuestRepository
+from Exceptions.Exceptions import NotSuchModelInDataBaseError
+from Models.Models import GuestModel
+
+
+_logger = logging.getLogger(__name__)
+
+
+class GuestQuotaBackend(ABC):
+    """
+    Decides whether a guest may make another request and counts the requests made.
+
+    A guest may make at most `max_requests` requests during the first
+    `life_time_minutes` minutes after it was created.
+
+    Attributes:
+        max_requests (int): Maximum number of requests per guest.
+        life_time_minutes (int): Lifetime of a guest session in minutes.
+    """
+
+    def __init__(self, max_requests: int, life_time_minutes: int):
+        self.max_requests = max_requests
+        self.life_time_minutes = life_time_minutes
+
+    @abstractmethod
+    def can_request(self, guest_id: UUID) -> bool:
+        """
+        Checks whether the guest still has quota, without consuming it.
+
+        Raises:
+            NotSuchModelInDataBaseError: If the guest does not exist.
+        """
+
+    @abstractmethod
+    def consume(self, guest_id: UUID) -> bool:
+        """
+        Counts one request if the guest still has quota.
+
+        Returns:
+            bool: True if the request is allowed (and was counted), False otherwise.
+
+        Raises:
+            NotSuchModelInDataBaseError: If the guest does not exist.
+        """
+
+    def flush(self) -> None:
+        """Writes pending request counts to the database. No-op for backends without pending state."""
+
+    def close(self) -> None:
+        """Flushes pending state and stops background work."""
+        self.flush()
+
+
+class DatabaseGuestQuota(GuestQuotaBackend):
+    """
+    Strict backend: every check and every request goes to the `Guest` table.
+
+    Exact across processes, at the cost of one statement per guarded call.
+    """
+
+    def can_request(self, guest_id: UUID) -> bool:
+        model = GuestModel(id = guest_id)
+        guest = GuestRepository.get_one(model)
+
+        if guest is None:
+            raise NotSuchModelInDataBaseError('can not find guest', model)
+
+        now = datetime.now(ZoneInfo("Asia/Tehran"))
+        delta_minutes = (now - guest.created_time).total_seconds() / 60
+
+        return guest.request_count < self.max_requests and delta_minutes < self.life_time_minutes
+
+    def consume(self, guest_id: UUID) -> bool:
+        guest = GuestRepository.consume_request(
+            GuestModel(id = guest_id),
+            self.max_requests,
+            self.life_time_minutes
+        )
+        return guest is not None
+
+
+@dataclass
+class _GuestUsage:
+    expires_at: datetime
+    request_count: int
+    pending: int = 0
+
+
+class InMemoryGuestQuota(GuestQuotaBackend):
+    """
+    In-process backend with write-behind persistence.
+
+    A guest's row is read once per process; after that, checks and counts are served
+    from memory. Counts are written back to `Guest.request_count` in one batched
+    statement every `flush_interval` seconds (and at interpreter exit). Guests are
+    dropped from memory once their lifetime is over.
+
+    Counts are per process, so with several application processes a guest may get up
+    to `max_requests` per process between flushes. Use `DatabaseGuestQuota` where the
+    limit must be exact.
+
+    Attributes:
+        flush_interval (float): Seconds between background flushes.
+    """
+
+    def __init__(self, max_requests: int, life_time_minutes: int, flush_interval: float = 5.0):
+        super().__init__(max_requests, life_time_minutes)
+        self.flush_interval = flush_interval
+        self._usage : dict[UUID, _GuestUsage] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._flush_loop, name="guest-quota-flush", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def _load(self, guest_id: UUID) -> _GuestUsage:
+        """Returns the in-memory usage of a guest, reading it from the database on first use."""
+        usage = self._usage.get(guest_id)
+        if usage is not None:
+            return usage
+
+        model = GuestModel(id = guest_id)
+        guest = GuestRepository.get_one(model)
+
+        if guest is None:
+            raise NotSuchModelInDataBaseError('can not find guest', model)
+
+        with self._lock:
+            usage = self._usage.get(guest_id)
+            if usage is None:
+                usage = _GuestUsage(
+                    expires_at=guest.created_time + timedelta(minutes=self.life_time_minutes),
+                    request_count=guest.request_count
+                )
+                self._usage[guest_id] = usage
+        return usage
+
+    def _allowed(self, usage: _GuestUsage) -> bool:
+        return usage.request_count < self.max_requests and datetime.now(ZoneInfo("Asia/Tehran")) < usage.expires_at
+
+    def can_request(self, guest_id: UUID) -> bool:
+        usage = self._load(guest_id)
+        with self._lock:
+            return self._allowed(usage)
+
+    def consume(self, guest_id: UUID) -> bool:
+        usage = self._load(guest_id)
+        with self._lock:
+            if not self._allowed(usage):
+                return False
+            usage.request_count += 1
+            usage.pending += 1
+            return True
+
+    def flush(self) -> None:
+        with self._flush_lock:
+            now = datetime.now(ZoneInfo("Asia/Tehran"))
+            with self._lock:
+                counts = {guest_id: usage.pending for guest_id, usage in self._usage.items() if usage.pending}
+                for usage in self._usage.values():
+                    usage.pending = 0
+
+            try:
+                GuestRepository.add_request_counts(counts)
+            except Exception:
+                with self._lock:
+                    for guest_id, count in counts.items():
+                        usage = self._usage.get(guest_id)
+                        if usage is not None:
+                            usage.pending += count
+                raise
+
+            with self._lock:
+                expired = [
+                    guest_id for guest_id, usage in self._usage.items()
+                    if usage.expires_at <= now and not usage.pending
+                ]
+                for guest_id in expired:
+                    del self._usage[guest_id]
+
+    def _flush_loop(self) -> None:
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception:
+                # The database may be briefly unavailable; pending counts are kept for the next run.
+                pass
+
+    def close(self) -> None:
+        """Stops the write-behind thread and makes a last flush; runs at interpreter exit too."""
+        self._stop.set()
+        try:
+            self.flush()
+        except Exception:
+            # Shutting down while the database is unavailable must not fail; the counts are lost.
+            _logger.exception("could not flush pending guest request counts")
+
+
+def create_guest_quota(max_requests: int, life_time_minutes: int) -> GuestQuotaBackend:
+    """
+    Builds the quota backend selected by the `.env` settings.
+
+    Settings:
+        GUEST_QUOTA_BACKEND: `database` (default, strict) or `memory`.
+        GUEST_QUOTA_FLUSH_SECONDS: Write-behind interval of the memory backend (default 5).
+
+    Args:
+        max_requests (int): Maximum number of requests per guest.
+        life_time_minutes (int): Lifetime of a guest session in minutes.
+
+    Returns:
+        GuestQuotaBackend: The configured backend.
+
+    Raises:
+        ValueError: If `GUEST_QUOTA_BACKEND` names an unknown backend.
+    """
+    backend = os.getenv("GUEST_QUOTA_BACKEND", "database").lower()
+
+    if backend == "database":
+        return DatabaseGuestQuota(max_requests, life_time_minutes)
+
+    if backend == "memory":
+        flush_interval = float(os.getenv("GUEST_QUOTA_FLUSH_SECONDS", "5"))
+        return InMemoryGuestQuota(max_requests, life_time_minutes, flush_interval)
+
+    raise ValueError(f"unknown GUEST_QUOTA_BACKEND: {backend}")
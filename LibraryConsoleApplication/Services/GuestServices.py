@@ -1,12 +1,12 @@
 ﻿
 import os
+import threading
 from pathlib import Path
 from typing import Optional
-from datetime import datetime
-from zoneinfo import ZoneInfo
 from dotenv import load_dotenv
 from Models.Models import GuestModel
 from Services.BaseServices import BaseServices
+from Services.GuestQuota import GuestQuotaBackend, create_guest_quota
 from Services.Decorators import guest_request_limit, token_required
 from DataAccess.GuestRepository import GuestRepository
 from Exceptions.Exceptions import InappropriateRoleError, NotSuchModelInDataBaseError, ReachedToRequestLimitError
@@ -17,6 +17,8 @@ class GuestServices(BaseServices):
     __life_time_minute : int
     __max_available_request : int
     __env_loaded = False
+    __quota : Optional[GuestQuotaBackend] = None
+    __quota_lock = threading.Lock()
 
     def __init__(self, token):
         super().__init__(token)
@@ -31,27 +33,28 @@ class GuestServices(BaseServices):
             GuestServices.__max_available_request = int(os.getenv("MAX_AVAILABLE_REQUEST"))
             GuestServices.__env_loaded = True
 
+        if GuestServices.__quota is None:
+            with GuestServices.__quota_lock:
+                if GuestServices.__quota is None:
+                    GuestServices.__quota = create_guest_quota(
+                        GuestServices.__max_available_request,
+                        GuestServices.__life_time_minute
+                    )
+
+    @classmethod
+    def quota(cls) -> Optional[GuestQuotaBackend]:
+        return cls.__quota
 
     def can_guest_request(self) -> bool:
-        
-        model = GuestModel(id = self.user_model.id)
-        guest = GuestRepository.get_one(model)
-    
-        if guest is None:
-            raise NotSuchModelInDataBaseError('can not find guest', model)
-    
-        now = datetime.now(ZoneInfo("Asia/Tehran"))
-        delta_minutes = (now - guest.created_time).total_seconds() / 60
-            
-        if (guest.request_count >= GuestServices.__max_available_request) or (delta_minutes >= GuestServices.__life_time_minute):
-            return False
-        
-        return True
+        return GuestServices.__quota.can_request(self.user_model.id)
     
     def increase_guest_request(self):
         model = GuestModel(id = self.user_model.id)
         GuestRepository.increase_request(model)
 
+    def consume_guest_request(self) -> bool:
+        return GuestServices.__quota.consume(self.user_model.id)
+
     @token_required
     def get_guest_model(self):
         model = GuestModel(id = self.user_model.id)
@@ -109,4 +112,14 @@ class GuestServices(BaseServices):
     def book_search(self, title : str = ''):
         return super().book_search(title)
 
+    @guest_request_limit
+    @token_required
+    def book_search_page(self, title : str = '', page_token : Optional[str] = None, page_size : int = 10):
+        return super().book_search_page(title, page_token, page_size)
+
+    @guest_request_limit
+    @token_required
+    def book_full_text_search_page(self, query : str, page_token : Optional[str] = None, page_size : int = 10):
+        return super().book_full_text_search_page(query, page_token, page_size)
+
     
\ No newline at end of file
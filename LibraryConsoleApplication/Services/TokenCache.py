@@ -0,0 +1,121 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+from uuid import UUID
+import jwt
+from Core.JWT import JWTManager
+from Models.Models import UserWithoutPasswordViewModel
+
+
+class TokenCache:
+    """
+    Remembers verified JWTs so services authenticate a repeated token with a dictionary lookup.
+
+    The first `authenticate` of a token verifies it with `JWTManager.decode_token` and builds
+    its user model; later calls return the same claims and model until the token's `exp`.
+    Tokens passed to `revoke` are refused until they would have expired anyway.
+
+    Attributes:
+        max_size (int): Number of tokens kept; the least recently used one is evicted first.
+    """
+
+    def __init__(self, max_size: int = 1024):
+        self.max_size = max_size
+        self._verified : OrderedDict[str, tuple[float, dict, UserWithoutPasswordViewModel]] = OrderedDict()
+        self._revoked : dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def authenticate(self, token: str) -> tuple[dict, UserWithoutPasswordViewModel]:
+        """
+        Returns the claims and user of a valid token.
+
+        Args:
+            token (str): Encoded JWT.
+
+        Returns:
+            tuple[dict, UserWithoutPasswordViewModel]: Decoded claims (with `id` parsed to a UUID
+                for guests) and the user they describe. Both are shared; do not modify them.
+
+        Raises:
+            ValueError: If the token is expired, revoked or invalid.
+        """
+        now = time.time()
+
+        with self._lock:
+            entry = self._verified.get(token)
+            if entry is not None:
+                if entry[0] > now:
+                    self._verified.move_to_end(token)
+                    return entry[1], entry[2]
+                del self._verified[token]
+
+            if token in self._revoked:
+                raise ValueError("Token revoked.")
+
+        payload = JWTManager().decode_token(token)
+        try:
+            payload["id"] = UUID(payload["id"])
+        except:
+            pass
+        user_model = UserWithoutPasswordViewModel(payload['id'], payload['username'], payload['name'], payload['user_type'])
+
+        expires_at = payload.get("exp")
+        if expires_at is not None:
+            with self._lock:
+                if token not in self._revoked:
+                    self._verified[token] = (expires_at, payload, user_model)
+                    while len(self._verified) > self.max_size:
+                        self._verified.popitem(last=False)
+
+        return payload, user_model
+
+    def revoke(self, token: str) -> None:
+        """
+        Refuses `token` from now on, e.g. after logout or when a user is deactivated.
+
+        Revocations are kept in memory until the token's `exp` and only apply to this process.
+
+        Args:
+            token (str): Encoded JWT.
+        """
+        try:
+            expires_at = jwt.decode(token, options={"verify_signature": False}).get("exp", float("inf"))
+        except jwt.InvalidTokenError:
+            return
+
+        now = time.time()
+        with self._lock:
+            self._verified.pop(token, None)
+            self._revoked = {revoked: until for revoked, until in self._revoked.items() if until > now}
+            self._revoked[token] = expires_at
+
+
+_cache : Optional[TokenCache] = None
+_cache_lock = threading.Lock()
+
+
+def token_cache() -> TokenCache:
+    """
+    Returns the application-wide token cache.
+
+    Settings:
+        JWT_CACHE_SIZE: Number of verified tokens kept (default 1024).
+
+    Returns:
+        TokenCache: The shared cache.
+    """
+    global _cache
+
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                JWTManager()  # loads .env
+                _cache = TokenCache(int(os.getenv("JWT_CACHE_SIZE", "1024")))
+    return _cache
+
+
+def revoke_token(token: str) -> None:
+    """Revokes `token` in the application-wide cache; see `TokenCache.revoke`."""
+    token_cache().revoke(token)
@@ -0,0 +1,158 @@
+import unittest
+from Core.TextNormalizer import TextNormalizer
+from DataAccess.AuthorRepository import AuthorRepository
+from DataAccess.BookAuthorRepository import BookAuthorRepository
+from DataAccess.BookCategoryRepository import BookCategoryRepository
+from DataAccess.BookRepository import BookRepository
+from DataAccess.CategoryRepository import CategoryRepository
+from DataAccess.PublisherRepository import PublisherRepository
+from Models.Models import AuthorModel, BookAuthorModel, BookCategoryModel, BookModel, BookViewModel, CategoryModel, PublisherModel
+
+
+class TestBookRepository(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.cursor = BookRepository._get_cursor()
+        # Fixtures are never committed, so they only show up in the live view.
+        BookRepository.use_materialized_view = False
+
+        publisher = PublisherRepository.add(PublisherModel(name = 'ناشر آزمایشی'), self.cursor)
+        author = AuthorRepository.add(AuthorModel(name = 'نویسنده آزمایشی'), self.cursor)
+        categories = {
+            name : CategoryRepository.add(CategoryModel(name = name), self.cursor)
+            for name in ('رمان آزمایشی', 'حماسی آزمایشی', 'تاریخی آزمایشی')
+        }
+
+        # title -> (categories, available copies)
+        books = {
+            'کتاب یک': (['رمان آزمایشی'], 1),
+            'کتاب دو': (['رمان آزمایشی', 'حماسی آزمایشی'], 0),
+            'کتاب سه': (['حماسی آزمایشی'], 2),
+            'کتاب چهار': (['تاریخی آزمایشی'], 1),
+        }
+        self.books = {}
+        for title, (book_categories, available) in books.items():
+            book = BookRepository.add(
+                BookModel(title = title, publisher_id = publisher.id, total_copies = 2, available_copies = available),
+                self.cursor
+            )
+            BookAuthorRepository.add(BookAuthorModel(book_id = book.id, author_id = author.id), self.cursor)
+            for name in book_categories:
+                BookCategoryRepository.add(BookCategoryModel(book_id = book.id, category_id = categories[name].id), self.cursor)
+            self.books[title] = book.id
+
+    def tearDown(self) -> None:
+        BookRepository.use_materialized_view = None
+        self.cursor.connection.rollback()
+        self.cursor.connection.close()
+
+    # ─────────────────────────────── Tests ───────────────────────────────
+
+    def test_advance_search_categories(self):
+        model = BookViewModel(publisher = 'ناشر آزمایشی')
+
+        result = BookRepository.advance_search(model, ['رمان آزمایشی', 'حماسی آزمایشی'], cursor = self.cursor)
+        self.assertEqual(
+            [book.id for book in result.rows],
+            sorted(self.books[title] for title in ('کتاب یک', 'کتاب دو', 'کتاب سه'))
+        )
+        self.assertIsNone(result.next_token)
+
+        result = BookRepository.advance_search(model, [], cursor = self.cursor)
+        self.assertEqual(len(result.rows), 4)
+
+    def test_advance_search_just_available(self):
+        model = BookViewModel(publisher = 'ناشر آزمایشی')
+
+        result = BookRepository.advance_search(model, ['رمان آزمایشی', 'حماسی آزمایشی'], just_available = True, cursor = self.cursor)
+        self.assertEqual({book.id for book in result.rows}, {self.books['کتاب یک'], self.books['کتاب سه']})
+        self.assertTrue(all(book.available_copies > 0 for book in result.rows))
+
+    def test_advance_search_pagination(self):
+        model = BookViewModel(publisher = 'ناشر آزمایشی')
+        categories = ['رمان آزمایشی', 'حماسی آزمایشی', 'تاریخی آزمایشی']
+
+        first = BookRepository.advance_search(model, categories, page_size = 3, cursor = self.cursor)
+        self.assertEqual(len(first.rows), 3)
+        self.assertIsNotNone(first.next_token)
+
+        second = BookRepository.advance_search(model, categories, page_size = 3, page_token = first.next_token, cursor = self.cursor)
+        self.assertEqual([book.id for book in second.rows], [self.books['کتاب چهار']])
+        self.assertIsNone(second.next_token)
+
+    def test_catalogue_changes(self):
+        books, removed, watermark = BookRepository.catalogue_changes(cursor = self.cursor)
+        self.assertTrue(set(self.books.values()) <= {book.id for book in books})
+
+        BookRepository.take_copy(self.books['کتاب یک'], self.cursor)
+        BookCategoryRepository.remove(BookCategoryModel(book_id = self.books['کتاب چهار']), cursor = self.cursor)
+
+        books, removed, latest = BookRepository.catalogue_changes(watermark, self.cursor)
+        self.assertEqual([(book.id, book.available_copies) for book in books], [(self.books['کتاب یک'], 0)])
+        self.assertEqual(removed, [self.books['کتاب چهار']])
+        self.assertGreater(latest, watermark)
+
+    def test_indexed_search_matches_view(self):
+        cases = [
+            (BookViewModel(publisher = 'ناشر آزمایشی'), ['رمان آزمایشی', 'حماسی آزمایشی'], False),
+            (BookViewModel(publisher = 'ناشر آزمایشی'), ['رمان آزمایشی', 'حماسی آزمایشی'], True),
+            (BookViewModel(title = 'کتاب', author = 'نویسنده آزمایشی'), None, False),
+            (BookViewModel(title = 'چهار', category = 'تاریخی'), None, False),
+            (BookViewModel(id = self.books['کتاب دو']), None, False),
+        ]
+
+        try:
+            for model, categories, just_available in cases:
+                BookRepository.search_mode = 'view'
+                expected = BookRepository.advance_search(model, categories, just_available, cursor = self.cursor)
+                BookRepository.search_mode = 'indexed'
+                result = BookRepository.advance_search(model, categories, just_available, cursor = self.cursor)
+                self.assertEqual(result, expected)
+
+            first = BookRepository.advance_search(BookViewModel(publisher = 'ناشر آزمایشی'), page_size = 3, cursor = self.cursor)
+            BookRepository.search_mode = 'view'
+            second = BookRepository.advance_search(BookViewModel(publisher = 'ناشر آزمایشی'), page_size = 3, page_token = first.next_token, cursor = self.cursor)
+            self.assertEqual([book.id for book in second.rows], [self.books['کتاب چهار']])
+        finally:
+            BookRepository.search_mode = None
+
+    def test_full_text_search(self):
+        result = BookRepository.full_text_search('كتاب يك', cursor = self.cursor)
+        self.assertEqual([book.id for book in result], [self.books['کتاب یک']])
+
+        # Every word must match the start of a word; author and category names count too.
+        result = BookRepository.full_text_search('نویسنده آزمایش حماس', cursor = self.cursor)
+        self.assertEqual({book.id for book in result}, {self.books['کتاب دو'], self.books['کتاب سه']})
+
+        # Title matches rank above category matches.
+        BookRepository.update(BookModel(id = self.books['کتاب چهار'], title = 'تاریخی کتاب چهار'), self.cursor)
+        result = BookRepository.full_text_search('تاریخی', cursor = self.cursor)
+        self.assertEqual(result[0].id, self.books['کتاب چهار'])
+
+        result = BookRepository.full_text_search('کتاب', limit = 2, offset = 1, cursor = self.cursor)
+        self.assertEqual(len(result), 2)
+        self.assertEqual(BookRepository.full_text_search(' ، ', cursor = self.cursor), [])
+
+    def test_full_text_search_mode(self):
+        model = BookViewModel(publisher = 'ناشر آزمایشی')
+        try:
+            BookRepository.search_mode = 'view'
+            self.assertFalse(BookRepository.full_text_search_enabled())
+            expected = BookRepository.advance_search(model, cursor = self.cursor)
+
+            # Structured filters are unaffected by the fts mode.
+            BookRepository.search_mode = 'fts'
+            self.assertTrue(BookRepository.full_text_search_enabled())
+            self.assertEqual(BookRepository.advance_search(model, cursor = self.cursor), expected)
+        finally:
+            BookRepository.search_mode = None
+
+    def test_normalizer_matches_database(self):
+        samples = ['كتاب‌هاي عربي', 'مدرسة آسمان', 'کِتابـــ ۱۲ ٣', 'Harry POTTER']
+        for sample in samples:
+            self.cursor.execute("SELECT lca_normalize(%s)", (sample,))
+            self.assertEqual(self.cursor.fetchone()[0], TextNormalizer.normalize(sample))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+from DataAccess.BookRepository import BookRepository
+from DataAccess.BorrowingRepository import BorrowingRepository
+from DataAccess.MemberRepository import MemberRepository
+from DataAccess.PublisherRepository import PublisherRepository
+from Exceptions.Exceptions import AlreadyReturnedBookError, BookOutOfStockError, MultipleRowsReturnedError, NotSuchModelInDataBaseError
+from Models.Models import BookModel, BorrowingModel, MemberModel, PublisherModel
+
+
+class TestBorrowingRepository(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.cursor = BorrowingRepository._get_cursor()
+
+        publisher = PublisherRepository.add(PublisherModel(name = 'ناشر آزمایشی'), self.cursor)
+        self.book = BookRepository.add(
+            BookModel(title = 'کتاب آزمایشی', publisher_id = publisher.id, total_copies = 1, available_copies = 1),
+            self.cursor
+        )
+        self.member = MemberRepository.get_many(MemberModel(), self.cursor)[0]
+
+    def tearDown(self) -> None:
+        self.cursor.connection.rollback()
+        self.cursor.connection.close()
+
+    # ─────────────────────────────── Tests ───────────────────────────────
+
+    def test_borrow_and_return(self):
+        borrowing = BorrowingRepository.add(BorrowingModel(member_id = self.member.id, book_id = self.book.id), self.cursor)
+        self.assertFalse(borrowing.returned)
+        self.assertEqual(BookRepository.get_one(BookModel(id = self.book.id), self.cursor).available_copies, 0)
+
+        with self.assertRaises(BookOutOfStockError):
+            BorrowingRepository.add(BorrowingModel(member_id = self.member.id, book_id = self.book.id), self.cursor)
+
+        BorrowingRepository.return_book(BorrowingModel(id = borrowing.id), self.cursor)
+        self.assertEqual(BookRepository.get_one(BookModel(id = self.book.id), self.cursor).available_copies, 1)
+
+        returned = BorrowingRepository.get_one(BorrowingModel(id = borrowing.id), self.cursor)
+        self.assertTrue(returned.returned)
+        self.assertIsNotNone(returned.end_date)
+
+        with self.assertRaises(AlreadyReturnedBookError):
+            BorrowingRepository.return_book(BorrowingModel(id = borrowing.id), self.cursor)
+        self.assertEqual(BookRepository.get_one(BookModel(id = self.book.id), self.cursor).available_copies, 1)
+
+    def test_missing_records(self):
+        with self.assertRaises(NotSuchModelInDataBaseError):
+            BorrowingRepository.add(BorrowingModel(member_id = self.member.id, book_id = -1), self.cursor)
+
+        with self.assertRaises(NotSuchModelInDataBaseError):
+            BorrowingRepository.return_book(BorrowingModel(id = -1), self.cursor)
+
+    def test_return_book_with_ambiguous_model_changes_nothing(self):
+        BookRepository.update(BookModel(id = self.book.id, total_copies = 2, available_copies = 2), self.cursor)
+        first = BorrowingRepository.add(BorrowingModel(member_id = self.member.id, book_id = self.book.id), self.cursor)
+        second = BorrowingRepository.add(BorrowingModel(member_id = self.member.id, book_id = self.book.id), self.cursor)
+
+        with self.assertRaises(MultipleRowsReturnedError):
+            BorrowingRepository.return_book(BorrowingModel(member_id = self.member.id, book_id = self.book.id), self.cursor)
+
+        for borrowing in (first, second):
+            self.assertFalse(BorrowingRepository.get_one(BorrowingModel(id = borrowing.id), self.cursor).returned)
+        self.assertEqual(BookRepository.get_one(BookModel(id = self.book.id), self.cursor).available_copies, 0)
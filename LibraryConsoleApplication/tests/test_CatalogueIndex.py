@@ -0,0 +1,69 @@
+import unittest
+from Models.Models import BookViewModel
+from Services.CatalogueIndex import CatalogueIndex
+
+
+def book(id, title, publisher, author, category, available_copies = 1):
+    return BookViewModel(
+        id = id, title = title, publisher = publisher, author = author,
+        category = category, total_copies = 2, available_copies = available_copies
+    )
+
+
+class TestCatalogueIndex(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.index = CatalogueIndex()
+        self.index.load([
+            book(1, 'شاهنامه', 'نشر قطره', 'فردوسی', 'شعر ،حماسی'),
+            book(2, 'دیوان حافظ', 'نشر قطره', 'حافظ', 'شعر', available_copies = 0),
+            book(3, 'تاريخ ايران باستان', 'امیرکبیر', 'حسن پیرنیا', 'تاریخی'),
+            book(4, 'Python Crash Course', 'No Starch', 'Eric Matthes', 'برنامه نویسی'),
+        ])
+
+    def ids(self, **filters):
+        return [found.id for found in self.index.search(**filters)]
+
+    # ─────────────────────────────── Tests ───────────────────────────────
+
+    def test_search_by_word_prefix(self):
+        self.assertEqual(self.ids(title = 'شاه'), [1])
+        self.assertEqual(self.ids(title = 'دیوان حاف'), [2])
+        self.assertEqual(self.ids(title = 'نامه'), [])
+        self.assertEqual(self.ids(title = 'python course'), [4])
+        self.assertEqual(self.ids(publisher = 'نشر'), [1, 2])
+        self.assertEqual(self.ids(author = 'پیرنیا'), [3])
+
+    def test_search_normalizes_text(self):
+        # The title is stored with Arabic yeh, the query uses Persian yeh.
+        self.assertEqual(self.ids(title = 'تاریخ ایران'), [3])
+
+    def test_search_filters(self):
+        self.assertEqual(self.ids(categories = ['شعر']), [1, 2])
+        self.assertEqual(self.ids(categories = ['حماسی', 'تاریخی']), [1, 3])
+        self.assertEqual(self.ids(categories = ['ناموجود']), [])
+        self.assertEqual(self.ids(categories = ['شعر'], just_available = True), [1])
+        self.assertEqual(self.ids(publisher = 'نشر', categories = ['حماسی']), [1])
+
+    def test_search_limit(self):
+        self.assertEqual(self.ids(), [1, 2, 3, 4])
+        self.assertEqual(self.ids(limit = 2), [1, 2])
+        self.assertEqual(self.ids(just_available = True, limit = 2), [1, 3])
+
+    def test_apply_changes(self):
+        self.index.apply(
+            [book(2, 'دیوان سعدی', 'نشر قطره', 'سعدی', 'شعر'), book(5, 'گلستان', 'نشر قطره', 'سعدی', 'نثر')],
+            removed = [1]
+        )
+
+        self.assertEqual(len(self.index), 4)
+        self.assertEqual(self.ids(title = 'حافظ'), [])
+        self.assertEqual(self.ids(author = 'سعدی'), [2, 5])
+        self.assertEqual(self.ids(title = 'شاهنامه'), [])
+        self.assertEqual(self.ids(categories = ['حماسی']), [])
+        self.assertEqual(self.ids(categories = ['شعر'], just_available = True), [2])
+        self.assertEqual(self.ids(), [2, 3, 4, 5])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,9 +1,16 @@
 ﻿import unittest
 import psycopg2
+from uuid import uuid4
 from DataAccess.BaseRepository import BaseRepository
+from DataAccess.BookAuthorRepository import BookAuthorRepository
+from DataAccess.BookCategoryRepository import BookCategoryRepository
+from DataAccess.BorrowRequestRepository import BorrowRequestRepository
+from DataAccess.BorrowingRepository import BorrowingRepository
+from DataAccess.GuestRepository import GuestRepository
 from DataAccess.TestingRepository import TestingRepository
-from Exceptions.Exceptions import EmptyModelError, MultipleRowsReturnedError
-from Models.Models import TestingViewModel, TestingModel
+from DataAccess.Transaction import current_cursor, transaction
+from Exceptions.Exceptions import EmptyModelError, InvalidPageTokenError, MultipleRowsReturnedError, RepositoryMethodNotAllowedError
+from Models.Models import BookAuthorModel, BookCategoryModel, GuestModel, TestingViewModel, TestingModel, UnsetType
 from Models.Schema import DBTableColumns, DBViewColumns
 
 
@@ -461,3 +468,302 @@ class TestCommonQueries(unittest.TestCase):
         self.assertEqual(len(fetched), 0)
         self.rollback()
 
+
+
+    # ─────────── transaction ────────────
+    def test_transaction_case1(self):
+        """Case 1: Calls without a cursor join the active transaction and roll back with it."""
+        model = TestingModel(name='تراکنش', age=50, description='transaction scope')
+
+        with self.assertRaises(RuntimeError):
+            with transaction() as cursor:
+                added = TestingRepository.add(model)
+                self.assertIs(current_cursor(), cursor)
+                self.assertEqual(TestingRepository.get_one(TestingModel(id=added.id)), added)
+                raise RuntimeError()
+
+        self.assertIsNone(current_cursor())
+        self.assertIsNone(TestingRepository.get_one(model, self.cursor))
+
+    def test_transaction_case2(self):
+        """Case 2: Nested transaction scopes share the outer cursor."""
+        with transaction() as outer:
+            with transaction() as inner:
+                self.assertIs(inner, outer)
+            self.assertIs(current_cursor(), outer)
+            outer.connection.rollback()
+
+
+    # ─────────── prepared statements ────────────
+    def test_prepared_statements_case1(self):
+        """Case 1: Generated statements are prepared once per connection and give the same results."""
+        TestingRepository.use_prepared_statements = True
+        try:
+            connection = self.cursor.connection
+            self.cursor.execute("DEALLOCATE ALL")
+            connection._prepared.clear()
+
+            first = TestingRepository.get_one(TestingModel(name="امید"), self.cursor)
+            second = TestingRepository.get_one(TestingModel(name="Reza"), self.cursor)
+            many = TestingRepository.get_many(TestingModel(description='دانشجو'), self.cursor)
+
+            self.assertEqual(first, TestingModel(id=59, name="امید", age=39, description="مهندس راه و ساختمان"))
+            self.assertEqual(second.id, 3)
+            self.assertEqual(len(many), 6)
+            self.assertEqual(len(connection._prepared), 2)
+        finally:
+            TestingRepository.use_prepared_statements = None
+            self.rollback()
+
+    def test_prepared_statements_case2(self):
+        """Case 2: Least recently used statements are deallocated when the limit is reached."""
+        connection = self.cursor.connection
+        self.cursor.execute("DEALLOCATE ALL")
+        connection._prepared.clear()
+        queries = [f'SELECT id FROM "Testing" WHERE id = %s AND {n} = {n}' for n in range(3)]
+
+        for query in queries:
+            connection.execute_prepared(self.cursor, query, (1,), limit=2)
+
+        self.assertEqual(list(connection._prepared), queries[1:])
+        self.cursor.execute("SELECT count(*) FROM pg_prepared_statements WHERE name = ANY(%s)", (list(connection._prepared.values()),))
+        self.assertEqual(self.cursor.fetchone()[0], 2)
+        self.rollback()
+
+
+    # ─────────── add_many ────────────
+    def test_add_many_case1(self):
+        """Case 1: Add records with different column sets -> returned in input order."""
+        models = [
+            TestingModel(name='سجاد', age=25, description='امنیت شبکه'),
+            TestingModel(age=30),
+            TestingModel(id=10000, name='Tab\tand\nnewline', age=None, description='back\\slash'),
+            TestingModel(name='Nima', age=31, description='DevOps'),
+        ]
+        added = TestingRepository.add_many(models, self.cursor)
+
+        self.assertEqual([model.age for model in added], [25, 30, None, 31])
+        self.assertEqual(added[1].name, 'ناشناس')
+        self.assertNotEqual(added[2].id, 10000)
+        for record in added:
+            self.assertEqual(TestingRepository.get_one(TestingModel(id=record.id), self.cursor), record)
+        self.rollback()
+
+    def test_add_many_case2(self):
+        """Case 2: Large batches go through COPY and keep input order."""
+        TestingRepository.bulk_copy_threshold = 3
+        try:
+            models = [TestingModel(name=f'copy-{n}', age=n, description=None if n % 2 else 'tab\there') for n in range(5)]
+            models.append(TestingModel(name='Tab\tand\nnewline', description='back\\slash'))
+            added = TestingRepository.add_many(models, self.cursor)
+
+            self.assertEqual([record.name for record in added], [model.name for model in models])
+            self.assertEqual([record.description for record in added], [model.description for model in models])
+            self.assertEqual(added[-1].age, None)
+            self.assertEqual(TestingRepository.get_one(TestingModel(id=added[3].id), self.cursor), added[3])
+        finally:
+            TestingRepository.bulk_copy_threshold = BaseRepository.bulk_copy_threshold
+            self.rollback()
+
+    def test_add_many_case3(self):
+        """Case 3: Empty list and empty model."""
+        self.assertEqual(TestingRepository.add_many([], self.cursor), [])
+        with self.assertRaises(EmptyModelError):
+            TestingRepository.add_many([TestingModel(name='Ali'), TestingModel()], self.cursor)
+        self.rollback()
+
+
+    # ─────────── update_many / delete_many ────────────
+    def test_update_many_case1(self):
+        """Case 1: Update several records with different column sets."""
+        TestingRepository.update_many([
+            TestingModel(id=1, age=26),
+            TestingModel(id=2, age=31, description=None),
+            TestingModel(id=3, name='رضا', description='کوهنورد'),
+            TestingModel(id=4),
+        ], self.cursor)
+
+        self.assertEqual(TestingRepository.get_one(TestingModel(id=1), self.cursor), TestingModel(1, 'Ali', 26, 'Student from Tehran'))
+        self.assertEqual(TestingRepository.get_one(TestingModel(id=2), self.cursor), TestingModel(2, 'Sara', 31, None))
+        self.assertEqual(TestingRepository.get_one(TestingModel(id=3), self.cursor), TestingModel(3, 'رضا', 41, 'کوهنورد'))
+        self.assertEqual(TestingRepository.get_one(TestingModel(id=4), self.cursor), TestingModel(4, 'Mina', 22, 'Graphic designer'))
+        self.rollback()
+
+    def test_update_many_case2(self):
+        """Case 2: Excluded fields are ignored and a missing id raises ValueError."""
+        TestingRepository.set_clause_exclude = {DBTableColumns.Testing.ID, DBTableColumns.Testing.NAME}
+        try:
+            TestingRepository.update_many([TestingModel(id=5, name='UpdatedName', age=34)], self.cursor)
+            fetched = TestingRepository.get_one(TestingModel(id=5), self.cursor)
+            self.assertEqual((fetched.name, fetched.age), ('Ahmad', 34))
+        finally:
+            TestingRepository.set_clause_exclude = {DBTableColumns.Testing.ID}
+
+        with self.assertRaises(ValueError):
+            TestingRepository.update_many([TestingModel(id=6, age=1), TestingModel(age=2)], self.cursor)
+        self.rollback()
+
+    def test_delete_many_case1(self):
+        """Case 1: Delete several records by id."""
+        deleted = TestingRepository.delete_many([10, 11, 12, 10000], self.cursor)
+        self.assertEqual(deleted, 3)
+        self.assertEqual(TestingRepository.get_many(TestingModel(id=11), self.cursor), [])
+        self.assertEqual(TestingRepository.delete_many([], self.cursor), 0)
+        self.rollback()
+
+    def test_get_page_case1(self):
+        """Case 1: Walking all pages returns every record once, in key order."""
+        expected = sorted(record.id for record in TestingRepository.get_many(TestingModel(), self.cursor))
+        seen = []
+        page = TestingRepository.get_page(TestingModel(), page_size=7, cursor=self.cursor)
+        while True:
+            self.assertLessEqual(len(page.rows), 7)
+            seen += [record.id for record in page.rows]
+            if page.next_token is None:
+                break
+            page = TestingRepository.get_page(TestingModel(), page_size=7, page_token=page.next_token, cursor=self.cursor)
+
+        self.assertEqual(seen, expected)
+        self.rollback()
+
+    def test_get_page_case2(self):
+        """Case 2: Filters apply to every page, and rows inserted before the cursor do not shift pages."""
+        first = TestingRepository.view_page(TestingViewModel(name='a'), page_size=2, cursor=self.cursor)
+        self.assertEqual(len(first.rows), 2)
+        self.assertIsNotNone(first.next_token)
+
+        TestingRepository.add(TestingModel(id=0, name='aaa', age=1), self.cursor)
+        second = TestingRepository.view_page(TestingViewModel(name='a'), page_size=2, page_token=first.next_token, cursor=self.cursor)
+
+        self.assertTrue(all(record.id > first.rows[-1].id for record in second.rows))
+        self.assertTrue(all('a' in record.name.lower() for record in first.rows + second.rows))
+        self.rollback()
+
+    def test_get_page_case3(self):
+        """Case 3: Tokens that are malformed or belong to another query are rejected."""
+        with self.assertRaises(InvalidPageTokenError):
+            TestingRepository.get_page(TestingModel(), page_token='not-a-token', cursor=self.cursor)
+
+        view_token = TestingRepository.view_page(TestingViewModel(), page_size=1, cursor=self.cursor).next_token
+        with self.assertRaises(InvalidPageTokenError):
+            TestingRepository.get_page(TestingModel(), page_token=view_token, cursor=self.cursor)
+        self.rollback()
+
+    def test_get_page_case4(self):
+        """Case 4: Page sizes below 1 are rejected before anything is read."""
+        for page_size in (0, -1):
+            with self.assertRaises(ValueError):
+                TestingRepository.get_page(TestingModel(), page_size=page_size, cursor=self.cursor)
+            with self.assertRaises(ValueError):
+                TestingRepository.view_page(TestingViewModel(), page_size=page_size, cursor=self.cursor)
+        self.rollback()
+
+    # ─────────── iter_many / iter_view ────────────
+    def test_iter_many_case1(self):
+        """Case 1: Streams every matching record, past `return_limit`, in batches of `itersize`."""
+        TestingRepository.add_many([TestingModel(name=f'stream {number}', age=number) for number in range(150)], self.cursor)
+
+        streamed = TestingRepository.iter_many(TestingModel(name='stream'), itersize=16, cursor=self.cursor)
+        self.assertEqual(sorted(record.age for record in streamed), list(range(150)))
+
+        everything = sum(1 for _ in TestingRepository.iter_many(TestingModel(), cursor=self.cursor))
+        self.cursor.execute(f"SELECT count(*) FROM {TestingRepository.table_name}")
+        self.assertEqual(everything, self.cursor.fetchone()[0])
+        self.rollback()
+
+    def test_iter_many_case2(self):
+        """Case 2: Models are built lazily and a generator closed early releases its server-side cursor."""
+        streamed = TestingRepository.iter_view(TestingViewModel(), itersize=5, cursor=self.cursor)
+        first = next(streamed)
+        self.assertIsInstance(first, TestingViewModel)
+        streamed.close()
+
+        self.cursor.execute("SELECT count(*) FROM pg_cursors WHERE name LIKE 'lca_iter_%%'")
+        self.assertEqual(self.cursor.fetchone()[0], 0)
+        self.rollback()
+
+    def test_iter_many_case3(self):
+        """Case 3: Without a cursor the stream runs on, and returns, a connection of its own."""
+        ids = [record.id for record in TestingRepository.iter_many(TestingModel(age=25), itersize=1)]
+        self.assertEqual(sorted(ids), sorted(record.id for record in TestingRepository.get_many(TestingModel(age=25), self.cursor)))
+
+        # Inside a transaction() the stream joins it and sees its uncommitted rows.
+        with self.assertRaises(ZeroDivisionError):
+            with transaction():
+                added = TestingRepository.add(TestingModel(name='streamed in transaction', age=1))
+                self.assertIn(added.id, [record.id for record in TestingRepository.iter_many(TestingModel(name='streamed in transaction'))])
+                1 / 0
+
+    def test_iter_many_case4(self):
+        """Case 4: Writes made while streaming commit on their own, even when the loop stops early."""
+        self.assertIsNone(current_cursor())
+        stream = TestingRepository.iter_many(TestingModel(), itersize=1)
+        for _ in stream:
+            self.assertIsNone(current_cursor())
+            added = TestingRepository.add(TestingModel(name='written while streaming', age=1))
+            break
+        stream.close()
+
+        try:
+            self.assertEqual(TestingRepository.get_one(TestingModel(id=added.id), self.cursor), added)
+        finally:
+            self.cursor.execute('DELETE FROM public."Testing" WHERE id = %s', (added.id,))
+            self.cursor.connection.commit()
+
+    def test_iter_many_case5(self):
+        """Case 5: Streaming is refused wherever listing is forbidden."""
+        with self.assertRaises(RepositoryMethodNotAllowedError):
+            GuestRepository.iter_many(GuestModel())
+
+    # ─────────── fields ────────────
+    def test_fields_case1(self):
+        """Case 1: Only the requested fields are read; the others stay UNSET."""
+        full = TestingRepository.get_one(TestingModel(id=3), self.cursor)
+        partial = TestingRepository.get_one(TestingModel(id=3), self.cursor, fields=('name', 'age'))
+        self.assertEqual((partial.name, partial.age), (full.name, full.age))
+        self.assertIsInstance(partial.id, UnsetType)
+        self.assertIsInstance(partial.description, UnsetType)
+
+        names = TestingRepository.view_many(TestingViewModel(name='a'), self.cursor, fields=['name'])
+        self.assertEqual([record.name for record in names], [record.name for record in TestingRepository.view_many(TestingViewModel(name='a'), self.cursor)])
+        self.assertTrue(all(isinstance(record.age, UnsetType) for record in names))
+
+        streamed = list(TestingRepository.iter_many(TestingModel(age=25), cursor=self.cursor, fields=('id',)))
+        self.assertEqual([record.id for record in streamed], [record.id for record in TestingRepository.get_many(TestingModel(age=25), self.cursor)])
+        self.rollback()
+
+    def test_fields_case2(self):
+        """Case 2: Pages always read the page key so the next page can be found."""
+        first = TestingRepository.get_page(TestingModel(), page_size=5, cursor=self.cursor, fields=('name',))
+        self.assertTrue(all(not isinstance(record.id, UnsetType) for record in first.rows))
+        self.assertTrue(all(isinstance(record.age, UnsetType) for record in first.rows))
+
+        second = TestingRepository.get_page(TestingModel(), page_size=5, page_token=first.next_token, cursor=self.cursor, fields=('name',))
+        self.assertGreater(second.rows[0].id, first.rows[-1].id)
+        self.rollback()
+
+    def test_fields_case3(self):
+        """Case 3: Unknown or empty field lists are rejected."""
+        with self.assertRaises(ValueError):
+            TestingRepository.get_many(TestingModel(), self.cursor, fields=('name', 'salary'))
+        with self.assertRaises(ValueError):
+            TestingRepository.view_one(TestingViewModel(id=3), self.cursor, fields=())
+        self.rollback()
+
+    def test_bulk_methods_honour_forbidden_methods(self):
+        """Bulk variants are disabled wherever the single-row method is forbidden."""
+        with self.assertRaises(RepositoryMethodNotAllowedError):
+            GuestRepository.update_many([GuestModel(id=uuid4(), request_count=0)], self.cursor)
+        with self.assertRaises(RepositoryMethodNotAllowedError):
+            BorrowingRepository.delete_many([1], self.cursor)
+        with self.assertRaises(RepositoryMethodNotAllowedError):
+            BorrowRequestRepository.update_many([], self.cursor)
+
+    def test_paging_honours_forbidden_reads(self):
+        """Pages are refused wherever listing the table or view is forbidden."""
+        with self.assertRaises(RepositoryMethodNotAllowedError):
+            GuestRepository.get_page(GuestModel(), cursor=self.cursor)
+        with self.assertRaises(RepositoryMethodNotAllowedError):
+            BookAuthorRepository.get_page(BookAuthorModel(), cursor=self.cursor)
+        with self.assertRaises(RepositoryMethodNotAllowedError):
+            BookCategoryRepository.view_page(BookCategoryModel(), cursor=self.cursor)
@@ -0,0 +1,29 @@
+import unittest
+from DataAccess.Connection import DatabaseConnector
+
+
+class TestConnectionPool(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.pool = DatabaseConnector().get_pool()
+
+    # ─────────────────────────────── Tests ───────────────────────────────
+
+    def test_double_close_returns_connection_once(self):
+        connection = self.pool.acquire()
+        connection.close()
+        connection.close()
+
+        self.assertLessEqual(list(self.pool._idle).count(connection), 1)
+
+        first = self.pool.acquire()
+        second = self.pool.acquire()
+        try:
+            self.assertIsNot(first, second)
+        finally:
+            first.close()
+            second.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import typing
+import unittest
+from DataAccess.BorrowingRepository import BorrowingRepository
+from DataAccess.IndexAdvisor import FailedProbe, advise, check_repository, sample_value, sequential_scans
+from Models.Models import BorrowRequestModel, BorrowRequestStatus
+
+
+class TestIndexAdvisor(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.cursor = BorrowingRepository._get_cursor()
+
+    def tearDown(self) -> None:
+        self.cursor.connection.rollback()
+        self.cursor.connection.close()
+
+    # ─────────────────────────────── Tests ───────────────────────────────
+
+    def test_sequential_scans(self):
+        plan = {
+            "Node Type": "Nested Loop",
+            "Plans": [
+                {"Node Type": "Seq Scan", "Relation Name": "Borrowing"},
+                {"Node Type": "Index Scan", "Relation Name": "Member"},
+            ]
+        }
+        self.assertEqual(sequential_scans(plan), ["Borrowing"])
+
+    def test_sample_value(self):
+        hints = typing.get_type_hints(BorrowRequestModel)
+        self.assertEqual(sample_value(hints["member_id"]), 1)
+        self.assertEqual(sample_value(hints["status"]), BorrowRequestStatus.pending)
+
+    def test_check_repository(self):
+        self.cursor.execute("SET LOCAL enable_seqscan = off")
+        columns = {finding.column for finding in check_repository(BorrowingRepository, self.cursor)}
+
+        # Indexed by Migrations/006_foreign_key_indexes.sql.
+        self.assertNotIn("member_id", columns)
+        self.assertNotIn("book_id", columns)
+        self.assertIn("start_date", columns)
+
+    def test_advise_restores_setting(self):
+        self.cursor.execute("SHOW enable_seqscan")
+        before = self.cursor.fetchone()[0]
+
+        findings = advise(cursor = self.cursor)
+
+        self.cursor.execute("SHOW enable_seqscan")
+        self.assertEqual(self.cursor.fetchone()[0], before)
+        self.assertIn(("BorrowingRepository", "start_date"), {(finding.repository, finding.column) for finding in findings})
+
+    def test_advise_views_reports_failed_probes(self):
+        self.cursor.execute("SHOW enable_seqscan")
+        before = self.cursor.fetchone()[0]
+        failures = []
+
+        findings = advise(include_views = True, cursor = self.cursor, failures = failures)
+
+        self.cursor.execute("SHOW enable_seqscan")
+        self.assertEqual(self.cursor.fetchone()[0], before)
+        self.assertIn("view_many", {finding.method for finding in findings})
+        # `to` is a reserved word, so the generated `WHERE to LIKE %s` is rejected.
+        self.assertIn(("MessageRepository", "view_many", "to"), {(failure.repository, failure.method, failure.column) for failure in failures})
+        self.assertTrue(all(isinstance(failure, FailedProbe) for failure in failures))
+
+
+if __name__ == '__main__':
+    unittest.main()
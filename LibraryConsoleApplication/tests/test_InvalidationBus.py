@@ -0,0 +1,70 @@
+import threading
+import unittest
+from DataAccess.CategoryRepository import CategoryRepository
+from DataAccess.InvalidationBus import InvalidationBus
+from Models.Models import CategoryModel
+from Models.Schema import DBTables
+
+
+class TestInvalidationBus(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.cursor = CategoryRepository._get_cursor()
+        self.bus = InvalidationBus(enabled = True, poll_seconds = 0.05)
+        self.calls = threading.Semaphore(0)
+        self.bus.subscribe(DBTables.CATEGORY, self.calls.release)
+        # The listener runs every callback once it starts listening.
+        self.assertTrue(self.calls.acquire(timeout = 5))
+
+    def tearDown(self) -> None:
+        self.bus.stop()
+        self.cursor.connection.rollback()
+        self.cursor.connection.close()
+
+    # ─────────────────────────────── Tests ───────────────────────────────
+
+    def test_channel(self):
+        self.assertEqual(InvalidationBus.channel(DBTables.CATEGORY), 'lca_cache_category')
+        self.assertEqual(InvalidationBus.channel(DBTables.BOOK_AUTHOR), 'lca_cache_bookauthor')
+
+    def test_notification_on_commit(self):
+        self.bus.publish(self.cursor, [DBTables.CATEGORY])
+        self.assertFalse(self.calls.acquire(timeout = 0.3))
+
+        self.cursor.connection.commit()
+        self.assertTrue(self.calls.acquire(timeout = 5))
+
+    def test_no_notification_on_rollback(self):
+        self.bus.publish(self.cursor, [DBTables.CATEGORY, DBTables.AUTHOR])
+        self.cursor.connection.rollback()
+        self.assertFalse(self.calls.acquire(timeout = 0.3))
+
+    def test_repository_write_publishes(self):
+        # Add and delete in one transaction, so the commit leaves no data behind.
+        category = CategoryRepository.add(CategoryModel(name = 'دسته اعلان'), self.cursor)
+        CategoryRepository.delete(category.id, self.cursor)
+        self.assertFalse(self.calls.acquire(timeout = 0.3))
+
+        self.cursor.connection.commit()
+        self.assertTrue(self.calls.acquire(timeout = 5))
+
+    def test_subscribe_waits_for_first_dispatch(self):
+        calls = []
+        self.bus.subscribe(DBTables.AUTHOR, lambda: calls.append('author'))
+        self.assertEqual(calls, ['author'])
+
+    def test_failing_callback_keeps_listener(self):
+        def fail():
+            raise RuntimeError()
+
+        with self.assertLogs('DataAccess.InvalidationBus', 'ERROR'):
+            self.bus.subscribe(DBTables.CATEGORY, fail)
+        self.assertTrue(self.calls.acquire(timeout = 5))
+
+        self.bus.publish(self.cursor, [DBTables.CATEGORY])
+        self.cursor.connection.commit()
+        self.assertTrue(self.calls.acquire(timeout = 5))
+
+
+if __name__ == '__main__':
+    unittest.main()
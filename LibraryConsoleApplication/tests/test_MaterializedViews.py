@@ -0,0 +1,133 @@
+import threading
+import unittest
+from DataAccess.AuthorRepository import AuthorRepository
+from DataAccess.BookAuthorRepository import BookAuthorRepository
+from DataAccess.BookCategoryRepository import BookCategoryRepository
+from DataAccess.BookRepository import BookRepository
+from DataAccess.CategoryRepository import CategoryRepository
+from DataAccess.InvalidationBus import InvalidationBus
+from DataAccess.MaterializedViews import MaterializedViewRefresher, materialized_views
+from DataAccess.PublisherRepository import PublisherRepository
+from DataAccess.Transaction import after_commit, transaction
+from Models.Models import AuthorModel, BookAuthorModel, BookCategoryModel, BookModel, BookViewModel, CategoryModel, PublisherModel
+from Models.Schema import DBViews
+
+
+class TestMaterializedViews(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.cursor = BookRepository._get_cursor()
+
+    def tearDown(self) -> None:
+        BookRepository.use_materialized_view = None
+        self.cursor.connection.rollback()
+        self.cursor.connection.close()
+
+    # ─────────────────────────────── Tests ───────────────────────────────
+
+    def test_refresher_staleness(self):
+        refresher = MaterializedViewRefresher(debounce_seconds=0, max_staleness_seconds=0)
+        view = DBViews.BOOK_VIEW_MATERIALIZED
+
+        self.assertTrue(refresher.is_fresh(view))
+
+        refresher.mark_stale([view])
+        self.assertFalse(refresher.is_fresh(view))
+
+        self.assertIsNone(refresher.refresh_due())
+        self.assertTrue(refresher.is_fresh(view))
+
+    def test_writes_of_other_instances_trigger_refresh(self):
+        bus = InvalidationBus(enabled = True, poll_seconds = 0.05)
+        refresher = MaterializedViewRefresher(enabled = True, debounce_seconds = 0, max_staleness_seconds = 3600, bus = bus)
+        view = DBViews.BOOK_VIEW_MATERIALIZED
+        refreshed = self._count_refreshes(refresher)
+
+        try:
+            refresher.is_fresh(view)
+            # Listening starts with a refresh, since earlier notifications were not heard.
+            self.assertTrue(refreshed.acquire(timeout = 5))
+            self.assertFalse(refreshed.acquire(timeout = 0.3))
+
+            # Another instance commits a write to the tables behind the view.
+            InvalidationBus(enabled = True).publish(self.cursor, [view])
+            self.cursor.connection.commit()
+            self.assertTrue(refreshed.acquire(timeout = 5))
+        finally:
+            bus.stop()
+
+    def test_refreshes_periodically_without_bus(self):
+        refresher = MaterializedViewRefresher(
+            enabled = True,
+            debounce_seconds = 0,
+            max_staleness_seconds = 0.2,
+            bus = InvalidationBus(enabled = False)
+        )
+        refreshed = self._count_refreshes(refresher)
+
+        refresher.is_fresh(DBViews.BOOK_VIEW_MATERIALIZED)
+        self.assertTrue(refreshed.acquire(timeout = 5))
+        self.assertTrue(refreshed.acquire(timeout = 5))
+
+    def test_after_commit(self):
+        calls = []
+
+        with transaction():
+            after_commit(lambda: calls.append('committed'))
+            self.assertEqual(calls, [])
+        self.assertEqual(calls, ['committed'])
+
+        with self.assertRaises(RuntimeError):
+            with transaction():
+                after_commit(lambda: calls.append('rolled back'))
+                raise RuntimeError()
+        self.assertEqual(calls, ['committed'])
+
+        after_commit(lambda: calls.append('no transaction'))
+        self.assertEqual(calls, ['committed', 'no transaction'])
+
+    def test_reads_follow_staleness_bound(self):
+        refresher = materialized_views()
+        max_staleness_seconds = refresher.max_staleness_seconds
+        BookRepository.use_materialized_view = True
+
+        publisher = PublisherRepository.add(PublisherModel(name = 'ناشر مادی'), self.cursor)
+        author = AuthorRepository.add(AuthorModel(name = 'نویسنده مادی'), self.cursor)
+        category = CategoryRepository.add(CategoryModel(name = 'دسته مادی'), self.cursor)
+        book = BookRepository.add(
+            BookModel(title = 'کتاب مادی', publisher_id = publisher.id, total_copies = 1, available_copies = 1),
+            self.cursor
+        )
+        BookAuthorRepository.add(BookAuthorModel(book_id = book.id, author_id = author.id), self.cursor)
+        BookCategoryRepository.add(BookCategoryModel(book_id = book.id, category_id = category.id), self.cursor)
+
+        try:
+            # Within the bound the (not yet refreshed) materialized view is read.
+            refresher.max_staleness_seconds = 3600
+            self.assertEqual(BookRepository._view_source(), DBViews.BOOK_VIEW_MATERIALIZED)
+            self.assertEqual(BookRepository.view_many(BookViewModel(title = 'کتاب مادی'), self.cursor), [])
+
+            # Past the bound reads fall back to the live view.
+            refresher.max_staleness_seconds = 0
+            self.assertEqual(BookRepository._view_source(), DBViews.BOOK_VIEW)
+            self.assertEqual(
+                [row.id for row in BookRepository.view_many(BookViewModel(title = 'کتاب مادی'), self.cursor)],
+                [book.id]
+            )
+        finally:
+            refresher.max_staleness_seconds = max_staleness_seconds
+
+    def _count_refreshes(self, refresher: MaterializedViewRefresher) -> threading.Semaphore:
+        refreshed = threading.Semaphore(0)
+        refresh = refresher.refresh
+
+        def counting_refresh(view):
+            refresh(view)
+            refreshed.release()
+
+        refresher.refresh = counting_refresh
+        return refreshed
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+import unittest
+from DataAccess.MemberRepository import MemberRepository
+from Models.Models import MemberModel, PlainUserModel
+
+
+class TestMemberRepository(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.cursor = MemberRepository._get_cursor()
+        self.members = [
+            MemberRepository.add(
+                PlainUserModel(username = f'cohort_member_{number}', password = 'Secret123'),
+                MemberModel(name = 'عضو آزمایشی', email = f'cohort{number}@example.com'),
+                self.cursor
+            )
+            for number in range(3)
+        ]
+        self.ids = [member.id for member in self.members]
+
+    def tearDown(self) -> None:
+        self.cursor.connection.rollback()
+        self.cursor.connection.close()
+
+    def active(self) -> list[bool]:
+        return [MemberRepository.get_one(MemberModel(id = id), self.cursor).active for id in self.ids]
+
+    # ─────────────────────────────── Tests ───────────────────────────────
+
+    def test_deactivate_and_activate_many(self):
+        self.assertEqual(sorted(MemberRepository.deactivate_many(self.ids[:2], self.cursor)), sorted(self.ids[:2]))
+        self.assertEqual(self.active(), [False, False, True])
+
+        # Already inactive and missing members are skipped.
+        self.assertEqual(MemberRepository.deactivate_many([self.ids[0], -1], self.cursor), [])
+
+        self.assertEqual(sorted(MemberRepository.activate_many(self.ids, self.cursor)), sorted(self.ids[:2]))
+        self.assertEqual(self.active(), [True, True, True])
+        self.assertEqual(MemberRepository.activate_many([], self.cursor), [])
+
+    def test_update_many_keeps_active_and_models(self):
+        models = [MemberModel(id = id, name = 'نام جدید', active = False) for id in self.ids]
+
+        MemberRepository.update_many(models, self.cursor)
+
+        self.assertEqual(self.active(), [True, True, True])
+        self.assertEqual([model.active for model in models], [False, False, False])
+        self.assertEqual({MemberRepository.get_one(MemberModel(id = id), self.cursor).name for id in self.ids}, {'نام جدید'})
+
+
+if __name__ == '__main__':
+    unittest.main()
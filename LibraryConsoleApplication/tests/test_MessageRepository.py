@@ -0,0 +1,86 @@
+import unittest
+from DataAccess.MemberRepository import MemberRepository
+from DataAccess.MessageRepository import MessageRepository
+from Exceptions.Exceptions import MultipleRowsReturnedError, NotSuchModelInDataBaseError
+from Models.Models import MemberModel, MessageModel, PlainUserModel, UserModel
+
+
+class TestMessageRepository(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.cursor = MessageRepository._get_cursor()
+        member = MemberRepository.add(
+            PlainUserModel(username = 'inbox_test_user', password = 'Secret123'),
+            MemberModel(name = 'کاربر آزمایشی', email = 'inbox@example.com'),
+            self.cursor
+        )
+        self.user = UserModel(username = 'inbox_test_user')
+        self.ids = [
+            MessageRepository.add(MessageModel(user_id = member.id, message = f'پیام {number}'), self.cursor).id
+            for number in range(5)
+        ]
+
+    def tearDown(self) -> None:
+        self.cursor.connection.rollback()
+        self.cursor.connection.close()
+
+    # ─────────────────────────────── Tests ───────────────────────────────
+
+    def test_inbox_page_marks_only_returned_messages(self):
+        page = MessageRepository.inbox_page(self.user, page_size = 2, cursor = self.cursor)
+
+        self.assertEqual([message.id for message in page.rows], self.ids[:-3:-1])
+        self.assertTrue(all(message.seen is False for message in page.rows))
+        self.assertIsNotNone(page.next_token)
+        self.assertEqual(MessageRepository.unread_count(self.user, self.cursor), 3)
+
+        rest = MessageRepository.inbox_page(self.user, page_size = 3, page_token = page.next_token, cursor = self.cursor)
+
+        self.assertEqual([message.id for message in rest.rows], self.ids[2::-1])
+        self.assertIsNone(rest.next_token)
+        self.assertEqual(MessageRepository.unread_count(self.user, self.cursor), 0)
+
+    def test_inbox_page_shows_previous_seen_state(self):
+        MessageRepository.inbox_page(self.user, page_size = 1, cursor = self.cursor)
+
+        rows = MessageRepository.inbox(self.user, self.cursor)
+
+        self.assertEqual([message.seen for message in rows], [True, False, False, False, False])
+        self.assertEqual([message.seen for message in MessageRepository.inbox(self.user, self.cursor)], [True] * 5)
+
+    def test_unread_inbox(self):
+        MessageRepository.inbox_page(self.user, page_size = 2, cursor = self.cursor)
+
+        self.assertEqual([message.id for message in MessageRepository.unread_inbox(self.user, self.cursor)], self.ids[2::-1])
+        self.assertEqual(MessageRepository.unread_inbox(self.user, self.cursor), [])
+
+    def test_unknown_user(self):
+        with self.assertRaises(NotSuchModelInDataBaseError):
+            MessageRepository.inbox_page(UserModel(username = 'no_such_user'), cursor = self.cursor)
+        with self.assertRaises(NotSuchModelInDataBaseError):
+            MessageRepository.unread_count(UserModel(username = 'no_such_user'), self.cursor)
+
+    def test_ambiguous_user(self):
+        # Only possible without the unique username indexes; the test transaction is rolled back.
+        self.cursor.execute('ALTER TABLE public."User" DROP CONSTRAINT "User_username_key"')
+        self.cursor.execute('DROP INDEX IF EXISTS public."User_username_credentials_idx"')
+        self.cursor.execute(
+            'INSERT INTO public."User" (id, username, hashed_password) SELECT max(id) + 1, %s, %s FROM public."User"',
+            ('inbox_test_user', 'x')
+        )
+
+        with self.assertRaises(MultipleRowsReturnedError):
+            MessageRepository.inbox_page(self.user, cursor = self.cursor)
+        with self.assertRaises(MultipleRowsReturnedError):
+            MessageRepository.unread_count(self.user, self.cursor)
+
+        self.cursor.execute('SELECT count(*) FROM public."Message" WHERE id = ANY(%s) AND seen', (self.ids,))
+        self.assertEqual(self.cursor.fetchone()[0], 0)
+
+    def test_page_size_below_one(self):
+        with self.assertRaises(ValueError):
+            MessageRepository.inbox_page(self.user, page_size = 0, cursor = self.cursor)
+
+
+if __name__ == '__main__':
+    unittest.main()
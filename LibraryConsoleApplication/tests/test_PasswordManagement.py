@@ -0,0 +1,71 @@
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from Core.HashCalibration import calibrate
+from Core.PasswordManagement import PasswordManager
+from Exceptions.Exceptions import PasswordHashingBusyError
+
+
+class TestPasswordManagement(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.manager = PasswordManager()
+
+    # ─────────────────────────────── Tests ───────────────────────────────
+
+    def test_hash_and_verify(self):
+        hashed = self.manager.hash_password('Secret123')
+
+        self.assertTrue(self.manager.verify_password('Secret123', hashed))
+        self.assertFalse(self.manager.verify_password('Secret124', hashed))
+
+    def test_bounded_workers(self):
+        workers = self.manager._executor._max_workers
+        running = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def work():
+            nonlocal running, peak
+            with lock:
+                running += 1
+                peak = max(peak, running)
+            time.sleep(0.02)
+            with lock:
+                running -= 1
+
+        with ThreadPoolExecutor(max_workers = workers * 3) as callers:
+            for future in [callers.submit(self.manager._run, work) for _ in range(workers * 3)]:
+                future.result()
+
+        self.assertEqual(peak, workers)
+
+    def test_full_queue_raises(self):
+        taken = 0
+        while self.manager._slots.acquire(blocking = False):
+            taken += 1
+
+        try:
+            with self.assertRaises(PasswordHashingBusyError):
+                self.manager.hash_password('Secret123')
+        finally:
+            for _ in range(taken):
+                self.manager._slots.release()
+
+        self.assertTrue(self.manager.hash_password('Secret123'))
+
+
+    def test_calibrate(self):
+        profile = calibrate(target_ms = 1000, max_memory_kib = 1024, parallelism = 1, max_time_cost = 3, rounds = 1)
+
+        self.assertEqual(profile.memory_cost, 1024)
+        self.assertEqual(profile.time_cost, 3)
+        self.assertLessEqual(profile.latency_ms, 1000)
+
+        # An unreachable target falls back to the cheapest profile.
+        profile = calibrate(target_ms = 0, max_memory_kib = 1024, parallelism = 1, rounds = 1)
+        self.assertEqual((profile.time_cost, profile.memory_cost), (1, 8))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,123 @@
+import unittest
+from DataAccess.BookRepository import BookRepository
+from DataAccess.CategoryRepository import CategoryRepository
+from DataAccess.InvalidationBus import invalidation_bus
+from DataAccess.QueryCache import QueryCache, invalidate_query_caches
+from DataAccess.Transaction import transaction
+from Models.Models import CategoryModel
+
+
+class TestQueryCache(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.cursor = CategoryRepository._get_cursor()
+
+    def tearDown(self) -> None:
+        self.cursor.connection.rollback()
+        self.cursor.connection.close()
+
+    # ─────────────────────────────── Tests ───────────────────────────────
+
+    def test_hits_and_misses(self):
+        cache = QueryCache(ttl_seconds = 60, max_size = 10)
+        loads = []
+
+        def load():
+            loads.append(1)
+            return ['row']
+
+        self.assertEqual(cache.get_or_load('key', load), ['row'])
+        self.assertEqual(cache.get_or_load('key', load), ['row'])
+        self.assertEqual(len(loads), 1)
+        self.assertEqual(cache.stats(), {'hits': 1, 'misses': 1, 'size': 1})
+
+        cache.invalidate()
+        cache.get_or_load('key', load)
+        self.assertEqual(len(loads), 2)
+
+    def test_lru_eviction(self):
+        cache = QueryCache(ttl_seconds = 60, max_size = 2)
+
+        cache.get_or_load('a', lambda: 'a')
+        cache.get_or_load('b', lambda: 'b')
+        cache.get_or_load('a', lambda: 'a')     # 'a' is now the most recently used
+        cache.get_or_load('c', lambda: 'c')     # evicts 'b'
+
+        self.assertEqual(cache.get_or_load('a', lambda: 'reloaded'), 'a')
+        self.assertEqual(cache.get_or_load('b', lambda: 'reloaded'), 'reloaded')
+
+    def test_ttl_expiry(self):
+        cache = QueryCache(ttl_seconds = 0, max_size = 10)
+
+        cache.get_or_load('key', lambda: 'old')
+        self.assertEqual(cache.get_or_load('key', lambda: 'new'), 'new')
+        self.assertEqual(cache.stats()['hits'], 0)
+
+    def test_load_racing_invalidation_is_not_stored(self):
+        cache = QueryCache(ttl_seconds = 60, max_size = 10)
+
+        def load():
+            cache.invalidate()      # a write commits while the query runs
+            return 'before write'
+
+        self.assertEqual(cache.get_or_load('key', load), 'before write')
+        self.assertEqual(cache.get_or_load('key', lambda: 'after write'), 'after write')
+
+    def test_repository_reads(self):
+        CategoryRepository.get_many(CategoryModel())
+        stats = CategoryRepository.cache_stats()
+
+        CategoryRepository.get_many(CategoryModel())
+        self.assertEqual(CategoryRepository.cache_stats()['hits'], stats['hits'] + 1)
+
+        # Reads on a cursor or in a transaction may see uncommitted rows and bypass the cache.
+        CategoryRepository.get_many(CategoryModel(), self.cursor)
+        with transaction():
+            CategoryRepository.get_many(CategoryModel())
+        self.assertEqual(CategoryRepository.cache_stats(), {**stats, 'hits': stats['hits'] + 1})
+
+        self.assertIsNone(BookRepository.cache_stats())
+
+    def test_repository_writes_invalidate(self):
+        CategoryRepository.get_many(CategoryModel())
+        misses = CategoryRepository.cache_stats()['misses']
+
+        CategoryRepository.add(CategoryModel(name = 'دسته کش'), self.cursor)
+
+        CategoryRepository.get_many(CategoryModel())
+        self.assertEqual(CategoryRepository.cache_stats()['misses'], misses + 1)
+
+    def test_hold_until_commit(self):
+        cache = QueryCache(ttl_seconds = 60, max_size = 10)
+        self.cursor.execute("SELECT 1")
+        cache.hold(self.cursor.connection)
+
+        cache.get_or_load('key', lambda: 'before commit')
+        self.assertEqual(cache.stats()['size'], 0)
+
+        self.cursor.connection.commit()
+        self.assertEqual(cache.get_or_load('key', lambda: 'after commit'), 'after commit')
+        self.assertEqual(cache.stats()['size'], 1)
+
+    def test_caller_cursor_write_without_bus(self):
+        bus = invalidation_bus()
+        enabled, bus.enabled = bus.enabled, False
+        name = 'دسته کش بدون اعلان'
+
+        try:
+            CategoryRepository.add(CategoryModel(name = name), self.cursor)
+
+            # Another reader runs before the caller commits; its rows must not be cached.
+            self.assertNotIn(name, [category.name for category in CategoryRepository.get_many(CategoryModel(name = name))])
+
+            self.cursor.connection.commit()
+            self.assertIn(name, [category.name for category in CategoryRepository.get_many(CategoryModel(name = name))])
+        finally:
+            bus.enabled = enabled
+            self.cursor.execute('DELETE FROM public."Category" WHERE name = %s', (name,))
+            self.cursor.connection.commit()
+            invalidate_query_caches([CategoryRepository.table_name])
+
+
+if __name__ == '__main__':
+    unittest.main()
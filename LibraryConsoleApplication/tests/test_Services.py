@@ -1,11 +1,14 @@
 # -*- coding: utf-8 -*-
 from Exceptions.Exceptions import InappropriateRoleError, ReachedToRequestLimitError
-from Models.Models import PlainUserModel
+from DataAccess.GuestRepository import GuestRepository
+from Models.Models import GuestModel, PlainUserModel
 from Services.AdminServices import AdminServices
 from Services.LibrarianServices import LibrarianServices
 from Services.AuthServices import AuthServices
+from Services.GuestQuota import InMemoryGuestQuota
 from Services.GuestServices import GuestServices
 from Services.MemberServices import MemberServices
+from concurrent.futures import ThreadPoolExecutor
 import unittest
 
 
@@ -57,3 +60,43 @@ class TestServices(unittest.TestCase):
         
 
         
+
+    def test_guest_services_concurrent_requests(self):
+        token = AuthServices.login_as_guest()
+        service_provider = GuestServices(token)
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(lambda _: service_provider.consume_guest_request(), range(30)))
+
+        self.assertEqual(results.count(True), 20)
+        GuestServices.quota().flush()
+        self.assertEqual(service_provider.get_guest_model().request_count, 20)
+
+    def test_guest_quota_memory_backend(self):
+        token = AuthServices.login_as_guest()
+        guest = GuestServices(token).get_guest_model()
+        quota = InMemoryGuestQuota(max_requests=3, life_time_minutes=10, flush_interval=3600)
+
+        try:
+            self.assertEqual([quota.consume(guest.id) for _ in range(4)], [True, True, True, False])
+            self.assertFalse(quota.can_request(guest.id))
+            self.assertEqual(GuestRepository.get_one(GuestModel(id=guest.id)).request_count, 0)
+
+            quota.flush()
+            self.assertEqual(GuestRepository.get_one(GuestModel(id=guest.id)).request_count, 3)
+        finally:
+            quota.close()
+
+    def test_guest_quota_close_survives_database_errors(self):
+        token = AuthServices.login_as_guest()
+        guest = GuestServices(token).get_guest_model()
+        quota = InMemoryGuestQuota(max_requests=3, life_time_minutes=10, flush_interval=3600)
+
+        quota.consume(guest.id)
+        # A count the request_count column cannot hold makes the flush fail in the database.
+        quota._usage[guest.id].pending = 2 ** 40
+
+        with self.assertLogs('Services.GuestQuota', 'ERROR'):
+            quota.close()
+        # Drop the count kept for a retry, so the exit hook has nothing to write.
+        quota._usage[guest.id].pending = 0
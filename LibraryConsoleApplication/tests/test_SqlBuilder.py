@@ -0,0 +1,58 @@
+import unittest
+from DataAccess.SqlBuilder import (
+    build_insert_clause, build_set_clause, build_where_clause,
+    cached_insert_statement, cached_set_statement, cached_where_statement, statement_cache
+)
+from Models.Models import TestingModel
+
+
+class TestSqlBuilder(unittest.TestCase):
+
+    def setUp(self) -> None:
+        statement_cache.clear()
+
+    def test_where_matches_builder(self):
+        models = [
+            TestingModel(name='Ali'),
+            TestingModel(id=3, age=41),
+            TestingModel(name=None, description='Teacher'),
+            TestingModel(id=1, name='Ali', age=25, description='Student from Tehran'),
+        ]
+        for use_like in (False, True):
+            for model in models:
+                clause, values = build_where_clause(model, use_like_for_strings=use_like, exclude={'age'})
+                sql, cached_values = cached_where_statement(
+                    'where', model, lambda where: where, use_like_for_strings=use_like, exclude={'age'}
+                )
+                self.assertEqual(sql, clause)
+                self.assertEqual(cached_values, values)
+
+    def test_set_and_insert_match_builder(self):
+        model = TestingModel(id=7, name=None, description='Backend developer')
+
+        clause, values = build_set_clause(model)
+        self.assertEqual(cached_set_statement('set', model, lambda s: s), (clause, values))
+
+        columns, placeholders, values = build_insert_clause(model)
+        self.assertEqual(
+            cached_insert_statement('insert', model, lambda c, p: f"{c} | {p}"),
+            (f"{columns} | {placeholders}", values)
+        )
+
+    def test_empty_model_returns_none(self):
+        self.assertIsNone(cached_where_statement('where', TestingModel(), lambda w: w))
+        self.assertIsNone(cached_set_statement('set', TestingModel(id=1), lambda s: s))
+        self.assertIsNone(cached_insert_statement('insert', TestingModel(id=1), lambda c, p: c))
+
+    def test_statement_rendered_once_per_shape(self):
+        calls = []
+        render = lambda where: calls.append(where) or where
+
+        cached_where_statement('where', TestingModel(name='Ali'), render)
+        cached_where_statement('where', TestingModel(name='Sara'), render)
+        self.assertEqual(len(calls), 1)
+
+        cached_where_statement('where', TestingModel(name=None), render)
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(statement_cache.hits, 1)
+        self.assertEqual(statement_cache.misses, 2)
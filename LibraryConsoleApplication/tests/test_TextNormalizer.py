@@ -0,0 +1,23 @@
+import unittest
+from Core.TextNormalizer import TextNormalizer
+
+
+class TestTextNormalizer(unittest.TestCase):
+
+    def test_normalize_letters(self):
+        self.assertEqual(TextNormalizer.normalize('كتاب عربي'), 'کتاب عربی')
+        self.assertEqual(TextNormalizer.normalize('مدرسة'), 'مدرسه')
+        self.assertEqual(TextNormalizer.normalize('آسمان'), 'اسمان')
+
+    def test_normalize_marks_digits_and_case(self):
+        self.assertEqual(TextNormalizer.normalize('کِتابـــ'), 'کتاب')
+        self.assertEqual(TextNormalizer.normalize('جلد ۱۲ و ٣'), 'جلد 12 و 3')
+        self.assertEqual(TextNormalizer.normalize('Harry POTTER'), 'harry potter')
+
+    def test_tokens(self):
+        self.assertEqual(TextNormalizer.tokens('کتاب‌های  هري-پاتر!'), ['کتاب', 'های', 'هری', 'پاتر'])
+        self.assertEqual(TextNormalizer.tokens(' ، . '), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import time
+import unittest
+import uuid
+from Core.JWT import JWTManager
+from Services.TokenCache import TokenCache
+
+
+class TestTokenCache(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.cache = TokenCache(max_size = 2)
+        self.jwt_manager = JWTManager()
+
+    def token(self, **claims) -> str:
+        data = {'id': 7, 'username': 'ali_reza', 'name': 'علی', 'user_type': 'member', **claims}
+        return self.jwt_manager.create_token(data)
+
+    # ─────────────────────────────── Tests ───────────────────────────────
+
+    def test_authenticate(self):
+        guest_id = uuid.uuid4()
+        token = self.token(id = str(guest_id), username = None, name = None, user_type = 'guest')
+
+        claims, user = self.cache.authenticate(token)
+        self.assertEqual(user.id, guest_id)
+        self.assertEqual(user.user_type, 'guest')
+        self.assertIn('exp', claims)
+
+        # Later calls return the cached objects without verifying again.
+        self.assertIs(self.cache.authenticate(token)[1], user)
+
+    def test_invalid_token(self):
+        with self.assertRaises(ValueError):
+            self.cache.authenticate(self.token() + 'x')
+
+    def test_expired_entry(self):
+        token = self.token()
+        claims, user = self.cache.authenticate(token)
+
+        self.cache._verified[token] = (time.time() - 1, claims, user)
+        self.assertIsNot(self.cache.authenticate(token)[1], user)
+
+    def test_revoke(self):
+        token = self.token()
+        self.cache.authenticate(token)
+
+        self.cache.revoke(token)
+        with self.assertRaises(ValueError):
+            self.cache.authenticate(token)
+
+        # Other tokens of the same user are unaffected.
+        self.assertEqual(self.cache.authenticate(self.token(name = 'رضا'))[1].name, 'رضا')
+
+    def test_bounded_size(self):
+        tokens = [self.token(id = id) for id in range(3)]
+        for token in tokens:
+            self.cache.authenticate(token)
+
+        self.assertEqual(list(self.cache._verified), tokens[1:])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import unittest
+from argon2 import PasswordHasher
+from Core.PasswordManagement import PasswordManager
+from DataAccess.MemberRepository import MemberRepository
+from DataAccess.UserRepository import UserRepository
+from Models.Models import MemberModel, PlainUserModel, UserModel, UserViewModel
+from Models.Schema import DBTableColumns, DBTables
+
+
+class TestUserRepository(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.cursor = UserRepository._get_cursor()
+        self.plain_user = PlainUserModel(username = 'rehash_test_user', password = 'Secret123')
+        MemberRepository.add(self.plain_user, MemberModel(name = 'کاربر آزمایشی', email = 'rehash@example.com'), self.cursor)
+
+    def tearDown(self) -> None:
+        self.cursor.connection.rollback()
+        self.cursor.connection.close()
+
+    def stored_hash(self) -> str:
+        return UserRepository.get_one(UserModel(username = self.plain_user.username), self.cursor).hashed_password
+
+    def set_stored_hash(self, hashed_password : str) -> None:
+        self.cursor.execute(
+            f"UPDATE {DBTables.USER} SET {DBTableColumns.User.HASHED_PASSWORD} = %s WHERE {DBTableColumns.User.USERNAME} = %s",
+            (hashed_password, self.plain_user.username)
+        )
+
+    # ─────────────────────────────── Tests ───────────────────────────────
+
+    def test_get_credentials_matches_view(self):
+        view = UserRepository.view_one(UserViewModel(username = self.plain_user.username), self.cursor)
+
+        self.assertEqual(UserRepository.get_credentials(self.plain_user.username, self.cursor), view)
+        self.assertIsNone(UserRepository.get_credentials('no_such_user', self.cursor))
+
+    def test_verify_user_rehashes_outdated_hash(self):
+        outdated = PasswordHasher(time_cost = 1, memory_cost = 1024, parallelism = 1).hash(self.plain_user.password)
+        self.set_stored_hash(outdated)
+        self.assertTrue(PasswordManager().needs_rehash(outdated))
+
+        self.assertIsNotNone(UserRepository.verify_user(self.plain_user, self.cursor))
+
+        rehashed = self.stored_hash()
+        self.assertNotEqual(rehashed, outdated)
+        self.assertFalse(PasswordManager().needs_rehash(rehashed))
+        self.assertIsNotNone(UserRepository.verify_user(self.plain_user, self.cursor))
+
+    def test_verify_user_keeps_current_hash(self):
+        current = self.stored_hash()
+
+        self.assertIsNotNone(UserRepository.verify_user(self.plain_user, self.cursor))
+        self.assertEqual(self.stored_hash(), current)
+
+    def test_wrong_password_does_not_rehash(self):
+        outdated = PasswordHasher(time_cost = 1, memory_cost = 1024, parallelism = 1).hash(self.plain_user.password)
+        self.set_stored_hash(outdated)
+
+        self.assertIsNone(UserRepository.verify_user(PlainUserModel(self.plain_user.username, 'Wrong123'), self.cursor))
+        self.assertEqual(self.stored_hash(), outdated)
+
+    def test_change_password_skips_rehash(self):
+        outdated = PasswordHasher(time_cost = 1, memory_cost = 1024, parallelism = 1).hash(self.plain_user.password)
+        self.set_stored_hash(outdated)
+        updates = self.user_updates()
+
+        UserRepository.change_password(self.plain_user, 'NewSecret123', self.cursor)
+
+        self.assertEqual(self.user_updates(), updates + 1)
+        self.assertIsNotNone(UserRepository.verify_user(PlainUserModel(self.plain_user.username, 'NewSecret123'), self.cursor))
+
+    def user_updates(self) -> int:
+        self.cursor.execute("SELECT n_tup_upd FROM pg_stat_xact_user_tables WHERE relname = 'User'")
+        return self.cursor.fetchone()[0]
+
+
+if __name__ == '__main__':
+    unittest.main()
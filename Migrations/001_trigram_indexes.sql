@@ -0,0 +1,28 @@
+--
+-- Migration 001: trigram indexes for substring search
+--
+-- Book search filters with LIKE '%value%', which a B-tree index can not serve.
+-- GIN trigram indexes can, for LIKE and ILIKE alike. They apply to the base
+-- tables only, not to the aggregated BookView, so set BOOK_SEARCH_MODE=indexed
+-- to make BookRepository filter Book/Author/Publisher/Category before joining.
+--
+-- Apply after restoring DataBaseBackup.sql:
+--     psql -d <database> -f Migrations/001_trigram_indexes.sql
+--
+-- The statements are idempotent. CONCURRENTLY keeps the tables writable while
+-- the indexes build, so do not wrap this file in a transaction.
+--
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm WITH SCHEMA public;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS "Book_title_trgm_idx"
+    ON public."Book" USING gin (title public.gin_trgm_ops);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS "Author_name_trgm_idx"
+    ON public."Author" USING gin (name public.gin_trgm_ops);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS "Publisher_name_trgm_idx"
+    ON public."Publisher" USING gin (name public.gin_trgm_ops);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS "Category_name_trgm_idx"
+    ON public."Category" USING gin (name public.gin_trgm_ops);
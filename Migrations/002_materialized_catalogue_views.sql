@@ -0,0 +1,35 @@
+--
+-- Migration 002: materialized copies of the catalogue views
+--
+-- BookView, AuthorView and CategoryView join five tables and aggregate with
+-- string_agg(DISTINCT ...) on every read. These materialized copies are read
+-- instead when MATERIALIZED_VIEWS=true; the application refreshes them after
+-- catalogue writes (see DataAccess/MaterializedViews.py).
+--
+-- Apply after restoring DataBaseBackup.sql:
+--     psql -d <database> -f Migrations/002_materialized_catalogue_views.sql
+--
+-- REFRESH MATERIALIZED VIEW CONCURRENTLY needs a unique index on each view.
+-- If a source view changes, drop and re-create its materialized copy.
+--
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS public."BookViewMaterialized" AS
+    SELECT * FROM public."BookView"
+WITH DATA;
+
+CREATE UNIQUE INDEX IF NOT EXISTS "BookViewMaterialized_id_idx"
+    ON public."BookViewMaterialized" (id);
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS public."AuthorViewMaterialized" AS
+    SELECT * FROM public."AuthorView"
+WITH DATA;
+
+CREATE UNIQUE INDEX IF NOT EXISTS "AuthorViewMaterialized_id_idx"
+    ON public."AuthorViewMaterialized" (id);
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS public."CategoryViewMaterialized" AS
+    SELECT * FROM public."CategoryView"
+WITH DATA;
+
+CREATE UNIQUE INDEX IF NOT EXISTS "CategoryViewMaterialized_id_idx"
+    ON public."CategoryViewMaterialized" (id);
@@ -0,0 +1,126 @@
+--
+-- Migration 003: full-text search index for books
+--
+-- "BookSearch" keeps one tsvector per book, built from the normalised title
+-- (weight A), author names (B), category names and publisher name (C).
+-- Triggers keep it current on every catalogue write; a GIN index serves
+-- BookRepository.full_text_search.
+--
+-- PostgreSQL has no Persian dictionary, so documents use the 'simple'
+-- configuration on text folded by lca_normalize. lca_normalize mirrors
+-- Core/TextNormalizer.py; keep the two in sync.
+--
+-- Apply after restoring DataBaseBackup.sql:
+--     psql -d <database> -f Migrations/003_book_full_text_search.sql
+--
+
+CREATE OR REPLACE FUNCTION public.lca_normalize(value text) RETURNS text
+    LANGUAGE sql IMMUTABLE PARALLEL SAFE
+AS $$
+    SELECT lower(regexp_replace(
+        translate(
+            coalesce(value, ''),
+            U&'\064A\0649\0643\0629\06C0\0623\0625\0671\0622\0624\0626\200C\06F0\06F1\06F2\06F3\06F4\06F5\06F6\06F7\06F8\06F9\0660\0661\0662\0663\0664\0665\0666\0667\0668\0669',
+            U&'\06CC\06CC\06A9\0647\0647\0627\0627\0627\0627\0648\06CC 01234567890123456789'
+        ),
+        U&'[\064B-\065F\0670\0640\200E\200F]', '', 'g'
+    ))
+$$;
+
+CREATE OR REPLACE FUNCTION public.lca_book_document(book integer) RETURNS tsvector
+    LANGUAGE sql STABLE
+AS $$
+    SELECT
+        setweight(to_tsvector('simple', public.lca_normalize(b.title)), 'A') ||
+        setweight(to_tsvector('simple', public.lca_normalize((
+            SELECT string_agg(a.name, ' ') FROM public."BookAuthor" ba
+            JOIN public."Author" a ON a.id = ba.author_id WHERE ba.book_id = b.id
+        ))), 'B') ||
+        setweight(to_tsvector('simple', public.lca_normalize((
+            SELECT string_agg(c.name, ' ') FROM public."BookCategory" bc
+            JOIN public."Category" c ON c.id = bc.category_id WHERE bc.book_id = b.id
+        ))), 'C') ||
+        setweight(to_tsvector('simple', public.lca_normalize(p.name)), 'C')
+    FROM public."Book" b
+    LEFT JOIN public."Publisher" p ON p.id = b.publisher_id
+    WHERE b.id = book
+$$;
+
+CREATE TABLE IF NOT EXISTS public."BookSearch" (
+    book_id integer PRIMARY KEY REFERENCES public."Book" (id) ON DELETE CASCADE,
+    document tsvector NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS "BookSearch_document_idx"
+    ON public."BookSearch" USING gin (document);
+
+CREATE OR REPLACE FUNCTION public.lca_refresh_book_search(books integer[]) RETURNS void
+    LANGUAGE sql
+AS $$
+    INSERT INTO public."BookSearch" (book_id, document)
+    SELECT b.id, public.lca_book_document(b.id) FROM public."Book" b WHERE b.id = ANY(books)
+    ON CONFLICT (book_id) DO UPDATE SET document = EXCLUDED.document
+$$;
+
+-- Triggers
+
+CREATE OR REPLACE FUNCTION public.lca_book_search_trigger() RETURNS trigger
+    LANGUAGE plpgsql
+AS $$
+BEGIN
+    IF TG_TABLE_NAME = 'Book' THEN
+        PERFORM public.lca_refresh_book_search(ARRAY[NEW.id]);
+    ELSIF TG_TABLE_NAME IN ('BookAuthor', 'BookCategory') THEN
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            PERFORM public.lca_refresh_book_search(ARRAY[NEW.book_id]);
+        END IF;
+        IF TG_OP IN ('DELETE', 'UPDATE') THEN
+            PERFORM public.lca_refresh_book_search(ARRAY[OLD.book_id]);
+        END IF;
+    ELSIF TG_TABLE_NAME = 'Author' THEN
+        PERFORM public.lca_refresh_book_search(ARRAY(
+            SELECT book_id FROM public."BookAuthor" WHERE author_id = NEW.id));
+    ELSIF TG_TABLE_NAME = 'Category' THEN
+        PERFORM public.lca_refresh_book_search(ARRAY(
+            SELECT book_id FROM public."BookCategory" WHERE category_id = NEW.id));
+    ELSIF TG_TABLE_NAME = 'Publisher' THEN
+        PERFORM public.lca_refresh_book_search(ARRAY(
+            SELECT id FROM public."Book" WHERE publisher_id = NEW.id));
+    END IF;
+    RETURN NULL;
+END
+$$;
+
+DROP TRIGGER IF EXISTS "Book_search_trigger" ON public."Book";
+CREATE TRIGGER "Book_search_trigger"
+    AFTER INSERT OR UPDATE OF title, publisher_id ON public."Book"
+    FOR EACH ROW EXECUTE FUNCTION public.lca_book_search_trigger();
+
+DROP TRIGGER IF EXISTS "BookAuthor_search_trigger" ON public."BookAuthor";
+CREATE TRIGGER "BookAuthor_search_trigger"
+    AFTER INSERT OR UPDATE OR DELETE ON public."BookAuthor"
+    FOR EACH ROW EXECUTE FUNCTION public.lca_book_search_trigger();
+
+DROP TRIGGER IF EXISTS "BookCategory_search_trigger" ON public."BookCategory";
+CREATE TRIGGER "BookCategory_search_trigger"
+    AFTER INSERT OR UPDATE OR DELETE ON public."BookCategory"
+    FOR EACH ROW EXECUTE FUNCTION public.lca_book_search_trigger();
+
+DROP TRIGGER IF EXISTS "Author_search_trigger" ON public."Author";
+CREATE TRIGGER "Author_search_trigger"
+    AFTER UPDATE OF name ON public."Author"
+    FOR EACH ROW EXECUTE FUNCTION public.lca_book_search_trigger();
+
+DROP TRIGGER IF EXISTS "Category_search_trigger" ON public."Category";
+CREATE TRIGGER "Category_search_trigger"
+    AFTER UPDATE OF name ON public."Category"
+    FOR EACH ROW EXECUTE FUNCTION public.lca_book_search_trigger();
+
+DROP TRIGGER IF EXISTS "Publisher_search_trigger" ON public."Publisher";
+CREATE TRIGGER "Publisher_search_trigger"
+    AFTER UPDATE OF name ON public."Publisher"
+    FOR EACH ROW EXECUTE FUNCTION public.lca_book_search_trigger();
+
+-- Backfill
+
+SELECT public.lca_refresh_book_search(ARRAY(SELECT id FROM public."Book"));
@@ -0,0 +1,68 @@
+--
+-- Migration 004: catalogue change log
+--
+-- "CatalogueChange" records, per book, when it last changed in a way that is
+-- visible in BookView: its own columns, its authors, categories or publisher,
+-- or its deletion. In-process indexes (Services/CatalogueIndex.py) poll it to
+-- refresh incrementally. Rows are never removed, so deletions stay visible.
+--
+-- Builds on the triggers of 003_book_full_text_search.sql.
+--
+-- Apply after restoring DataBaseBackup.sql and migration 003:
+--     psql -d <database> -f Migrations/004_catalogue_change_log.sql
+--
+
+CREATE TABLE IF NOT EXISTS public."CatalogueChange" (
+    book_id integer PRIMARY KEY,
+    changed_at timestamp with time zone NOT NULL DEFAULT clock_timestamp()
+);
+
+CREATE INDEX IF NOT EXISTS "CatalogueChange_changed_at_idx"
+    ON public."CatalogueChange" (changed_at);
+
+CREATE OR REPLACE FUNCTION public.lca_touch_catalogue(books integer[]) RETURNS void
+    LANGUAGE sql
+AS $$
+    INSERT INTO public."CatalogueChange" (book_id, changed_at)
+    SELECT DISTINCT unnest(books), clock_timestamp()
+    ON CONFLICT (book_id) DO UPDATE SET changed_at = EXCLUDED.changed_at
+$$;
+
+-- Every search-document refresh is also a catalogue change.
+CREATE OR REPLACE FUNCTION public.lca_refresh_book_search(books integer[]) RETURNS void
+    LANGUAGE sql
+AS $$
+    INSERT INTO public."BookSearch" (book_id, document)
+    SELECT b.id, public.lca_book_document(b.id) FROM public."Book" b WHERE b.id = ANY(books)
+    ON CONFLICT (book_id) DO UPDATE SET document = EXCLUDED.document;
+
+    SELECT public.lca_touch_catalogue(books);
+$$;
+
+-- Stock changes and deletions do not touch the search document.
+CREATE OR REPLACE FUNCTION public.lca_catalogue_change_trigger() RETURNS trigger
+    LANGUAGE plpgsql
+AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        PERFORM public.lca_touch_catalogue(ARRAY[OLD.id]);
+    ELSE
+        PERFORM public.lca_touch_catalogue(ARRAY[NEW.id]);
+    END IF;
+    RETURN NULL;
+END
+$$;
+
+DROP TRIGGER IF EXISTS "Book_stock_change_trigger" ON public."Book";
+CREATE TRIGGER "Book_stock_change_trigger"
+    AFTER UPDATE OF total_copies, available_copies ON public."Book"
+    FOR EACH ROW EXECUTE FUNCTION public.lca_catalogue_change_trigger();
+
+DROP TRIGGER IF EXISTS "Book_delete_change_trigger" ON public."Book";
+CREATE TRIGGER "Book_delete_change_trigger"
+    AFTER DELETE ON public."Book"
+    FOR EACH ROW EXECUTE FUNCTION public.lca_catalogue_change_trigger();
+
+-- Backfill
+
+SELECT public.lca_touch_catalogue(ARRAY(SELECT id FROM public."Book"));
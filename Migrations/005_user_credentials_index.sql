@@ -0,0 +1,20 @@
+--
+-- Migration 005: covering index for login
+--
+-- UserRepository.get_credentials looks users up by username and reads only
+-- id and hashed_password from "User". The existing "User_username_key"
+-- index finds the row but still needs a heap fetch for the hash. This index
+-- carries both columns, so the lookup is an index-only scan. The role name
+-- and type come from primary-key lookups on "Librarian" and "Member".
+--
+-- Apply after restoring DataBaseBackup.sql:
+--     psql -d <database> -f Migrations/005_user_credentials_index.sql
+--
+-- The statement is idempotent. CONCURRENTLY keeps "User" writable while the
+-- index builds, so do not wrap this file in a transaction.
+--
+
+CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS "User_username_credentials_idx"
+    ON public."User" (username) INCLUDE (id, hashed_password);
+
+ANALYZE public."User";
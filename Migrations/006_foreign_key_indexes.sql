@@ -0,0 +1,79 @@
+--
+-- Migration 006: indexes for foreign keys and common filters
+--
+-- PostgreSQL indexes primary keys and unique constraints but not the
+-- referencing side of a foreign key. Every lookup by member, book, user or
+-- librarian (MessageRepository.inbox, BorrowingView, the member views,
+-- get_one/get_many filters) and every delete of a referenced row therefore
+-- scanned the whole referencing table.
+--
+-- The partial indexes cover the "open" rows that the application asks for
+-- most often and stay small as history grows:
+--   * unseen messages of a user,
+--   * pending borrow requests,
+--   * borrowings that have not been returned.
+--
+-- The primary keys of "BookAuthor" and "BookCategory" start with book_id,
+-- so only the second column needs its own index there.
+--
+-- Apply after restoring DataBaseBackup.sql:
+--     psql -d <database> -f Migrations/006_foreign_key_indexes.sql
+--
+-- Check the result with: python -m DataAccess.IndexAdvisor
+--
+-- The statements are idempotent. CONCURRENTLY keeps the tables writable
+-- while the indexes build, so do not wrap this file in a transaction.
+--
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS "Book_publisher_id_idx"
+    ON public."Book" (publisher_id);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS "BookAuthor_author_id_idx"
+    ON public."BookAuthor" (author_id);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS "BookCategory_category_id_idx"
+    ON public."BookCategory" (category_id);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS "Borrowing_member_id_idx"
+    ON public."Borrowing" (member_id);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS "Borrowing_book_id_idx"
+    ON public."Borrowing" (book_id);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS "Borrowing_not_returned_idx"
+    ON public."Borrowing" (member_id) WHERE NOT returned;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS "BorrowRequest_member_id_idx"
+    ON public."BorrowRequest" (member_id);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS "BorrowRequest_book_id_idx"
+    ON public."BorrowRequest" (book_id);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS "BorrowRequest_handled_by_idx"
+    ON public."BorrowRequest" (handled_by);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS "BorrowRequest_pending_idx"
+    ON public."BorrowRequest" (status, request_timestamp) WHERE status = 'pending';
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS "LibrarianActivityLog_librarian_id_idx"
+    ON public."LibrarianActivityLog" (librarian_id);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS "LibrarianActivityLog_member_id_idx"
+    ON public."LibrarianActivityLog" (member_id);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS "LibrarianActivityLog_book_id_idx"
+    ON public."LibrarianActivityLog" (book_id);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS "Message_user_id_idx"
+    ON public."Message" (user_id);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS "Message_unseen_idx"
+    ON public."Message" (user_id) WHERE NOT seen;
+
+ANALYZE public."Book";
+ANALYZE public."BookAuthor";
+ANALYZE public."BookCategory";
+ANALYZE public."Borrowing";
+ANALYZE public."BorrowRequest";
+ANALYZE public."LibrarianActivityLog";
+ANALYZE public."Message";
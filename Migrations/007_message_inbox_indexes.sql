@@ -0,0 +1,30 @@
+--
+-- Migration 007: indexes for reading a user's inbox
+--
+-- MessageRepository.inbox_page reads a user's messages newest first by id,
+-- and unread_count counts the unseen ones. Indexing (user_id, id) lets the
+-- page be read in order straight from the index and stop after page_size
+-- rows; the partial index keeps only unseen messages, so it stays small and
+-- answers unread_count and unread-only pages without visiting history.
+--
+-- They replace the single-column message indexes of migration 006, which
+-- are prefixes of these.
+--
+-- Apply after Migrations/006_foreign_key_indexes.sql:
+--     psql -d <database> -f Migrations/007_message_inbox_indexes.sql
+--
+-- The statements are idempotent. CONCURRENTLY keeps "Message" writable
+-- while the indexes build, so do not wrap this file in a transaction.
+--
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS "Message_user_id_id_idx"
+    ON public."Message" (user_id, id);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS "Message_unseen_user_id_id_idx"
+    ON public."Message" (user_id, id) WHERE NOT seen;
+
+DROP INDEX CONCURRENTLY IF EXISTS public."Message_user_id_idx";
+
+DROP INDEX CONCURRENTLY IF EXISTS public."Message_unseen_idx";
+
+ANALYZE public."Message";